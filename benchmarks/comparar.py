@@ -0,0 +1,100 @@
+# benchmarks/comparar.py
+
+"""
+Comparação de duas execuções de benchmarks.executar (JSON), etapa a etapa,
+com limites de regressão para tempo e memória de pico.
+
+    python -m benchmarks.comparar base.json atual.json
+    python -m benchmarks.comparar base.json atual.json --limite-tempo 1.5 --limite-memoria 1.2
+
+Uma etapa regride quando a razão atual/base passa do limite e a diferença
+absoluta passa do mínimo (tempos e memórias muito pequenos são só ruído).
+Sai com código 1 se houver alguma regressão.
+"""
+
+import argparse
+import json
+import sys
+
+# Razão atual/base acima da qual há regressão e diferenças absolutas abaixo das quais não há
+LIMITE_TEMPO = 1.25
+LIMITE_MEMORIA = 1.10
+TEMPO_MINIMO = 0.005  # s
+MEMORIA_MINIMA = 1 << 20  # bytes
+
+def adicionar_argumentos_limites(parser):
+    parser.add_argument("--limite-tempo", type=float, default=LIMITE_TEMPO,
+                        help=f"razão atual/base do tempo considerada regressão (padrão: {LIMITE_TEMPO})")
+    parser.add_argument("--limite-memoria", type=float, default=LIMITE_MEMORIA,
+                        help=f"razão atual/base da memória de pico considerada regressão (padrão: {LIMITE_MEMORIA})")
+    parser.add_argument("--tempo-minimo", type=float, default=TEMPO_MINIMO,
+                        help=f"diferença de tempo (s) abaixo da qual não há regressão (padrão: {TEMPO_MINIMO})")
+    parser.add_argument("--memoria-minima", type=int, default=MEMORIA_MINIMA,
+                        help=f"diferença de memória (bytes) abaixo da qual não há regressão (padrão: {MEMORIA_MINIMA})")
+
+def comparar(base, atual, limite_tempo=LIMITE_TEMPO, limite_memoria=LIMITE_MEMORIA,
+             tempo_minimo=TEMPO_MINIMO, memoria_minima=MEMORIA_MINIMA):
+    """
+    Compara os casos (gerador, tamanho) e etapas presentes nas duas execuções.
+    Lista de dicts com gerador, tamanho, etapa, grandeza ('tempo' ou
+    'memoria_pico'), base, atual, razao e regressao.
+    """
+    casos_base = {(c["gerador"], c["tamanho"]): c for c in base["casos"]}
+    limites = {"tempo": (limite_tempo, tempo_minimo), "memoria_pico": (limite_memoria, memoria_minima)}
+    comparacao = []
+    for caso in atual["casos"]:
+        anterior = casos_base.get((caso["gerador"], caso["tamanho"]))
+        if anterior is None:
+            continue
+        for etapa, medidas in caso["etapas"].items():
+            medidas_base = anterior["etapas"].get(etapa)
+            if medidas_base is None:
+                continue
+            for grandeza, (limite, minimo) in limites.items():
+                b, a = medidas_base.get(grandeza), medidas.get(grandeza)
+                if b is None or a is None:
+                    continue
+                razao = a / b if b > 0 else (1.0 if a == 0 else float("inf"))
+                comparacao.append({"gerador": caso["gerador"], "tamanho": caso["tamanho"], "etapa": etapa,
+                                   "grandeza": grandeza, "base": b, "atual": a, "razao": razao,
+                                   "regressao": razao > limite and a - b > minimo})
+    return comparacao
+
+def _formatar(grandeza, valor):
+    if grandeza == "tempo":
+        return f"{valor * 1000:.2f} ms"
+    return f"{valor / (1 << 20):.2f} MiB"
+
+def escrever_comparacao(comparacao, destino=sys.stdout, todas=False):
+    """
+    Tabela das regressões (ou de todas as comparações) e um resumo. Retorna o
+    número de regressões.
+    """
+    regressoes = [c for c in comparacao if c["regressao"]]
+    for c in (comparacao if todas else regressoes):
+        marca = "REGRESSÃO" if c["regressao"] else ""
+        print(f"{c['gerador']:16s} {c['tamanho']:>9d} {c['etapa']:18s} {c['grandeza']:13s} "
+              f"{_formatar(c['grandeza'], c['base']):>12s} -> {_formatar(c['grandeza'], c['atual']):>12s} "
+              f"{c['razao']:6.2f}x {marca}", file=destino)
+    melhores = sum(c["razao"] < 1 for c in comparacao)
+    print(f"{len(comparacao)} medidas comparadas: {len(regressoes)} regressões, {melhores} melhores que a base",
+          file=destino)
+    return len(regressoes)
+
+def carregar(caminho):
+    with open(caminho, 'r', encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara duas execuções dos benchmarks.")
+    parser.add_argument("base", help="JSON da execução de referência")
+    parser.add_argument("atual", help="JSON da execução a comparar")
+    parser.add_argument("--todas", action="store_true", help="mostra todas as medidas, não só as regressões")
+    adicionar_argumentos_limites(parser)
+    args = parser.parse_args(argv)
+    comparacao = comparar(carregar(args.base), carregar(args.atual), args.limite_tempo, args.limite_memoria,
+                          args.tempo_minimo, args.memoria_minima)
+    return 1 if escrever_comparacao(comparacao, todas=args.todas) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+# benchmarks/executar.py
+
+"""
+Benchmarks de parse, montagem, solução, tabela e gráficos sobre as netlists
+sintéticas de benchmarks.geradores, com saída JSON para comparar execuções
+entre commits (benchmarks.comparar).
+
+    python -m benchmarks.executar -o base.json
+    python -m benchmarks.executar --geradores grade_resistiva --tamanhos 10 1k 1meg -o atual.json
+    python -m benchmarks.executar -o atual.json --base base.json
+
+Etapas de cada caso (montar_matriz_anm dividida nas suas partes):
+
+    parse              parse_netlist_linhas
+    verificacao        verificar_topologia
+    montagem           CompiledCircuit e evaluate (matriz da ANM)
+    solucao            ordenação, fatoração LU e solução
+    pos_processamento  ResultadoAnalise e como_tupla
+    tabela             MainWindow.atualizar_tabela (Qt offscreen)
+    fasores, ondas     GraficoFasores e GraficoOndas num canvas Agg, com o desenho
+
+O tempo de cada etapa é o menor entre as repetições. A memória de pico é
+medida numa execução à parte com tracemalloc (objetos Python e arrays NumPy,
+sem as alocações internas do SuperLU e do Qt), acima do que já estava alocado
+no início da etapa. O rastreamento deixa a execução extra várias vezes mais
+lenta; nos casos de 1meg, --sem-memoria mede só os tempos.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from itertools import chain, islice
+
+import numpy as np
+import scipy
+
+from benchmarks.comparar import adicionar_argumentos_limites, carregar, comparar, escrever_comparacao
+from benchmarks.geradores import GERADORES
+from core.circuito import CompiledCircuit, ResultadoAnalise
+from core.diagnostico import verificar_topologia
+from core.fatoracao import fatorar
+from netlist_parser.parser import parse_netlist_linhas, parse_valor_com_unidade
+
+TAMANHOS = (10, 100, 1000, 10000, 100000)
+# Os gráficos recebem só os primeiros sinais (como se fossem os marcados na interface)
+SINAIS_GRAFICOS = 1000
+FORMATO = 1  # Versão do JSON de saída
+
+class _Janela:
+    """
+    MainWindow criada uma vez (Qt offscreen) para medir atualizar_tabela.
+    """
+    def __init__(self):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PySide6.QtWidgets import QApplication
+        self.app = QApplication.instance() or QApplication([])
+        import main
+        self.janela = main.MainWindow()
+
+    def atualizar_tabela(self, circuito, resultado):
+        self.janela.circuito, self.janela.resultado, self.janela.modo_trifasico = circuito, resultado, "completo"
+        self.janela.atualizar_tabela()
+
+def _sinais(resultado, limite):
+    # Mesma ordem da lista de sinais da interface: tensões nodais, tensões e correntes dos componentes
+    nomes = chain((f"V({no})" for no in resultado.nos), (f"V({nome})" for nome in resultado.componentes),
+                  (f"I({nome})" for nome in resultado.componentes))
+    nomes = list(islice(nomes, limite))
+    valores = np.concatenate([resultado.tensoes_nos[:limite], resultado.tensoes[:limite], resultado.correntes[:limite]])
+    return nomes, valores[:len(nomes)]
+
+def etapas(frequencia=60, metodo='auto', janela=None, sinais_graficos=SINAIS_GRAFICOS):
+    """
+    Lista de (nome, função) das etapas; cada função lê e grava num dict de
+    estado que começa com as linhas da netlist ("linhas").
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from graphics.fasores import GraficoFasores
+    from graphics.ondas import GraficoOndas
+
+    def parse(e):
+        e["tabela"] = parse_netlist_linhas(e["linhas"])
+    def verificacao(e):
+        verificar_topologia(e["tabela"])
+    def montagem(e):
+        e["circuito"] = c = CompiledCircuit(e["tabela"], metodo, verificar=False)
+        e["matriz"] = c.evaluate(frequencia)
+    def solucao(e):
+        c = e["circuito"]
+        e["fatoracao"] = fatorar(e["matriz"], c.esparso, c.incognitas, c.ordem_fatoracao())
+        e["solucao"] = e["fatoracao"].solve(c.excitacao())
+    def pos_processamento(e):
+        e["resultado"] = ResultadoAnalise(e["circuito"], frequencia, e["solucao"])
+        e["resultado"].como_tupla()
+    def tabela(e):
+        janela.atualizar_tabela(e["circuito"], e["resultado"])
+    def fasores(e):
+        nomes, valores = _sinais(e["resultado"], sinais_graficos)
+        canvas = FigureCanvasAgg(Figure(figsize=(5, 4), dpi=100))
+        GraficoFasores(canvas, canvas.figure.add_subplot(111)).definir_fasores(nomes, valores)
+        canvas.draw()
+    def ondas(e):
+        nomes, valores = _sinais(e["resultado"], sinais_graficos)
+        canvas = FigureCanvasAgg(Figure(figsize=(5, 4), dpi=100))
+        GraficoOndas(canvas, canvas.figure.add_subplot(111)).definir_sinais(nomes, valores, f=frequencia, visiveis=nomes)
+        canvas.draw()
+
+    lista = [parse, verificacao, montagem, solucao, pos_processamento] + ([tabela] if janela else []) + [fasores, ondas]
+    return [(funcao.__name__, funcao) for funcao in lista]
+
+def executar_caso(linhas, lista_etapas, repeticoes=3, memoria=True):
+    """
+    Roda as etapas em sequência repeticoes vezes e, com memoria, mais uma vez
+    sob tracemalloc. Retorna ({etapa: {tempo, memoria_pico}}, estado da última
+    execução).
+    """
+    medidas = {nome: {"tempo": float("inf")} for nome, _ in lista_etapas}
+    for _ in range(repeticoes):
+        estado = {"linhas": linhas}
+        for nome, funcao in lista_etapas:
+            inicio = time.perf_counter()
+            funcao(estado)
+            medidas[nome]["tempo"] = min(medidas[nome]["tempo"], time.perf_counter() - inicio)
+    if memoria:
+        estado = None
+        tracemalloc.start()
+        try:
+            estado = {"linhas": linhas}
+            for nome, funcao in lista_etapas:
+                tracemalloc.reset_peak()
+                antes = tracemalloc.get_traced_memory()[0]
+                funcao(estado)
+                medidas[nome]["memoria_pico"] = tracemalloc.get_traced_memory()[1] - antes
+        finally:
+            tracemalloc.stop()
+    return medidas, estado
+
+def _tamanho(texto):
+    # Aceita os sufixos da netlist (1k, 100k, 1meg)
+    try:
+        tamanho = int(parse_valor_com_unidade(texto))
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    if tamanho < 1:
+        raise argparse.ArgumentTypeError(f"Tamanho inválido: '{texto}'")
+    return tamanho
+
+def _commit():
+    try:
+        saida = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=10,
+                               cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return saida.stdout.strip() or None
+
+def executar(geradores=tuple(GERADORES), tamanhos=TAMANHOS, repeticoes=3, frequencia=60, metodo='auto',
+             interface=True, memoria=True, sinais_graficos=SINAIS_GRAFICOS, relatorio=None):
+    """
+    Roda todos os casos (gerador x tamanho) e devolve o dict da saída JSON:
+    ambiente (commit, versões, plataforma), parâmetros e a lista de casos,
+    cada um com o tamanho real do circuito e as medidas de cada etapa.
+    relatorio(caso) é chamado ao fim de cada caso.
+    """
+    import matplotlib
+    lista_etapas = etapas(frequencia, metodo, _Janela() if interface else None, sinais_graficos)
+    # Aquecimento: imports tardios e caches de fontes (matplotlib, Qt) ficam fora das medidas
+    executar_caso(GERADORES["escada_rc"](10), lista_etapas, repeticoes=1, memoria=False)
+    casos = []
+    for gerador in geradores:
+        for tamanho in tamanhos:
+            linhas = GERADORES[gerador](tamanho)
+            medidas, estado = executar_caso(linhas, lista_etapas, repeticoes, memoria)
+            circuito = estado["circuito"]
+            caso = {"gerador": gerador, "tamanho": tamanho, "linhas": len(linhas), "elementos": len(estado["tabela"]),
+                    "incognitas": circuito.dimensao, "esparso": bool(circuito.esparso),
+                    "nnz_fatores": estado["fatoracao"].nnz_fatores(),
+                    "sinais_graficos": min(sinais_graficos, circuito.N + 2 * len(circuito.nomes)),
+                    "etapas": medidas}
+            casos.append(caso)
+            if relatorio is not None:
+                relatorio(caso)
+    return {
+        "formato": FORMATO, "data": datetime.datetime.now().isoformat(timespec='seconds'), "commit": _commit(),
+        "python": platform.python_version(), "numpy": np.__version__, "scipy": scipy.__version__,
+        "matplotlib": matplotlib.__version__, "plataforma": platform.platform(),
+        "parametros": {"repeticoes": repeticoes, "frequencia": frequencia, "metodo": metodo, "memoria": memoria},
+        "casos": casos,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks com circuitos sintéticos.")
+    parser.add_argument("--geradores", nargs="+", choices=list(GERADORES), default=list(GERADORES))
+    parser.add_argument("--tamanhos", nargs="+", type=_tamanho, default=list(TAMANHOS),
+                        help="número aproximado de elementos de cada caso (aceita 1k, 1meg)")
+    parser.add_argument("-r", "--repeticoes", type=int, default=3, help="repetições de cada caso (vale o menor tempo)")
+    parser.add_argument("-f", "--frequencia", type=float, default=60.0)
+    parser.add_argument("--metodo", choices=["auto", "denso", "esparso"], default="auto")
+    parser.add_argument("--sinais-graficos", type=int, default=SINAIS_GRAFICOS,
+                        help=f"sinais desenhados nos gráficos (padrão: {SINAIS_GRAFICOS})")
+    parser.add_argument("--sem-interface", action="store_true", help="não mede atualizar_tabela (não cria a janela Qt)")
+    parser.add_argument("--sem-memoria", action="store_true", help="não faz a execução extra com tracemalloc")
+    parser.add_argument("-o", "--saida", help="arquivo JSON de saída (padrão: stdout)")
+    parser.add_argument("--base", help="JSON de uma execução anterior para comparar; sai com 1 se houver regressão")
+    adicionar_argumentos_limites(parser)
+    args = parser.parse_args(argv)
+    if args.repeticoes < 1:
+        parser.error("--repeticoes deve ser pelo menos 1")
+
+    def relatorio(caso):
+        total = sum(m["tempo"] for m in caso["etapas"].values())
+        etapas_caso = "  ".join(f"{nome} {m['tempo'] * 1000:.1f}" for nome, m in caso["etapas"].items())
+        print(f"{caso['gerador']:16s} {caso['elementos']:>8d} elementos  {total * 1000:10.1f} ms  ({etapas_caso})",
+              file=sys.stderr)
+
+    resultado = executar(args.geradores, args.tamanhos, args.repeticoes, args.frequencia, args.metodo,
+                         not args.sem_interface, not args.sem_memoria, args.sinais_graficos, relatorio)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as destino:
+            json.dump(resultado, destino, indent=1)
+    else:
+        json.dump(resultado, sys.stdout, indent=1)
+        print()
+    if args.base:
+        comparacao = comparar(carregar(args.base), resultado, args.limite_tempo, args.limite_memoria,
+                              args.tempo_minimo, args.memoria_minima)
+        return 1 if escrever_comparacao(comparacao, sys.stderr) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+# benchmarks/geradores.py
+
+"""
+Geradores paramétricos de netlists sintéticas para os benchmarks.
+
+Cada gerador recebe o número aproximado de elementos (depois da expansão dos
+trifásicos) e devolve as linhas da netlist, prontas para parse_netlist_linhas.
+O tamanho real sai da tabela parseada; os valores são fixos ou sorteados com
+semente, então a mesma chamada gera sempre a mesma netlist.
+
+    escada_rc       escada RC em cascata (matriz tridiagonal)
+    grade_resistiva grade 2D de resistores (preenchimento típico de malhas)
+    malha_aleatoria malha aleatória local com fontes E, G, F e H
+    alimentadores   alimentadores trifásicos repetidos numa mesma barra
+"""
+
+import math
+
+import numpy as np
+
+def escada_rc(elementos):
+    """
+    Fonte seguida de seções com R em série e C em derivação.
+    """
+    secoes = max(1, (elementos - 1) // 2)
+    linhas = ["V1 n0 0 AC 1 0"]
+    for i in range(secoes):
+        linhas.append(f"R{i} n{i} n{i + 1} 100")
+        linhas.append(f"C{i} n{i + 1} 0 1u")
+    return linhas
+
+def grade_resistiva(elementos):
+    """
+    Grade k x k de resistores de 1 ohm, alimentada num canto e aterrada no oposto.
+    """
+    k = max(2, round(math.sqrt(elementos / 2)))
+    linhas = ["V1 g0_0 0 AC 1 0", f"RT g{k - 1}_{k - 1} 0 1"]
+    for i in range(k):
+        for j in range(k):
+            if i + 1 < k: linhas.append(f"RV{i}_{j} g{i}_{j} g{i + 1}_{j} 1")
+            if j + 1 < k: linhas.append(f"RH{i}_{j} g{i}_{j} g{i}_{j + 1} 1")
+    return linhas
+
+def malha_aleatoria(elementos, semente=0, janela=20):
+    """
+    Malha aleatória local: árvore de ramos R, L e C (cada nó se liga a um dos
+    janela nós anteriores, então todo nó tem caminho até a fonte), ramos R
+    extras entre nós próximos, cargas para o terra e uma fonte dependente (E,
+    G, F ou H, nessa ordem) a cada 20 nós, controlada por nós próximos. As
+    fontes F e H medem a corrente de uma fonte de 0 V em série com um resistor.
+    Ligações só dentro da janela mantêm o preenchimento da LU proporcional ao
+    tamanho, como numa rede real (ligações sorteadas entre nós quaisquer dariam
+    um grafo expansor, com preenchimento quadrático).
+    """
+    rng = np.random.default_rng(semente)
+    nos = max(2, int(elementos / 1.875))
+    indices = np.arange(nos)
+    def vizinhos(base):
+        return np.clip(base + rng.integers(-janela, janela + 1, base.shape), 0, nos - 1)
+    pais = np.maximum(indices - rng.integers(1, janela + 1, nos), 0)
+    tipos = rng.integers(0, 3, nos)
+    valores = rng.uniform(1, 100, nos)
+    linhas = ["V1 m0 0 AC 10 0"]
+    for i in range(1, nos):
+        if tipos[i] == 0: linhas.append(f"R{i} m{pais[i]} m{i} {valores[i]:.2f}")
+        elif tipos[i] == 1: linhas.append(f"L{i} m{pais[i]} m{i} {valores[i] / 2:.2f}m")
+        else: linhas.append(f"C{i} m{pais[i]} m{i} {valores[i]:.2f}u")
+    origens = rng.integers(0, nos, nos // 2)
+    for k, (a, b) in enumerate(zip(origens, vizinhos(origens))):
+        if a != b: linhas.append(f"RX{k} m{a} m{b} {valores[k]:.2f}")
+    for k, a in enumerate(rng.integers(0, nos, nos // 4)):
+        linhas.append(f"RC{k} m{a} 0 {valores[-k - 1] * 10:.2f}")
+    origens = rng.integers(0, nos, nos // 20)
+    controles = vizinhos(np.repeat(origens[:, None], 3, axis=1))
+    for k, (a, (b, c, d)) in enumerate(zip(origens, controles)):
+        tipo = k % 4
+        if tipo == 0:
+            linhas += [f"E{k} e{k} 0 m{a} m{b} 0.5", f"RE{k} e{k} m{c} 10"]
+        elif tipo == 1:
+            linhas.append(f"G{k} m{a} m{b} m{c} m{d} 0.01")
+        elif tipo == 2:
+            linhas += [f"VF{k} m{a} f{k} 0", f"RF{k} f{k} m{b} 5", f"F{k} m{c} 0 VF{k} 0.5"]
+        else:
+            linhas += [f"VH{k} m{a} h{k} 0", f"RH{k} h{k} m{b} 5", f"H{k} x{k} 0 VH{k} 2", f"RHX{k} x{k} m{c} 10"]
+    return linhas
+
+def alimentadores(elementos, secoes=10):
+    """
+    Alimentadores trifásicos idênticos saindo da barra da fonte: cada seção é
+    uma linha em série com uma carga em Y, e cada alimentador termina num motor
+    em Δ. Circuito simétrico entre as fases (core.trifasico).
+    """
+    secoes = min(secoes, max(1, (elementos - 6) // 6))
+    quantidade = max(1, round((elementos - 3) / (6 * secoes + 3)))
+    linhas = ["TS V b0 Y 127 0"]
+    for f in range(quantidade):
+        anterior = "b0"
+        for s in range(secoes):
+            barra = f"b{f}_{s}"
+            linhas.append(f"TL{f}_{s} Z {anterior} {barra} 0.05 0.12")
+            linhas.append(f"TC{f}_{s} Z {barra} Y 30 10")
+            anterior = barra
+        linhas.append(f"TM{f} M {anterior} D 5k 0.85 127")
+    return linhas
+
+GERADORES = {
+    "escada_rc": escada_rc,
+    "grade_resistiva": grade_resistiva,
+    "malha_aleatoria": malha_aleatoria,
+    "alimentadores": alimentadores,
+}
@@ -0,0 +1,146 @@
+# core/cache.py
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import warnings
+from collections import OrderedDict
+
+# Incrementar quando o formato dos objetos guardados mudar, invalidando o disco
+VERSAO_CACHE = 2
+
+class AvisoCacheDisco(RuntimeWarning):
+    """
+    Falha ao gravar um resultado no cache em disco; a análise continua só com
+    o cache em memória.
+    """
+
+def normalizar_netlist(texto):
+    # Ignora espaços extras, linhas vazias e comentários: não mudam o resultado
+    linhas = []
+    for linha in texto.splitlines():
+        tokens = linha.split()
+        if tokens and not tokens[0].startswith("*"):
+            linhas.append(" ".join(tokens))
+    return "\n".join(linhas)
+
+def chave_cache(texto, **parametros):
+    h = hashlib.sha256()
+    h.update(f"v{VERSAO_CACHE}\n".encode())
+    h.update(normalizar_netlist(texto).encode("utf-8"))
+    for nome in sorted(parametros):
+        h.update(f"\n{nome}={parametros[nome]!r}".encode("utf-8"))
+    return h.hexdigest()
+
+class CacheResultados:
+    """
+    Cache de resultados endereçado pelo conteúdo da netlist: LRU em memória com
+    limite de itens e, opcionalmente, um diretório em disco com limite de bytes
+    (os arquivos menos usados recentemente são removidos primeiro).
+    Pode ser compartilhado entre threads de análise. Falhas de gravação no
+    disco não interrompem a análise: viram um AvisoCacheDisco (warnings) e
+    são contadas em estatisticas()["erros_disco"].
+    """
+    def __init__(self, max_itens=32, diretorio=None, max_bytes_disco=256 * 1024 * 1024):
+        self.max_itens = max_itens
+        self.diretorio = diretorio
+        self.max_bytes_disco = max_bytes_disco
+        self._memoria = OrderedDict()
+        self._trava = threading.RLock()
+        self.acertos_memoria = 0
+        self.acertos_disco = 0
+        self.falhas = 0
+        self.erros_disco = 0
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, f"{chave}.pkl")
+
+    def obter(self, chave):
+        with self._trava:
+            return self._obter(chave)
+
+    def _obter(self, chave):
+        if chave in self._memoria:
+            self._memoria.move_to_end(chave)
+            self.acertos_memoria += 1
+            return self._memoria[chave]
+        if self.diretorio:
+            caminho = self._caminho(chave)
+            try:
+                with open(caminho, "rb") as f:
+                    valor = pickle.load(f)
+                os.utime(caminho)  # Marca como usado recentemente para a remoção LRU
+            except (OSError, pickle.UnpicklingError, EOFError):
+                valor = None
+            if valor is not None:
+                self.acertos_disco += 1
+                self._guardar_memoria(chave, valor)
+                return valor
+        self.falhas += 1
+        return None
+
+    def guardar(self, chave, valor):
+        with self._trava:
+            self._guardar(chave, valor)
+
+    def _guardar(self, chave, valor):
+        self._guardar_memoria(chave, valor)
+        if not self.diretorio:
+            return
+        temporario = None
+        try:
+            descritor, temporario = tempfile.mkstemp(dir=self.diretorio, suffix=".tmp")
+            with os.fdopen(descritor, "wb") as f:
+                pickle.dump(valor, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporario, self._caminho(chave))
+        except OSError as e:
+            if temporario is not None and os.path.exists(temporario):
+                os.remove(temporario)  # Gravação pela metade (disco cheio, por exemplo)
+            self.erros_disco += 1
+            warnings.warn(f"Erro ao gravar cache em disco: {e}", AvisoCacheDisco, stacklevel=3)
+            return
+        self._remover_excedente_disco()
+
+    def _guardar_memoria(self, chave, valor):
+        self._memoria[chave] = valor
+        self._memoria.move_to_end(chave)
+        while len(self._memoria) > self.max_itens:
+            self._memoria.popitem(last=False)
+
+    def _remover_excedente_disco(self):
+        arquivos = []
+        for entrada in os.scandir(self.diretorio):
+            if entrada.name.endswith(".pkl"):
+                info = entrada.stat()
+                arquivos.append((info.st_mtime, info.st_size, entrada.path))
+        total = sum(tamanho for _, tamanho, _ in arquivos)
+        for _, tamanho, caminho in sorted(arquivos):
+            if total <= self.max_bytes_disco:
+                break
+            try:
+                os.remove(caminho)
+                total -= tamanho
+            except OSError:
+                pass
+
+    def limpar(self):
+        with self._trava:
+            self._memoria.clear()
+            if self.diretorio:
+                for entrada in os.scandir(self.diretorio):
+                    if entrada.name.endswith(".pkl"):
+                        os.remove(entrada.path)
+
+    def estatisticas(self):
+        acertos = self.acertos_memoria + self.acertos_disco
+        consultas = acertos + self.falhas
+        return {
+            "acertos": acertos, "acertos_memoria": self.acertos_memoria,
+            "acertos_disco": self.acertos_disco, "falhas": self.falhas,
+            "taxa_acerto": acertos / consultas if consultas else 0.0,
+            "itens_memoria": len(self._memoria), "erros_disco": self.erros_disco,
+        }
@@ -0,0 +1,422 @@
+# core/circuito.py
+
+import copy
+
+import numpy as np
+import scipy.sparse as sp
+
+from core.diagnostico import CircuitoSingularError, verificar_topologia
+from core.fatoracao import escolher_esparso, fatorar
+from core.ordenacao import ESTRATEGIAS as ESTRATEGIAS_ORDENACAO, ordenar, padrao_simetrico
+from netlist_parser.tabela import TIPOS, CODIGO_TIPO, TabelaComponentes
+
+# Limite de memória (em bytes) para cada bloco de matrizes empilhadas nas soluções em lote
+LIMITE_BYTES_BLOCO = 64 * 1024 * 1024
+
+R, L, C, Z, V, E, F, G, H = range(len(TIPOS))
+
+# Partes da matriz pela dependência em frequência: A(w) = G + jw*C + L/(jw)
+PARTE_G, PARTE_C, PARTE_L = 0, 1, 2
+
+class CompiledCircuit:
+    """
+    Topologia da ANM compilada uma única vez a partir dos componentes: mapas de
+    nós e ramos, arrays de índices das estampas de cada tipo de elemento e o
+    padrão de esparsidade da matriz. evaluate() apenas preenche números.
+    """
+    def __init__(self, componentes, metodo='auto', verificar=True, ordenacao='auto'):
+        # Listas de dicts no formato antigo são convertidas; a saída do parser já é uma tabela
+        componentes = TabelaComponentes.de_componentes(componentes)
+        if verificar:
+            verificar_topologia(componentes)
+        self.componentes = componentes
+        self.nomes = componentes.nomes
+        self.indice_componente = componentes.indice
+        K = len(componentes)
+
+        # Nós em ordem alfabética; ids_ordenados[i] é o id na tabela do i-ésimo nó
+        ids_ordenados = sorted(range(1, len(componentes.nos)), key=componentes.nos.__getitem__)
+        self.nos = [componentes.nos[i] for i in ids_ordenados]
+        self.mapa_nos = {no: i for i, no in enumerate(self.nos)}
+
+        self.tipos = componentes.tipos
+        # Fontes independentes primeiro, depois as dependentes (E, H), como na ANM original
+        ordem_ramos = np.concatenate([np.flatnonzero(self.tipos == V), np.flatnonzero(np.isin(self.tipos, [E, H]))])
+        self.fontes_v = [self.nomes[k] for k in ordem_ramos]
+        self.mapa_fontes_v = {nome: i for i, nome in enumerate(self.fontes_v)}
+
+        self.N = len(self.nos)
+        self.M = len(self.fontes_v)
+        self.dimensao = n = self.N + self.M
+        self.incognitas = self.nos + [f"I({nome})" for nome in self.fontes_v]
+        # O nó '0' (id 0 da tabela) e os terminais ausentes (-1) vão para o índice n:
+        # uma posição "sumidouro" fora do sistema
+        indice_no = np.full(len(componentes.nos) + 1, n, dtype=np.int64)
+        indice_no[ids_ordenados] = np.arange(self.N)
+
+        self.n1 = indice_no[componentes.n1]
+        self.n2 = indice_no[componentes.n2]
+        self.nc1 = indice_no[componentes.nc1]
+        self.nc2 = indice_no[componentes.nc2]
+        self.ramo = np.full(K, n, dtype=np.int64)
+        self.ramo[ordem_ramos] = self.N + np.arange(self.M)
+        self.controle = np.full(K, n, dtype=np.int64)
+        for linha, fonte in componentes.controles.items():
+            self.controle[linha] = self.N + self.mapa_fontes_v[fonte]
+        self.valores = componentes.valores
+        self.fases = np.nan_to_num(componentes.fases)
+        self.tolerancias = np.nan_to_num(componentes.tolerancias)
+
+        self.parte = np.full(K, PARTE_G, dtype=np.int8)
+        self.parte[self.tipos == C] = PARTE_C
+        self.parte[self.tipos == L] = PARTE_L
+        # Instâncias de subcircuitos agrupadas por definição: (SubcircuitoCompilado, portas (m, k))
+        self.subcircuitos = []
+        if componentes.instancias:
+            from core.subcircuito import compilar_subcircuito
+            grupos = {}
+            for instancia in componentes.instancias:
+                grupos.setdefault(id(instancia.subcircuito), (instancia.subcircuito, []))[1].append(indice_no[instancia.portas])
+            self.subcircuitos = [(compilar_subcircuito(sub), np.array(portas)) for sub, portas in grupos.values()]
+        self._compilar_estampas()
+
+        self.esparso = escolher_esparso(metodo, n)
+        self._partes_padrao = None
+        self._estampas_por_elemento = None
+        # Rotação entre as fases (core.trifasico), calculada sob demanda; False se não houver
+        self.simetria = None
+        # Estratégia de ordenação da LU esparsa e as ordens já calculadas (compartilhadas por com_valores)
+        if ordenacao not in ESTRATEGIAS_ORDENACAO:
+            raise ValueError(f"Ordenação desconhecida: '{ordenacao}' (use {', '.join(ESTRATEGIAS_ORDENACAO)}).")
+        self.ordenacao = ordenacao
+        self._ordens = {}
+        if self.esparso:
+            self._matriz = sp.csc_matrix((np.zeros(self.nnz, dtype=complex), self._indices, self._indptr), shape=(n, n))
+        else:
+            self._matriz = np.zeros((n, n), dtype=complex)
+
+    def _compilar_estampas(self):
+        n, K = self.dimensao, len(self.nomes)
+        unidade = K  # Coeficiente constante 1 das incidências das fontes de tensão
+        linhas, colunas, elementos, sinais = [], [], [], []
+        def estampas(mascara, pares, elemento=None):
+            idx = np.flatnonzero(mascara)
+            for linha, coluna, sinal in pares:
+                linhas.append(linha[idx]); colunas.append(coluna[idx])
+                elementos.append(idx if elemento is None else np.full(idx.size, elemento))
+                sinais.append(np.full(idx.size, sinal, dtype=float))
+
+        t = self.tipos
+        n1, n2, nc1, nc2, ramo, ctrl = self.n1, self.n2, self.nc1, self.nc2, self.ramo, self.controle
+        estampas(np.isin(t, [R, L, C, Z]), [(n1, n1, 1), (n2, n2, 1), (n1, n2, -1), (n2, n1, -1)])
+        estampas(t == G, [(n1, nc1, -1), (n1, nc2, 1), (n2, nc1, 1), (n2, nc2, -1)])
+        estampas(t == F, [(n1, ctrl, 1), (n2, ctrl, -1)])
+        estampas(np.isin(t, [V, E, H]), [(n1, ramo, 1), (ramo, n1, 1), (n2, ramo, -1), (ramo, n2, -1)], unidade)
+        estampas(t == E, [(ramo, nc1, -1), (ramo, nc2, 1)])
+        estampas(t == H, [(ramo, ctrl, -1)])
+
+        linhas, colunas = np.concatenate(linhas), np.concatenate(colunas)
+        validas = (linhas < n) & (colunas < n)
+        self.estampa_linha = linhas[validas]
+        self.estampa_coluna = colunas[validas]
+        self.estampa_elemento = np.concatenate(elementos)[validas]
+        self.estampa_sinal = np.concatenate(sinais)[validas]
+
+        # Blocos das portas das instâncias de subcircuitos: cada entrada aponta para
+        # a entrada (i, j) da matriz de admitância da sua definição
+        vazio = np.empty(0, dtype=np.int64)
+        linhas_sub, colunas_sub, entradas_sub = [vazio], [vazio], [vazio]
+        total_entradas = 0
+        for _, portas in self.subcircuitos:
+            m, k = portas.shape
+            linhas_sub.append(np.repeat(portas, k, axis=1).ravel())
+            colunas_sub.append(np.tile(portas, (1, k)).ravel())
+            entradas_sub.append(np.tile(np.arange(k * k), m) + total_entradas)
+            total_entradas += k * k
+        linhas_sub, colunas_sub, entradas_sub = np.concatenate(linhas_sub), np.concatenate(colunas_sub), np.concatenate(entradas_sub)
+        validas = (linhas_sub < n) & (colunas_sub < n)
+        posicoes_sub = colunas_sub[validas] * n + linhas_sub[validas]
+
+        # Posições únicas em ordem de coluna (CSC); estampas repetidas são somadas
+        posicoes, inverso = np.unique(np.concatenate([self.estampa_coluna * n + self.estampa_linha, posicoes_sub]),
+                                      return_inverse=True)
+        self._inverso = inverso[:self.estampa_linha.size]
+        self.nnz = posicoes.size
+        self._indices = posicoes % n
+        colunas_unicas = posicoes // n
+        self._indptr = np.concatenate([[0], np.cumsum(np.bincount(colunas_unicas, minlength=n))])
+        self._posicoes_densas = self._indices * n + colunas_unicas
+
+        # Matrizes de espalhamento (nnz x estampas) de cada parte: dados = P @ pesos
+        parte = np.append(self.parte, PARTE_G)[self.estampa_elemento]
+        self._espalhamento = []
+        for p in (PARTE_G, PARTE_C, PARTE_L):
+            sel = np.flatnonzero(parte == p)
+            self._espalhamento.append(sp.csr_matrix(
+                (np.ones(sel.size), (self._inverso[sel], sel)), shape=(self.nnz, self.estampa_elemento.size)))
+        self._espalhamento_subcircuitos = sp.csr_matrix(
+            (np.ones(posicoes_sub.size), (inverso[self.estampa_linha.size:], entradas_sub[validas])),
+            shape=(self.nnz, total_entradas))
+
+    def coeficientes(self, valores=None):
+        # Coeficiente de cada elemento dentro da sua parte (G: y, C: y/(jw), L: y*jw),
+        # seguido do coeficiente unitário das incidências das fontes de tensão
+        valores = self.valores if valores is None else np.asarray(valores, dtype=complex)
+        coef = self._coeficientes_de(np.arange(self.tipos.size), valores)
+        return np.concatenate([coef, np.ones(coef.shape[:-1] + (1,), dtype=complex)], axis=-1)
+
+    def _coeficientes_de(self, elementos, valores):
+        inverso = np.isin(self.tipos[elementos], [R, Z, L])
+        nulos = inverso & np.any(valores == 0, axis=tuple(range(valores.ndim - 1)))
+        if nulos.any():
+            nomes = [self.nomes[k] for k in elementos[nulos]]
+            raise CircuitoSingularError(
+                f"Componentes com valor nulo (curto-circuito ideal): {', '.join(nomes[:10])}.", componentes=nomes)
+        return np.where(inverso, 1 / np.where(inverso, valores, 1), valores)
+
+    def com_valores(self, elementos, valores, fases=None, tolerancias=None):
+        """
+        Cópia do circuito com os valores de alguns componentes trocados. A
+        topologia compilada é compartilhada (o original não é alterado) e só as
+        estampas dos elementos alterados são recalculadas nas partes G, C e L.
+        """
+        elementos = np.asarray(elementos, dtype=np.int64)
+        valores = np.asarray(valores, dtype=complex)
+        novo = copy.copy(self)
+        novo.componentes = self.componentes.com_valores(elementos, valores, fases, tolerancias)
+        novo.valores = novo.componentes.valores
+        novo.fases = np.nan_to_num(novo.componentes.fases)
+        novo.tolerancias = np.nan_to_num(novo.componentes.tolerancias)
+        novo._matriz = self._matriz.copy()
+
+        if self._partes_padrao is not None:
+            if self._estampas_por_elemento is None:
+                ordem = np.argsort(self.estampa_elemento, kind='stable')
+                limites = np.searchsorted(self.estampa_elemento[ordem], np.arange(self.tipos.size + 2))
+                self._estampas_por_elemento = novo._estampas_por_elemento = (ordem, limites)
+            ordem, limites = self._estampas_por_elemento
+            contagens = limites[elementos + 1] - limites[elementos]
+            estampas = np.concatenate([ordem[limites[k]:limites[k + 1]] for k in elementos]) if elementos.size else ordem[:0]
+            delta = self._coeficientes_de(elementos, valores) - self._coeficientes_de(elementos, self.valores[elementos])
+            # Cada estampa afetada recebe a variação do coeficiente do seu elemento
+            delta_estampa = self.estampa_sinal[estampas] * np.repeat(delta, contagens)
+            parte = self.parte[self.estampa_elemento[estampas]]
+            partes = list(self._partes_padrao)
+            for p in np.unique(parte):
+                selecao = parte == p
+                partes[p] = partes[p].copy()
+                np.add.at(partes[p], self._inverso[estampas[selecao]], delta_estampa[selecao])
+            novo._partes_padrao = tuple(partes)
+        return novo
+
+    def partes(self, valores=None):
+        """
+        Dados (no padrão CSC compilado) das partes G, C e L da matriz.
+        """
+        if valores is None and self._partes_padrao is not None:
+            return self._partes_padrao
+        coef = self.coeficientes(valores)
+        pesos = self.estampa_sinal * coef[..., self.estampa_elemento]
+        dados = tuple(np.asarray(P @ pesos.T).T for P in self._espalhamento)
+        if valores is None:
+            self._partes_padrao = dados
+        return dados
+
+    def dados_matriz(self, frequencia, valores=None):
+        dG, dC, dL = self.partes(valores)
+        jw = 2j * np.pi * np.asarray(frequencia, dtype=float)[..., None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dados = dG + jw * dC + dL / jw
+        if self.subcircuitos:
+            dados = dados + self._dados_subcircuitos(frequencia)
+        return dados
+
+    def _dados_subcircuitos(self, frequencia):
+        # Blocos das portas de todas as instâncias, das admitâncias (em cache) de cada definição
+        frequencias = np.asarray(frequencia, dtype=float)
+        blocos = np.concatenate([compilado.admitancias(frequencias) for compilado, _ in self.subcircuitos], axis=1)
+        dados = (self._espalhamento_subcircuitos @ blocos.T).T
+        return dados.reshape(frequencias.shape + (self.nnz,))
+
+    def evaluate(self, frequencia, valores=None, nova=False):
+        """
+        Preenche a matriz da ANM pré-alocada na frequência dada. A mesma matriz
+        é reaproveitada entre chamadas; com nova=True, a matriz é alocada só
+        para esta chamada (circuitos usados por várias threads ao mesmo tempo).
+        """
+        dados = self.dados_matriz(frequencia, valores)
+        if nova:
+            return self._matriz_nova(dados)
+        if self.esparso:
+            self._matriz.data[:] = dados
+        else:
+            self._matriz.ravel()[self._posicoes_densas] = dados
+        return self._matriz
+
+    def montar(self, coeficientes):
+        """
+        Matriz nova (não a pré-alocada) no padrão compilado, com um coeficiente
+        por elemento seguido do unitário das fontes de tensão, como em
+        coeficientes(), e no tipo de dado deles. Serve às análises cujos
+        coeficientes não seguem G + jwC + L/(jw), como a análise no tempo.
+        """
+        if self.subcircuitos:
+            # Os blocos das portas só existem no domínio da frequência
+            raise ValueError("Subcircuitos (X) só são suportados nas análises em frequência.")
+        coeficientes = np.asarray(coeficientes)
+        pesos = self.estampa_sinal * coeficientes[self.estampa_elemento]
+        return self._matriz_nova(sum(P @ pesos for P in self._espalhamento))
+
+    def _matriz_nova(self, dados):
+        n = self.dimensao
+        if self.esparso:
+            return sp.csc_matrix((dados, self._indices.copy(), self._indptr.copy()), shape=(n, n))
+        A = np.zeros(n * n, dtype=dados.dtype)
+        A[self._posicoes_densas] = dados
+        return A.reshape(n, n)
+
+    def evaluate_lote(self, frequencias, valores=None):
+        """
+        Pilha densa de matrizes (lote, n, n) para frequências e/ou conjuntos de
+        valores diferentes, pronta para um np.linalg.solve em lote.
+        """
+        dados = np.atleast_2d(self.dados_matriz(frequencias, valores))
+        n = self.dimensao
+        A = np.zeros((dados.shape[0], n * n), dtype=complex)
+        A[:, self._posicoes_densas] = dados
+        return A.reshape(-1, n, n)
+
+    def excitacao(self, valores=None, fases=None):
+        valores = self.valores if valores is None else np.asarray(valores, dtype=complex)
+        fases = self.fases if fases is None else np.asarray(fases, dtype=float)
+        fontes = np.flatnonzero(self.tipos == V)
+        z = np.zeros(valores.shape[:-1] + (self.dimensao + 1,), dtype=complex)
+        z[..., self.ramo[fontes]] = valores[..., fontes] * np.exp(1j * np.deg2rad(fases[fontes]))
+        return z[..., :self.dimensao]
+
+    def ordem_fatoracao(self):
+        """
+        Ordem de eliminação das incógnitas na LU esparsa pela estratégia de
+        ordenação do circuito, calculada uma vez por topologia (None na densa
+        ou com 'colamd').
+        """
+        if not self.esparso:
+            return None
+        if self.ordenacao not in self._ordens:
+            self._ordens[self.ordenacao] = ordenar(padrao_simetrico(self._indices, self._indptr, self.dimensao), self.ordenacao)
+        return self._ordens[self.ordenacao]
+
+    def fatorar(self, frequencia, valores=None):
+        return fatorar(self.evaluate(frequencia, valores), self.esparso, self.incognitas, self.ordem_fatoracao())
+
+    def iterar_lote(self, frequencias, valores=None, tamanho_bloco=None, excitacoes=None):
+        """
+        Resolve um lote de sistemas com a mesma topologia: frequências (B,) e/ou
+        conjuntos de valores (B, K). Cada bloco é resolvido com um único
+        np.linalg.solve sobre as matrizes empilhadas (ou LU esparsa por item).
+        excitacoes (B, N + M) substitui o lado direito de cada item (padrão: o
+        das fontes, excitacao()).
+        Gera tuplas (inicio, solucoes) com solucoes de forma (B_bloco, N + M).
+        """
+        frequencias = np.asarray(frequencias, dtype=float)
+        if valores is not None:
+            valores = np.atleast_2d(np.asarray(valores, dtype=complex))
+        total = max(frequencias.size, 1 if valores is None else valores.shape[0])
+        frequencias = np.broadcast_to(frequencias, (total,))
+        n = self.dimensao
+        if tamanho_bloco is None:
+            tamanho_bloco = 64 if self.esparso else max(1, int(LIMITE_BYTES_BLOCO // (16 * max(n, 1) ** 2)))
+
+        for inicio in range(0, total, tamanho_bloco):
+            f = frequencias[inicio:inicio + tamanho_bloco]
+            v = None if valores is None else valores[inicio:inicio + tamanho_bloco]
+            if excitacoes is None:
+                z = np.broadcast_to(self.excitacao(v), (len(f), n))
+            else:
+                z = excitacoes[inicio:inicio + len(f)]
+            if self.esparso:
+                solucoes = np.empty((len(f), n), dtype=complex)
+                for k in range(len(f)):
+                    A = self.evaluate(f[k], None if v is None else v[k])
+                    solucoes[k] = self._fatorar_item(A, f[k], inicio + k, v is not None).solve(z[k])
+                yield inicio, solucoes
+                continue
+            A = self.evaluate_lote(f, v)
+            try:
+                solucoes = np.linalg.solve(A, z[..., None])[..., 0]
+            except np.linalg.LinAlgError:
+                # Localiza o item problemático para uma mensagem de erro útil
+                solucoes = np.array([self._fatorar_item(A[k], f[k], inicio + k, v is not None).solve(z[k])
+                                     for k in range(len(f))])
+            yield inicio, solucoes
+
+    def _fatorar_item(self, A, frequencia, indice, por_amostra):
+        try:
+            return fatorar(A, self.esparso, self.incognitas, self.ordem_fatoracao())
+        except CircuitoSingularError as e:
+            contexto = f"amostra {indice}" if por_amostra else f"f = {frequencia:g} Hz"
+            raise CircuitoSingularError(f"{e.message} (em {contexto})", nos=e.nos, componentes=e.componentes)
+
+    def admitancias(self, frequencia, valores=None):
+        coef = self.coeficientes(valores)[..., :-1]
+        jw = 2j * np.pi * np.asarray(frequencia, dtype=float)[..., None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            escala = np.where(self.parte == PARTE_C, jw, np.where(self.parte == PARTE_L, 1 / jw, 1))
+        return coef * escala
+
+    def pos_processar(self, solucao, frequencia, valores=None):
+        """
+        Tensões, correntes e potências de todos os componentes a partir da solução.
+        Aceita dimensões iniciais de lote (frequências ou amostras) em solucao.
+        """
+        valores = self.valores if valores is None else np.asarray(valores, dtype=complex)
+        x = np.concatenate([solucao, np.zeros(solucao.shape[:-1] + (1,), dtype=complex)], axis=-1)
+        t = self.tipos
+        tensoes = x[..., self.n1] - x[..., self.n2]
+
+        y = self.admitancias(frequencia, valores)
+        with np.errstate(invalid='ignore'):
+            correntes = np.where(np.isfinite(y), tensoes * y, 0)
+        correntes = np.where(np.isin(t, [R, L, C, Z]), correntes, 0)
+        correntes = np.where(np.isin(t, [V, E, H]), -x[..., self.ramo], correntes)
+        correntes = np.where(t == G, valores * (x[..., self.nc1] - x[..., self.nc2]), correntes)
+        correntes = np.where(t == F, valores * -x[..., self.controle], correntes)
+        return tensoes, correntes, tensoes * np.conj(correntes)
+
+    def resolver(self, frequencia, valores=None):
+        fatoracao = self.fatorar(frequencia, valores)
+        solucao = fatoracao.solve(self.excitacao(valores))
+        return ResultadoAnalise(self, frequencia, solucao, valores)
+
+class ResultadoAnalise:
+    def __init__(self, circuito, frequencia, solucao, valores=None):
+        self.circuito = circuito
+        self.frequencia = frequencia
+        self.solucao = solucao
+        self.nos = circuito.nos
+        self.componentes = circuito.nomes
+        self.tensoes_nos = solucao[:circuito.N]
+        self.tensoes, self.correntes, self.potencias = circuito.pos_processar(solucao, frequencia, valores)
+
+        self.z_eq = None
+        self.i_total = None
+        fontes = np.flatnonzero(circuito.tipos == V)
+        if fontes.size:
+            k = fontes[0]
+            self.i_total = self.correntes[k]
+            if self.i_total and abs(self.i_total) > 1e-12:
+                valores = circuito.valores if valores is None else valores
+                v_fonte = valores[k] * np.exp(1j * np.deg2rad(circuito.fases[k]))
+                self.z_eq = v_fonte / self.i_total
+            else:
+                self.z_eq = complex(np.inf, np.inf)
+
+    def como_tupla(self):
+        """
+        Formato histórico de montar_matriz_anm: dicionários indexados por nome.
+        """
+        V_nodal = dict(zip(self.nos, self.tensoes_nos)); V_nodal['0'] = 0
+        correntes = dict(zip(self.componentes, self.correntes))
+        potencias = dict(zip(self.componentes, self.potencias))
+        tensoes_componentes = dict(zip(self.componentes, self.tensoes))
+        return V_nodal, correntes, potencias, tensoes_componentes, self.z_eq, self.i_total
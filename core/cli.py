@@ -0,0 +1,243 @@
+# core/cli.py
+
+"""
+Analisador em lote sem interface gráfica (não importa Qt nem matplotlib).
+
+    python -m core.cli circuito.txt
+    python -m core.cli netlists/ -f 50 -o resultados.csv -j 8
+    python -m core.cli "casos/*.net" -o resultados.json
+    python -m core.cli netlists/ --varredura saidas/ --formato-varredura npz
+    python -m core.cli netlists/ --transiente saidas/ --formato-transiente csv
+    python -m core.cli malha.net --ordenacao nd
+    python -m core.cli malha.net --preenchimento
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from core.analise import AVISO_TRAN_SUBCIRCUITOS, analisar_netlist
+from core.cache import CacheResultados
+from core.circuito import CompiledCircuit
+from core.exportacao import colunas_resultado, escrever_linhas_csv, exportar_transiente, exportar_varredura
+from core.ordenacao import ESTRATEGIAS, relatorio_preenchimento
+from core.varredura import gerar_frequencias
+from netlist_parser.parser import NetlistParseError, parse_netlist_linhas
+
+EXTENSOES_NETLIST = ('.txt', '.net', '.cir', '.sp')
+COLUNAS_CSV = ["arquivo", "elemento", "nome", "grandeza", "real", "imag", "modulo", "fase_graus"]
+
+_cache = None  # Um cache por processo do pool
+
+def listar_netlists(entradas):
+    """
+    Expande arquivos, diretórios (arquivos com EXTENSOES_NETLIST) e padrões glob.
+    """
+    arquivos = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            arquivos.extend(sorted(os.path.join(entrada, nome) for nome in os.listdir(entrada)
+                                   if nome.lower().endswith(EXTENSOES_NETLIST)))
+        elif os.path.isfile(entrada):
+            arquivos.append(entrada)
+        else:
+            encontrados = sorted(glob.glob(entrada, recursive=True))
+            if not encontrados:
+                raise FileNotFoundError(f"Nenhuma netlist encontrada em '{entrada}'")
+            arquivos.extend(p for p in encontrados if os.path.isfile(p))
+    return list(dict.fromkeys(arquivos))
+
+def _linhas_resultado(resultado):
+    # (elemento, nome, grandeza, valor complexo) de cada grandeza da solução
+    elementos, nomes, grandezas, valores = colunas_resultado(resultado)
+    return list(zip(elementos, nomes, grandezas, valores.tolist()))
+
+def analisar_arquivo(caminho, frequencia, metodo='auto', diretorio_cache=None, diretorio_varredura=None,
+                     formato_varredura='npz', diretorio_transiente=None, formato_transiente='npz', ordenacao='auto'):
+    """
+    Analisa uma netlist; executado nos processos do pool. Erros viram um
+    resultado com status "erro" para não interromper o lote.
+    Com diretorio_varredura, a varredura .AC da netlist (se houver) é resolvida
+    e gravada em blocos num arquivo próprio, sem ficar inteira na memória; o
+    mesmo vale para a análise .TRAN com diretorio_transiente.
+    """
+    global _cache
+    if diretorio_cache and _cache is None:
+        _cache = CacheResultados(diretorio=diretorio_cache)
+    inicio = time.perf_counter()
+    try:
+        with open(caminho, 'r', encoding='utf-8') as arquivo:
+            texto = arquivo.read()
+        analise = analisar_netlist(texto, frequencia, metodo, cache=_cache, com_diretivas=False, ordenacao=ordenacao)
+        saida = {"arquivo": caminho, "status": "ok", "erro": None,
+                 "linhas": _linhas_resultado(analise["resultado"]), "varredura": None, "transiente": None, "avisos": [],
+                 "trifasico": analise["trifasico"], "harmonicos": analise["harmonicos"].resumo() if analise["harmonicos"] else None}
+        ac = analise["diretivas"].get('AC')
+        if diretorio_varredura and ac:
+            nome = os.path.splitext(os.path.basename(caminho))[0]
+            saida["varredura"] = os.path.join(diretorio_varredura, f"{nome}.{formato_varredura}")
+            frequencias = gerar_frequencias(ac['modo'], ac['pontos'], ac['f_inicial'], ac['f_final'])
+            exportar_varredura(analise["circuito"], saida["varredura"], formato_varredura, frequencias=frequencias)
+        tran = analise["diretivas"].get('TRAN')
+        if diretorio_transiente and tran and analise["circuito"].subcircuitos:
+            saida["avisos"].append(AVISO_TRAN_SUBCIRCUITOS)
+        elif diretorio_transiente and tran:
+            nome = os.path.splitext(os.path.basename(caminho))[0]
+            saida["transiente"] = os.path.join(diretorio_transiente, f"{nome}.{formato_transiente}")
+            exportar_transiente(analise["circuito"], saida["transiente"], formato_transiente, frequencia=frequencia, **tran)
+    except (NetlistParseError, ValueError, OSError) as e:
+        saida = {"arquivo": caminho, "status": "erro", "erro": str(e), "linhas": [], "varredura": None,
+                 "transiente": None, "trifasico": None, "harmonicos": None, "avisos": []}
+    saida["tempo"] = time.perf_counter() - inicio
+    return saida
+
+def escrever_csv(resultados, destino):
+    escritor = csv.writer(destino)
+    escritor.writerow(COLUNAS_CSV)
+    for r in resultados:
+        if not r["linhas"]:
+            continue
+        elementos, nomes, grandezas, valores = zip(*r["linhas"])
+        escrever_linhas_csv(escritor, ([r["arquivo"]] * len(nomes), elementos, nomes, grandezas), valores)
+
+def _documento_json(r):
+    grandezas = {}
+    for elemento, nome, grandeza, valor in r["linhas"]:
+        grandezas.setdefault(elemento, {}).setdefault(nome, {})[grandeza] = [valor.real, valor.imag]
+    documento = {"arquivo": r["arquivo"], "status": r["status"], "erro": r["erro"],
+                 "tempo_s": r["tempo"], "resultados": grandezas}
+    if r.get("varredura"):
+        documento["varredura"] = r["varredura"]
+    if r.get("transiente"):
+        documento["transiente"] = r["transiente"]
+    if r.get("harmonicos"):
+        documento["harmonicos"] = r["harmonicos"]
+    if r.get("avisos"):
+        documento["avisos"] = r["avisos"]
+    if r.get("trifasico") not in (None, "completo"):
+        documento["trifasico"] = r["trifasico"]
+    return documento
+
+def escrever_json(resultados, destino):
+    json.dump([_documento_json(r) for r in resultados], destino, indent=2, ensure_ascii=False)
+    destino.write("\n")
+
+def escrever_jsonl(resultados, destino):
+    # Uma netlist por linha
+    for r in resultados:
+        destino.write(json.dumps(_documento_json(r), ensure_ascii=False) + "\n")
+
+def analisar_lote(arquivos, frequencia=60, metodo='auto', processos=None, diretorio_cache=None, relatorio=None,
+                  diretorio_varredura=None, formato_varredura='npz', diretorio_transiente=None,
+                  formato_transiente='npz', ordenacao='auto'):
+    """
+    Distribui as netlists entre processos e devolve os resultados na ordem de
+    entrada. relatorio(resultado) é chamado a cada arquivo concluído.
+    """
+    resultados = [None] * len(arquivos)
+    if processos == 1 or len(arquivos) <= 1:
+        for i, caminho in enumerate(arquivos):
+            resultados[i] = analisar_arquivo(caminho, frequencia, metodo, diretorio_cache, diretorio_varredura,
+                                             formato_varredura, diretorio_transiente, formato_transiente, ordenacao)
+            if relatorio: relatorio(resultados[i])
+        return resultados
+
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        futuros = {pool.submit(analisar_arquivo, caminho, frequencia, metodo, diretorio_cache, diretorio_varredura,
+                               formato_varredura, diretorio_transiente, formato_transiente, ordenacao): i
+                   for i, caminho in enumerate(arquivos)}
+        for futuro in as_completed(futuros):
+            resultados[futuros[futuro]] = futuro.result()
+            if relatorio: relatorio(resultados[futuros[futuro]])
+    return resultados
+
+def escrever_preenchimento(arquivos, frequencia, destino=sys.stdout):
+    """
+    Tabela dos não nulos antes (matriz) e depois (L + U) da fatoração esparsa
+    de cada netlist com cada ordenação.
+    """
+    erros = 0
+    for caminho in arquivos:
+        try:
+            with open(caminho, 'r', encoding='utf-8') as arquivo:
+                circuito = CompiledCircuit(parse_netlist_linhas(arquivo), 'esparso')
+            relatorio = relatorio_preenchimento(circuito, frequencia)
+        except (NetlistParseError, ValueError, OSError) as e:
+            print(f"{caminho}: ERRO: {e}", file=destino)
+            erros += 1
+            continue
+        print(f"{caminho}: {circuito.dimensao} incógnitas, {relatorio[0]['nnz_matriz']} não nulos na matriz", file=destino)
+        print(f"  {'ordenação':10s} {'nnz(L+U)':>12s} {'preench.':>9s} {'ordenar (s)':>12s} {'fatorar (s)':>12s}", file=destino)
+        for r in relatorio:
+            print(f"  {r['estrategia']:10s} {r['nnz_fatores']:12d} {r['preenchimento']:8.1f}x "
+                  f"{r['tempo_ordenacao']:12.4f} {r['tempo_fatoracao']:12.4f}", file=destino)
+    return 1 if erros else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.cli", description="Análise CA em lote de netlists, sem interface gráfica.")
+    parser.add_argument("entradas", nargs="+", help="arquivos de netlist, diretórios ou padrões glob")
+    parser.add_argument("-f", "--frequencia", type=float, default=60, help="frequência de análise em Hz (padrão: 60)")
+    parser.add_argument("-o", "--saida", help="arquivo de saída (.csv, .json ou .jsonl); padrão: saída padrão")
+    parser.add_argument("--formato", choices=["csv", "json", "jsonl"], help="formato de saída (padrão: pela extensão, ou csv)")
+    parser.add_argument("-j", "--processos", type=int, default=None, help="número de processos (padrão: núcleos disponíveis)")
+    parser.add_argument("--metodo", choices=["auto", "denso", "esparso"], default="auto", help="solver linear")
+    parser.add_argument("--ordenacao", choices=ESTRATEGIAS, default="auto",
+                        help="ordenação das incógnitas na LU esparsa (padrão: auto, grau mínimo)")
+    parser.add_argument("--preenchimento", action="store_true",
+                        help="só mostra os não nulos da matriz e dos fatores LU com cada ordenação")
+    parser.add_argument("--cache-dir", help="diretório do cache de resultados em disco")
+    parser.add_argument("--varredura", metavar="DIR", help="grava a varredura .AC de cada netlist em DIR/<netlist>.<formato>")
+    parser.add_argument("--formato-varredura", choices=["csv", "jsonl", "npz"], default="npz",
+                        help="formato dos arquivos de varredura (padrão: npz)")
+    parser.add_argument("--transiente", metavar="DIR", help="grava a análise .TRAN de cada netlist em DIR/<netlist>.<formato>")
+    parser.add_argument("--formato-transiente", choices=["csv", "jsonl", "npz"], default="npz",
+                        help="formato dos arquivos da análise no tempo (padrão: npz)")
+    parser.add_argument("-q", "--silencioso", action="store_true", help="não mostra o tempo de cada arquivo")
+    args = parser.parse_args(argv)
+
+    try:
+        arquivos = listar_netlists(args.entradas)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+
+    if args.preenchimento:
+        return escrever_preenchimento(arquivos, args.frequencia)
+
+    extensao = os.path.splitext(args.saida or "")[1].lower().lstrip(".")
+    formato = args.formato or (extensao if extensao in ("json", "jsonl") else "csv")
+    for diretorio in (args.varredura, args.transiente):
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+
+    def relatorio(r):
+        if args.silencioso: return
+        estado = "ok" if r["status"] == "ok" else f"ERRO: {r['erro']}"
+        if r["avisos"]:
+            estado += f" ({'; '.join(r['avisos'])})"
+        print(f"{r['tempo'] * 1000:9.1f} ms  {r['arquivo']}  {estado}", file=sys.stderr)
+
+    inicio = time.perf_counter()
+    resultados = analisar_lote(arquivos, args.frequencia, args.metodo, args.processos, args.cache_dir, relatorio,
+                               args.varredura, args.formato_varredura, args.transiente, args.formato_transiente,
+                               args.ordenacao)
+    total = time.perf_counter() - inicio
+
+    escrever = {"csv": escrever_csv, "json": escrever_json, "jsonl": escrever_jsonl}[formato]
+    if args.saida:
+        with open(args.saida, 'w', newline='', encoding='utf-8') as destino:
+            escrever(resultados, destino)
+    else:
+        escrever(resultados, sys.stdout)
+
+    erros = sum(r["status"] != "ok" for r in resultados)
+    taxa = len(resultados) / total if total > 0 else float("inf")
+    print(f"{len(resultados)} netlists em {total:.3f} s ({taxa:.1f} netlists/s), {erros} com erro", file=sys.stderr)
+    return 1 if erros else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
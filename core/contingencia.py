@@ -0,0 +1,227 @@
+# core/contingencia.py
+
+import numpy as np
+
+from core.circuito import CompiledCircuit, ResultadoAnalise, LIMITE_BYTES_BLOCO, R, L, C, Z, V, E, F, G, H
+from core.diagnostico import CircuitoSingularError
+from netlist_parser.tabela import CODIGO_TIPO
+
+# Razão abaixo da qual o termo de correção de Sherman-Morrison-Woodbury é
+# considerado singular (a alteração isola parte do circuito)
+TOLERANCIA_SINGULAR = 1e-10
+
+class AnaliseIncremental:
+    """
+    Mantém a fatoração LU do circuito base numa frequência e calcula o efeito
+    de alterar, remover ou adicionar elementos com atualizações de posto baixo
+    (Sherman-Morrison-Woodbury), sem remontar nem refatorar a matriz.
+
+    Cada elemento altera a matriz por um produto externo: A' = A + u·d·vᵀ, com
+    u e v vetores de incidência (±1) e d a variação da admitância (ou do ganho,
+    nas fontes controladas). k alterações custam k substituições na LU existente
+    e um sistema k x k.
+    """
+    def __init__(self, circuito, frequencia, metodo='auto'):
+        if not isinstance(circuito, CompiledCircuit):
+            circuito = CompiledCircuit(circuito, metodo)
+        self.circuito = circuito
+        self.frequencia = frequencia
+        self.fatoracao = circuito.fatorar(frequencia)
+        self.solucao = self.fatoracao.solve(circuito.excitacao())
+        self.admitancias = circuito.admitancias(frequencia)
+        self._solucao_estendida = np.append(self.solucao, 0)
+
+        # Incidências (linha +1, linha -1) de u e v de cada elemento; o índice
+        # circuito.dimensao é o sumidouro (nó '0' ou terminal ausente)
+        c, t, n = circuito, circuito.tipos, circuito.dimensao
+        fonte_v = np.isin(t, [E, H])
+        self._u = (np.where(fonte_v, c.ramo, c.n1), np.where(fonte_v, n, c.n2))
+        self._v = (np.select([np.isin(t, [G, E]), np.isin(t, [F, H])], [c.nc1, c.controle], c.n1),
+                   np.select([np.isin(t, [G, E]), np.isin(t, [F, H])], [c.nc2, n], c.n2))
+        # As estampas de G, E e H entram na matriz com sinal negativo
+        self._sinal = np.where(np.isin(t, [G, E, H]), -1.0, 1.0)
+
+    def _incidencias(self, positivos, negativos):
+        n = self.circuito.dimensao
+        m = len(positivos)
+        U = np.zeros((n + 1, m), dtype=complex)
+        U[positivos, np.arange(m)] += 1
+        U[negativos, np.arange(m)] -= 1
+        return U[:n]
+
+    def _admitancia(self, tipos, valores):
+        # Mesma convenção de CompiledCircuit.admitancias para elementos avulsos
+        jw = 2j * np.pi * self.frequencia
+        valores = np.asarray(valores, dtype=complex)
+        with np.errstate(divide='ignore'):
+            return np.select([np.isin(tipos, [R, Z]), tipos == L, tipos == C],
+                             [1 / valores, 1 / (jw * valores), jw * valores], valores)
+
+    def atualizar(self, u, v, d, solucao=None, nomes=()):
+        """
+        Solução de (A + U·diag(d)·Vᵀ) x = b a partir da fatoração de A, com U e V
+        dados por pares de índices (positivos, negativos) de incidência e
+        solucao = A⁻¹b (padrão: a solução base).
+        """
+        x = self.solucao if solucao is None else solucao
+        d = np.asarray(d, dtype=complex)
+        if d.size == 0:
+            return x.copy()
+        W = np.atleast_2d(self.fatoracao.solve(self._incidencias(*u)).reshape(self.circuito.dimensao, -1))
+        W_estendida = np.vstack([W, np.zeros((1, W.shape[1]))])
+        x_estendida = np.append(x, 0)
+        VtW = W_estendida[v[0]] - W_estendida[v[1]]
+        Vtx = x_estendida[v[0]] - x_estendida[v[1]]
+        capacitancia = np.eye(d.size) + d[:, None] * VtW
+        if np.linalg.cond(capacitancia) > 1 / TOLERANCIA_SINGULAR:
+            raise CircuitoSingularError(
+                f"A alteração torna o circuito singular (isola nós ou curto-circuita fontes): {', '.join(nomes[:10])}.",
+                componentes=nomes)
+        return x - W @ np.linalg.solve(capacitancia, d * Vtx)
+
+    def resolver(self, valores=None, remover=(), adicionar=()):
+        """
+        Resultado do circuito com alterações aplicadas sobre a fatoração base.
+        valores: {nome: novo valor} de elementos existentes (fontes V mudam só a excitação);
+        remover: nomes de elementos R, L, C, Z, G ou F a desconectar;
+        adicionar: componentes R, L, C, Z ou G no formato do parser (dicts com
+        tipo, nome, n1, n2, valor e nc1/nc2 para G) entre nós já existentes.
+        Elementos adicionados entram na solução nodal, mas não nas grandezas por
+        componente do resultado.
+        """
+        c = self.circuito
+        valores = dict(valores or {})
+        for nome in remover:
+            k = self._indice(nome)
+            if c.tipos[k] in (V, E, H):
+                raise ValueError(f"Remover a fonte '{nome}' muda a dimensão do sistema; use uma nova análise.")
+            # Aberto: admitância (ou ganho) nula
+            valores[nome] = np.inf if c.tipos[k] in (R, L, Z) else 0
+
+        indices = np.array([self._indice(nome) for nome in valores], dtype=np.int64)
+        novos = c.valores.copy()
+        novos[indices] = list(valores.values())
+        solucao = self.solucao
+        fontes = indices[c.tipos[indices] == V]
+        if fontes.size:
+            solucao = self.fatoracao.solve(c.excitacao(novos))
+        alterados = indices[c.tipos[indices] != V]
+        d = self._sinal[alterados] * (c.admitancias(self.frequencia, novos)[alterados] - self.admitancias[alterados])
+        u = [self._u[0][alterados], self._u[1][alterados]]
+        v = [self._v[0][alterados], self._v[1][alterados]]
+        nomes = [c.nomes[k] for k in alterados]
+
+        for comp in adicionar:
+            tipo = CODIGO_TIPO.get(comp['tipo'].upper())
+            if tipo not in (R, L, C, Z, G):
+                raise ValueError(f"Só elementos R, L, C, Z e G podem ser adicionados (recebido '{comp['tipo']}').")
+            a, b = self._no(comp['n1']), self._no(comp['n2'])
+            ca, cb = (self._no(comp['nc1']), self._no(comp['nc2'])) if tipo == G else (a, b)
+            d = np.append(d, (-1 if tipo == G else 1) * self._admitancia(tipo, comp['valor']))
+            u[0], u[1] = np.append(u[0], a), np.append(u[1], b)
+            v[0], v[1] = np.append(v[0], ca), np.append(v[1], cb)
+            nomes.append(comp.get('nome', comp['tipo']))
+
+        solucao = self.atualizar(u, v, d, solucao, nomes)
+        # Elementos removidos têm valor infinito: inf * 0 nos termos descartados do pós-processamento
+        with np.errstate(invalid='ignore'):
+            return ResultadoAnalise(c, self.frequencia, solucao, novos)
+
+    def _indice(self, nome):
+        try:
+            return self.circuito.indice_componente[nome]
+        except KeyError:
+            raise ValueError(f"Componente desconhecido: '{nome}'")
+
+    def _no(self, no):
+        if no == '0':
+            return self.circuito.dimensao
+        try:
+            return self.circuito.mapa_nos[no]
+        except KeyError:
+            raise ValueError(f"Nó desconhecido: '{no}' (só é possível conectar a nós existentes)")
+
+class ResultadoContingencias:
+    def __init__(self, elementos, sinais, base, variacoes, singular):
+        self.elementos = elementos
+        self.sinais = sinais
+        self.base = base  # Valor complexo de cada sinal no circuito base
+        self.variacoes = variacoes  # (elementos, sinais): valor na contingência - valor base
+        self.singular = singular  # Contingências que isolam parte do circuito
+        with np.errstate(divide='ignore', invalid='ignore'):
+            relativas = np.abs(variacoes) / np.maximum(np.abs(base), 1e-12)
+        self.impacto = np.where(singular, np.inf, relativas.max(axis=1, initial=0.0))
+
+    def ranking(self, n=None):
+        """
+        Lista (nome, impacto, sinal mais afetado) em ordem decrescente de impacto,
+        com impacto = maior variação relativa entre os sinais monitorados.
+        """
+        ordem = np.argsort(-self.impacto, kind='stable')[:n]
+        pior = np.argmax(np.abs(self.variacoes), axis=1) if self.sinais else np.zeros(len(self.elementos), int)
+        return [(self.elementos[k], float(self.impacto[k]), self.sinais[pior[k]] if self.sinais else None)
+                for k in ordem]
+
+def _indices_sinais(circuito, sinais):
+    # "V(no)" -> tensão nodal; "I(fonte)" -> corrente de fonte de tensão (V, E, H)
+    if sinais is None:
+        sinais = [f"V({no})" for no in circuito.nos]
+    indices, escalas = [], []
+    for sinal in sinais:
+        grandeza, alvo = sinal[0].upper(), sinal[2:-1]
+        if grandeza == 'V' and alvo in circuito.mapa_nos:
+            indices.append(circuito.mapa_nos[alvo]); escalas.append(1.0)
+        elif grandeza == 'I' and alvo in circuito.mapa_fontes_v:
+            indices.append(circuito.N + circuito.mapa_fontes_v[alvo]); escalas.append(-1.0)
+        else:
+            raise ValueError(f"Sinal desconhecido: '{sinal}' (use V(nó) ou I(fonte de tensão))")
+    return list(sinais), np.array(indices, dtype=np.int64), np.array(escalas)
+
+def analisar_contingencias(componentes, frequencia, sinais=None, elementos=None, fator=0.0,
+                           tamanho_bloco=None, progresso=None):
+    """
+    Análise N-1: o efeito de desligar (fator=0) ou escalar a admitância
+    (fator=2 dobra uma carga) de cada elemento, um de cada vez, sobre os sinais
+    monitorados ("V(no)" ou "I(fonte)"; padrão: todas as tensões nodais).
+    elementos: nomes a testar (padrão: todos os R, L, C e Z).
+    Todas as contingências reaproveitam a mesma fatoração: cada bloco resolve
+    as incidências dos elementos como colunas de um único solve e aplica a
+    fórmula de Sherman-Morrison elemento a elemento.
+    progresso(fracao) é chamado após cada bloco.
+    """
+    base = componentes if isinstance(componentes, AnaliseIncremental) else AnaliseIncremental(componentes, frequencia)
+    c = base.circuito
+    if elementos is None:
+        indices = np.flatnonzero(np.isin(c.tipos, [R, L, C, Z]))
+    else:
+        indices = np.array([base._indice(nome) for nome in elementos], dtype=np.int64)
+        invalidos = [c.nomes[k] for k in indices if c.tipos[k] in (V, E, H)]
+        if invalidos:
+            raise ValueError(f"Fontes de tensão não podem ser desligadas na análise de contingências: {', '.join(invalidos)}")
+    nomes_sinais, linhas, escalas = _indices_sinais(c, sinais)
+
+    n = c.dimensao
+    if tamanho_bloco is None:
+        tamanho_bloco = max(1, int(LIMITE_BYTES_BLOCO // (16 * max(n, 1))))
+    x = base._solucao_estendida
+    variacoes = np.empty((indices.size, linhas.size), dtype=complex)
+    singular = np.zeros(indices.size, dtype=bool)
+    for inicio in range(0, indices.size, tamanho_bloco):
+        bloco = indices[inicio:inicio + tamanho_bloco]
+        d = (fator - 1) * base._sinal[bloco] * base.admitancias[bloco]
+        W = base.fatoracao.solve(base._incidencias(base._u[0][bloco], base._u[1][bloco])).reshape(n, -1)
+        W = np.vstack([W, np.zeros((1, bloco.size))])
+        colunas = np.arange(bloco.size)
+        vtw = W[base._v[0][bloco], colunas] - W[base._v[1][bloco], colunas]
+        vtx = x[base._v[0][bloco]] - x[base._v[1][bloco]]
+        # Sherman-Morrison: x' = x - w·d·(vᵀx) / (1 + d·vᵀw)
+        denominador = 1 + d * vtw
+        nulo = np.abs(denominador) < TOLERANCIA_SINGULAR * (1 + np.abs(d * vtw))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            coef = np.where(nulo, 0, d * vtx / np.where(nulo, 1, denominador))
+        variacoes[inicio:inicio + bloco.size] = -(W[linhas] * coef).T * escalas
+        singular[inicio:inicio + bloco.size] = nulo
+        if progresso: progresso((inicio + bloco.size) / indices.size)
+
+    return ResultadoContingencias([c.nomes[k] for k in indices], nomes_sinais,
+                                  x[linhas] * escalas, variacoes, singular)
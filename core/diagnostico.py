@@ -0,0 +1,127 @@
+# core/diagnostico.py
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+from collections import defaultdict, deque
+
+from netlist_parser.tabela import CODIGO_TIPO, TabelaComponentes
+
+class CircuitoSingularError(ValueError):
+    def __init__(self, message, nos=(), componentes=()):
+        self.message = message
+        self.nos = list(nos)
+        self.componentes = list(componentes)
+        super().__init__(message)
+
+class _ConjuntosDisjuntos:
+    def __init__(self):
+        self.pai = {}
+
+    def raiz(self, x):
+        pai = self.pai
+        if x not in pai:
+            pai[x] = x
+            return x
+        r = x
+        while pai[r] != r:
+            r = pai[r]
+        while pai[x] != r:
+            pai[x], x = r, pai[x]
+        return r
+
+    def unir(self, a, b):
+        ra, rb = self.raiz(a), self.raiz(b)
+        if ra == rb:
+            return False
+        self.pai[ra] = rb
+        return True
+
+def _listar(nomes, limite=10):
+    nomes = list(nomes)
+    texto = ", ".join(nomes[:limite])
+    if len(nomes) > limite:
+        texto += f" ... (+{len(nomes) - limite})"
+    return texto
+
+def _caminho_fontes(arestas, origem, destino):
+    # BFS na floresta de fontes de tensão para nomear o laço fechado por uma nova fonte
+    adj = defaultdict(list)
+    for nome, a, b in arestas:
+        adj[a].append((b, nome))
+        adj[b].append((a, nome))
+    anterior = {origem: None}
+    fila = deque([origem])
+    while fila:
+        no = fila.popleft()
+        if no == destino:
+            break
+        for vizinho, nome in adj[no]:
+            if vizinho not in anterior:
+                anterior[vizinho] = (no, nome)
+                fila.append(vizinho)
+    caminho = []
+    no = destino
+    while anterior.get(no):
+        no, nome = anterior[no]
+        caminho.append(nome)
+    return caminho[::-1]
+
+def verificar_topologia(componentes):
+    """
+    Verificação estrutural da netlist, linear no tamanho do circuito.
+    Levanta CircuitoSingularError para ilhas sem caminho até o nó '0',
+    laços formados só por fontes de tensão (V/E/H) e fontes F/H cujo
+    controle não existe. Instâncias de subcircuitos ligam as suas portas.
+    """
+    tabela = TabelaComponentes.de_componentes(componentes)
+    tipos, nomes, nos = tabela.tipos, tabela.nomes, tabela.nos
+    fontes = np.isin(tipos, [CODIGO_TIPO['V'], CODIGO_TIPO['E'], CODIGO_TIPO['H']])
+    fontes_v = {nomes[k] for k in np.flatnonzero(fontes)}
+    for linha, controle in sorted(tabela.controles.items()):
+        if controle not in fontes_v:
+            raise CircuitoSingularError(
+                f"Fonte {nomes[linha]} é controlada por '{controle}', que não é uma fonte de tensão da netlist.",
+                componentes=[nomes[linha]])
+
+    laco_fontes = _ConjuntosDisjuntos()
+    arestas_fontes = []
+    for k in np.flatnonzero(fontes):
+        n1, n2 = nos[tabela.n1[k]], nos[tabela.n2[k]]
+        if not laco_fontes.unir(n1, n2):
+            laco = _caminho_fontes(arestas_fontes, n1, n2) + [nomes[k]]
+            raise CircuitoSingularError(
+                f"Matriz singular: laço formado apenas por fontes de tensão ({_listar(laco)}).",
+                nos=[n1, n2], componentes=laco)
+        arestas_fontes.append((nomes[k], n1, n2))
+
+    # Fontes de corrente (G, F) não fixam a tensão entre seus terminais
+    conecta = ~np.isin(tipos, [CODIGO_TIPO['G'], CODIGO_TIPO['F']])
+    n1, n2 = tabela.n1[conecta], tabela.n2[conecta]
+    if tabela.instancias:
+        portas = [instancia.portas for instancia in tabela.instancias]
+        n1 = np.concatenate([n1] + [np.repeat(p[0], len(p) - 1) for p in portas])
+        n2 = np.concatenate([n2] + [p[1:] for p in portas])
+    grafo = sp.coo_matrix((np.ones(n1.size), (n1, n2)), shape=(len(nos), len(nos)))
+    _, rotulos = connected_components(grafo, directed=False)
+    ids_flutuantes = np.flatnonzero(rotulos != rotulos[0])
+    if ids_flutuantes.size:
+        flutuantes = sorted(nos[i] for i in ids_flutuantes)
+        ligados = np.isin(tabela.n1, ids_flutuantes) | np.isin(tabela.n2, ids_flutuantes)
+        comps = [nomes[k] for k in np.flatnonzero(ligados)]
+        raise CircuitoSingularError(
+            f"Matriz singular: nós sem caminho até o nó '0': {_listar(flutuantes)}"
+            + (f" (componentes: {_listar(comps)})." if comps else "."),
+            nos=flutuantes, componentes=comps)
+
+def pivos_nulos(diagonal_u, tolerancia_relativa=None):
+    """
+    Índices dos pivôs numericamente nulos na diagonal de U de uma fatoração LU.
+    """
+    modulo = np.abs(diagonal_u)
+    if modulo.size == 0:
+        return np.array([], dtype=int)
+    if tolerancia_relativa is None:
+        tolerancia_relativa = modulo.size * np.finfo(float).eps
+    limite = tolerancia_relativa * modulo.max()
+    return np.flatnonzero(~(modulo > limite))
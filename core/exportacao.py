@@ -0,0 +1,257 @@
+# core/exportacao.py
+
+"""
+Exportação direta dos arrays da análise, sem passar pela tabela da interface.
+
+    CSV   numérico, uma grandeza por linha (real, imag, módulo, fase) em precisão total
+    JSONL um objeto JSON por linha (por grandeza; nas varreduras, por frequência)
+    NPZ   arquivo NumPy colunar; nas varreduras, valores (frequências x sinais)
+
+As varreduras e as análises no tempo são escritas bloco a bloco: a partir de um
+CompiledCircuit cada bloco de frequências (ou de passos de tempo) é resolvido e
+gravado antes do próximo, então a saída completa nunca precisa caber na memória.
+"""
+
+import contextlib
+import csv
+import json
+import os
+import zipfile
+
+import numpy as np
+
+from core.transiente import ResultadoTransiente, SimulacaoTransiente, instantes
+from core.varredura import ResultadoVarredura, iterar_varredura_ac
+
+FORMATOS = ('csv', 'jsonl', 'npz')
+COLUNAS_RESULTADO = ["elemento", "nome", "grandeza", "real", "imag", "modulo", "fase_graus"]
+COLUNAS_VARREDURA = ["frequencia_hz", "sinal", "real", "imag", "modulo", "fase_graus"]
+COLUNAS_TRANSIENTE = ["tempo_s", "sinal", "valor"]
+
+# Linhas de saída (frequências x sinais) convertidas por bloco
+LINHAS_POR_BLOCO = 65536
+
+def formato_do_caminho(caminho, padrao='csv'):
+    extensao = os.path.splitext(str(caminho))[1].lower().lstrip('.')
+    return extensao if extensao in FORMATOS else padrao
+
+@contextlib.contextmanager
+def _abrir(destino, binario):
+    # Aceita um caminho ou um arquivo já aberto (que não é fechado aqui)
+    if isinstance(destino, (str, os.PathLike)):
+        with open(destino, 'wb' if binario else 'w', **({} if binario else {'newline': '', 'encoding': 'utf-8'})) as arquivo:
+            yield arquivo
+    else:
+        yield destino
+
+def _colunas_numericas(valores):
+    valores = np.asarray(valores, dtype=complex)
+    return (valores.real.tolist(), valores.imag.tolist(),
+            np.abs(valores).tolist(), np.degrees(np.angle(valores)).tolist())
+
+def colunas_resultado(resultado):
+    """
+    Grandezas de um ResultadoAnalise em colunas (elementos, nomes, grandezas, valores):
+    tensões nodais, V/I/S de cada componente e, se houver, Z_eq e I_total.
+    """
+    N, K = len(resultado.nos), len(resultado.componentes)
+    elementos = ["no"] * N + ["componente"] * (3 * K)
+    nomes = list(resultado.nos) + [nome for nome in resultado.componentes for _ in range(3)]
+    grandezas = ["V"] * N + ["V", "I", "S"] * K
+    valores = [resultado.tensoes_nos,
+               np.stack([resultado.tensoes, resultado.correntes, resultado.potencias], axis=1).ravel()]
+    if resultado.z_eq is not None:
+        elementos += ["circuito", "circuito"]
+        nomes += ["Z_eq", "I_total"]
+        grandezas += ["Z", "I"]
+        valores.append(np.array([resultado.z_eq, resultado.i_total], dtype=complex))
+    return elementos, nomes, grandezas, np.concatenate(valores).astype(complex)
+
+def escrever_linhas_csv(escritor, colunas_texto, valores):
+    """
+    Escreve no csv.writer as colunas de texto seguidas de real, imag, módulo e
+    fase de cada valor, em blocos de LINHAS_POR_BLOCO.
+    """
+    for inicio in range(0, len(valores), LINHAS_POR_BLOCO):
+        fim = inicio + LINHAS_POR_BLOCO
+        escritor.writerows(zip(*(c[inicio:fim] for c in colunas_texto), *_colunas_numericas(valores[inicio:fim])))
+
+def _gravar_array_npz(zip_saida, nome, array):
+    with zip_saida.open(f"{nome}.npy", 'w', force_zip64=True) as arquivo:
+        np.lib.format.write_array(arquivo, np.asarray(array), allow_pickle=False)
+
+def _gravar_blocos_npz(zip_saida, nome, tipo, forma, blocos):
+    # O cabeçalho .npy declara a forma final; os dados seguem em ordem C, bloco a bloco
+    with zip_saida.open(f"{nome}.npy", 'w', force_zip64=True) as saida:
+        np.lib.format.write_array_header_1_0(saida, {
+            'descr': np.lib.format.dtype_to_descr(np.dtype(tipo)), 'fortran_order': False, 'shape': forma})
+        for bloco in blocos:
+            saida.write(np.ascontiguousarray(bloco, dtype=tipo).data)
+
+def exportar_resultado(resultado, destino, formato=None):
+    """
+    Exporta um ResultadoAnalise (análise em uma frequência).
+    """
+    formato = formato or formato_do_caminho(destino)
+    elementos, nomes, grandezas, valores = colunas_resultado(resultado)
+    if formato == 'csv':
+        with _abrir(destino, False) as arquivo:
+            escritor = csv.writer(arquivo)
+            escritor.writerow(COLUNAS_RESULTADO)
+            escrever_linhas_csv(escritor, (elementos, nomes, grandezas), valores)
+    elif formato == 'jsonl':
+        with _abrir(destino, False) as arquivo:
+            for elemento, nome, grandeza, re, im in zip(elementos, nomes, grandezas, valores.real.tolist(), valores.imag.tolist()):
+                arquivo.write(json.dumps({"frequencia_hz": resultado.frequencia, "elemento": elemento, "nome": nome,
+                                          "grandeza": grandeza, "real": re, "imag": im}, ensure_ascii=False) + "\n")
+    elif formato == 'npz':
+        with _abrir(destino, True) as arquivo, zipfile.ZipFile(arquivo, 'w', allowZip64=True) as zip_saida:
+            _gravar_array_npz(zip_saida, "frequencia_hz", np.float64(resultado.frequencia))
+            _gravar_array_npz(zip_saida, "elemento", np.array(elementos, dtype=str))
+            _gravar_array_npz(zip_saida, "nome", np.array(nomes, dtype=str))
+            _gravar_array_npz(zip_saida, "grandeza", np.array(grandezas, dtype=str))
+            _gravar_array_npz(zip_saida, "valor", valores)
+    else:
+        raise ValueError(f"Formato de exportação desconhecido: '{formato}' (use {', '.join(FORMATOS)})")
+
+def _blocos_varredura(fonte, frequencias, tamanho_bloco):
+    """
+    Nomes dos sinais e gerador de blocos (frequencias, valores (F_bloco, sinais)),
+    com os sinais na ordem de ResultadoVarredura.sinais().
+    """
+    if isinstance(fonte, ResultadoVarredura):
+        nos, componentes = fonte.nos, fonte.componentes
+        frequencias = fonte.frequencias
+    else:
+        nos, componentes = fonte.nos, fonte.nomes
+        if frequencias is None:
+            raise ValueError("Informe as frequências para exportar a varredura a partir do circuito.")
+        frequencias = np.asarray(frequencias, dtype=float)
+    sinais = [f"V({no})" for no in nos] + [f"V({nome})" for nome in componentes] + [f"I({nome})" for nome in componentes]
+
+    def blocos():
+        if isinstance(fonte, ResultadoVarredura):
+            passo = tamanho_bloco or max(1, LINHAS_POR_BLOCO // max(len(sinais), 1))
+            for inicio in range(0, len(frequencias), passo):
+                fatia = slice(inicio, inicio + passo)
+                yield frequencias[fatia], np.concatenate(
+                    [fonte.tensoes_nos[fatia], fonte.tensoes[fatia], fonte.correntes[fatia]], axis=1)
+            return
+        for bloco, solucoes in iterar_varredura_ac(fonte, frequencias, tamanho_bloco):
+            tensoes, correntes, _ = fonte.pos_processar(solucoes, bloco)
+            yield bloco, np.concatenate([solucoes[:, :fonte.N], tensoes, correntes], axis=1)
+    return sinais, frequencias, blocos()
+
+def exportar_varredura(fonte, destino, formato=None, frequencias=None, tamanho_bloco=None, progresso=None):
+    """
+    Exporta uma varredura .AC. fonte é um ResultadoVarredura já calculado ou um
+    CompiledCircuit com as frequencias a resolver; neste caso a varredura é
+    resolvida e gravada bloco a bloco.
+    CSV: uma linha por (frequência, sinal); JSONL: uma linha por frequência;
+    NPZ: frequencia_hz (F,), sinal (S,) e valores (F, S) complexos.
+    progresso(fracao) é chamado após cada bloco gravado.
+    """
+    formato = formato or formato_do_caminho(destino)
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de exportação desconhecido: '{formato}' (use {', '.join(FORMATOS)})")
+    sinais, frequencias, blocos = _blocos_varredura(fonte, frequencias, tamanho_bloco)
+    total = max(len(frequencias), 1)
+    gravadas = 0
+
+    if formato == 'npz':
+        with _abrir(destino, True) as arquivo, zipfile.ZipFile(arquivo, 'w', allowZip64=True) as zip_saida:
+            _gravar_array_npz(zip_saida, "frequencia_hz", frequencias)
+            _gravar_array_npz(zip_saida, "sinal", np.array(sinais, dtype=str))
+            def valores_gravados():
+                nonlocal gravadas
+                for bloco, valores in blocos:
+                    yield valores
+                    gravadas += len(bloco)
+                    if progresso: progresso(gravadas / total)
+            _gravar_blocos_npz(zip_saida, "valores", '<c16', (len(frequencias), len(sinais)), valores_gravados())
+        return
+
+    with _abrir(destino, False) as arquivo:
+        if formato == 'csv':
+            escritor = csv.writer(arquivo)
+            escritor.writerow(COLUNAS_VARREDURA)
+        for bloco, valores in blocos:
+            if formato == 'csv':
+                escrever_linhas_csv(escritor, (np.repeat(bloco, len(sinais)).tolist(), sinais * len(bloco)), valores.ravel())
+            else:
+                for f, re, im in zip(bloco.tolist(), valores.real.tolist(), valores.imag.tolist()):
+                    arquivo.write(json.dumps({"frequencia_hz": f, "sinais": dict(zip(sinais, zip(re, im)))},
+                                             ensure_ascii=False) + "\n")
+            gravadas += len(bloco)
+            if progresso: progresso(gravadas / total)
+
+def _blocos_transiente(fonte, parametros, frequencia, progresso):
+    """
+    Nomes dos sinais, número de instantes, os instantes em blocos e o gerador
+    de blocos (tempos, valores (T_bloco, sinais)) em resolução total. Um
+    ResultadoTransiente decimado é simulado de novo pela sua simulação (a
+    fatoração já está guardada).
+    """
+    if isinstance(fonte, ResultadoTransiente) and not fonte.decimado:
+        sinais = list(fonte.sinais())
+        def blocos():
+            passo = max(1, LINHAS_POR_BLOCO // max(len(sinais), 1))
+            for inicio in range(0, len(fonte.tempos), passo):
+                fatia = slice(inicio, inicio + passo)
+                yield fonte.tempos[fatia], np.concatenate(
+                    [fonte.tensoes_nos[fatia], fonte.tensoes[fatia], fonte.correntes[fatia]], axis=1)
+                if progresso: progresso(min(inicio + passo, len(fonte.tempos)) / max(len(fonte.tempos), 1))
+        return sinais, len(fonte.tempos), [fonte.tempos], blocos()
+
+    if isinstance(fonte, ResultadoTransiente):
+        parametros = {**fonte.parametros, **parametros}
+        fonte = fonte.simulacao
+    elif not isinstance(fonte, SimulacaoTransiente):
+        fonte = SimulacaoTransiente(fonte, frequencia)
+    if parametros.get("passo") is None or parametros.get("t_final") is None:
+        raise ValueError("Informe o passo e o tempo final para exportar a análise no tempo a partir do circuito.")
+    primeiro, ultimo = instantes(parametros["passo"], parametros["t_final"], parametros.get("t_inicio", 0.0))
+    tempos = (np.arange(inicio, min(inicio + LINHAS_POR_BLOCO, ultimo + 1)) * parametros["passo"]
+              for inicio in range(primeiro, ultimo + 1, LINHAS_POR_BLOCO))
+    total = max(ultimo - primeiro + 1, 0)
+    return list(fonte.nomes_sinais), total, tempos, fonte.iterar(progresso=progresso, **parametros)
+
+def exportar_transiente(fonte, destino, formato=None, passo=None, t_final=None, t_inicio=None, metodo=None,
+                        frequencia=60, progresso=None):
+    """
+    Exporta uma análise .TRAN em resolução total. fonte é um ResultadoTransiente
+    (passo e intervalo vêm dele), uma SimulacaoTransiente ou um CompiledCircuit;
+    nos dois últimos a simulação é feita e gravada bloco a bloco, sem guardar
+    as formas de onda, e frequencia é a das fontes sem forma de onda e das Z.
+    CSV: uma linha por (instante, sinal); JSONL: uma linha por instante;
+    NPZ: tempo_s (T,), sinal (S,) e valores (T, S) reais.
+    progresso(fracao) é chamado após cada bloco.
+    """
+    formato = formato or formato_do_caminho(destino)
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de exportação desconhecido: '{formato}' (use {', '.join(FORMATOS)})")
+    parametros = {chave: valor for chave, valor in
+                  (("passo", passo), ("t_final", t_final), ("t_inicio", t_inicio), ("metodo", metodo)) if valor is not None}
+    sinais, total, tempos, blocos = _blocos_transiente(fonte, parametros, frequencia, progresso)
+
+    if formato == 'npz':
+        with _abrir(destino, True) as arquivo, zipfile.ZipFile(arquivo, 'w', allowZip64=True) as zip_saida:
+            _gravar_blocos_npz(zip_saida, "tempo_s", '<f8', (total,), tempos)
+            _gravar_array_npz(zip_saida, "sinal", np.array(sinais, dtype=str))
+            _gravar_blocos_npz(zip_saida, "valores", '<f8', (total, len(sinais)), (valores for _, valores in blocos))
+        return
+
+    with _abrir(destino, False) as arquivo:
+        if formato == 'csv':
+            escritor = csv.writer(arquivo)
+            escritor.writerow(COLUNAS_TRANSIENTE)
+        linhas_por_parte = max(1, LINHAS_POR_BLOCO // max(len(sinais), 1))
+        for bloco, valores in blocos:
+            for inicio in range(0, len(bloco), linhas_por_parte):
+                trecho = bloco[inicio:inicio + linhas_por_parte]
+                parte = valores[inicio:inicio + linhas_por_parte]
+                if formato == 'csv':
+                    escritor.writerows(zip(np.repeat(trecho, len(sinais)).tolist(), sinais * len(trecho), parte.ravel().tolist()))
+                else:
+                    for t, linha in zip(trecho.tolist(), parte.tolist()):
+                        arquivo.write(json.dumps({"tempo_s": t, "sinais": dict(zip(sinais, linha))}, ensure_ascii=False) + "\n")
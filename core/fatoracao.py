@@ -0,0 +1,96 @@
+# core/fatoracao.py
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.linalg as sla
+import scipy.sparse.linalg as spla
+import warnings
+
+from core.diagnostico import CircuitoSingularError, pivos_nulos
+
+# Acima deste número de incógnitas (nós + fontes de tensão) o sistema é montado
+# em formato esparso e fatorado com LU esparsa em vez de LU densa.
+LIMIAR_ESPARSO = 400
+
+def escolher_esparso(metodo, dimensao):
+    if metodo == 'auto':
+        return dimensao > LIMIAR_ESPARSO
+    if metodo in ('esparso', 'denso'):
+        return metodo == 'esparso'
+    raise ValueError(f"Método de solução desconhecido: '{metodo}'")
+
+def _erro_pivos(indices, nomes_incognitas):
+    nomes = [nomes_incognitas[i] for i in indices]
+    nos = [n for n in nomes if not n.startswith('I(')]
+    fontes = [n[2:-1] for n in nomes if n.startswith('I(')]
+    partes = []
+    if nos: partes.append(f"nós {', '.join(nos[:10])}")
+    if fontes: partes.append(f"correntes das fontes {', '.join(fontes[:10])}")
+    return CircuitoSingularError(
+        f"Matriz singular: as equações de {' e '.join(partes)} são linearmente dependentes "
+        "(verifique os ganhos das fontes controladas e os valores nulos).",
+        nos=nos, componentes=fontes)
+
+class Fatoracao:
+    def __init__(self, lu, esparso, dimensao, tipo=complex, ordem=None):
+        self.lu = lu
+        self.esparso = esparso
+        self.dimensao = dimensao
+        self.tipo = tipo  # Tipo de dado da matriz (a análise no tempo usa matrizes reais)
+        self.ordem = ordem  # Permutação simétrica aplicada antes da LU esparsa (core.ordenacao)
+
+    def solve(self, b):
+        # b pode ser um vetor (n,) ou várias excitações em colunas (n, k)
+        if self.dimensao == 0:
+            return np.array(b, dtype=self.tipo)
+        if self.esparso:
+            b = np.asarray(b, dtype=self.tipo)
+            if self.ordem is None:
+                return self.lu.solve(b)
+            x = np.empty_like(b)
+            x[self.ordem] = self.lu.solve(b[self.ordem])
+            return x
+        return sla.lu_solve(self.lu, b, check_finite=False)
+
+    def nnz_fatores(self):
+        # Não nulos de L + U (na densa, a matriz inteira)
+        if self.esparso and self.lu is not None:
+            return int(self.lu.L.nnz + self.lu.U.nnz)
+        return self.dimensao ** 2
+
+def fatorar(A, esparso, nomes_incognitas, ordem=None):
+    """
+    Fatoração LU do sistema da ANM. A checagem de singularidade reaproveita os
+    pivôs da própria fatoração e nomeia as incógnitas dependentes.
+    Na LU esparsa, ordem (core.ordenacao) é a ordem de eliminação das
+    incógnitas; sem ela, o SuperLU escolhe a ordem das colunas (COLAMD).
+    """
+    if esparso:
+        permc = 'COLAMD'
+        if ordem is not None:
+            A, permc = A[ordem][:, ordem].tocsc(), 'NATURAL'
+        try:
+            lu = spla.splu(A, permc_spec=permc)
+            nulos = pivos_nulos(lu.U.diagonal())
+        except RuntimeError:
+            # Pivô exatamente nulo: refatora com um deslocamento mínimo na diagonal
+            # apenas para localizar as equações dependentes
+            deslocamento = 1e-12 * abs(A).max()
+            lu = spla.splu((A + deslocamento * sp.identity(A.shape[0], format='csc')).tocsc(), permc_spec=permc)
+            nulos = pivos_nulos(lu.U.diagonal(), 1e-9)
+            if not nulos.size:
+                raise CircuitoSingularError("Matriz singular: dependência numérica entre as equações do circuito.")
+        if nulos.size:
+            colunas = np.argsort(lu.perm_c)[nulos]
+            raise _erro_pivos(colunas if ordem is None else ordem[colunas], nomes_incognitas)
+        return Fatoracao(lu, True, A.shape[0], A.dtype, ordem)
+
+    if A.shape[0] == 0:
+        return Fatoracao(None, False, 0, A.dtype)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", sla.LinAlgWarning)
+        lu, piv = sla.lu_factor(A, check_finite=False)
+    nulos = pivos_nulos(np.diag(lu))
+    if nulos.size:
+        raise _erro_pivos(nulos, nomes_incognitas)
+    return Fatoracao((lu, piv), False, A.shape[0], A.dtype)
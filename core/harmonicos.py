@@ -0,0 +1,160 @@
+# core/harmonicos.py
+
+"""
+Análise harmônica por superposição sobre a ANM compilada do circuito.
+
+Cada fonte de tensão independente contribui com a sua fundamental, na
+frequência própria (FREQ) ou na de análise, e com as harmônicas do seu
+espectro (HARM); fontes SIN usam a frequência da senoide. As componentes são
+agrupadas por frequência: cada frequência distinta é um sistema com só as
+fontes dela, e todos são resolvidos em lote (iterar_lote). Como o circuito é
+linear, a resposta é a soma das respostas de cada frequência. R, L e C seguem
+a frequência; impedâncias Z têm o mesmo valor em todas.
+
+Valor eficaz e potência seguem a convenção da tabela de resultados (o módulo
+do fasor é o valor eficaz, S = V·I*); termos de frequências diferentes não
+produzem potência média, então P é a soma das potências de cada frequência.
+"""
+
+import numpy as np
+
+from core.circuito import CompiledCircuit, ResultadoAnalise, V
+
+def componentes_fonte(circuito, k, frequencia):
+    """
+    Frequências e fasores (arrays (H,)) da fonte de tensão k: a fundamental
+    seguida das harmônicas do seu espectro.
+    """
+    fasor = circuito.valores[k] * np.exp(1j * np.deg2rad(circuito.fases[k]))
+    forma = circuito.componentes.formas.get(k)
+    if forma is None or forma[0] in ('DC', 'PULSE'):
+        # Como na análise fasorial: o valor da fonte na frequência de análise
+        return np.array([float(frequencia)]), np.array([fasor])
+    if forma[0] == 'SIN':
+        return np.array([forma[1][2]]), np.array([fasor])
+    propria, harmonicas = forma[1]
+    fundamental = frequencia if propria is None else propria
+    frequencias = [fundamental] + [ordem * fundamental for ordem, _, _ in harmonicas]
+    fasores = [fasor] + [fracao * circuito.valores[k] * np.exp(1j * np.deg2rad(circuito.fases[k] if fase is None else fase))
+                         for _, fracao, fase in harmonicas]
+    return np.array(frequencias, dtype=float), np.array(fasores, dtype=complex)
+
+def espectro_fontes(circuito, frequencia):
+    """
+    Frequências distintas (F,) das fontes e a excitação (F, N + M) de cada uma,
+    só com as componentes das fontes naquela frequência.
+    """
+    fontes = np.flatnonzero(circuito.tipos == V)
+    partes = [componentes_fonte(circuito, k, frequencia) for k in fontes.tolist()]
+    if not partes:
+        return np.array([float(frequencia)]), np.zeros((1, circuito.dimensao), dtype=complex)
+    todas = np.concatenate([f for f, _ in partes])
+    fasores = np.concatenate([x for _, x in partes])
+    ramos = np.repeat(circuito.ramo[fontes], [len(f) for f, _ in partes])
+    frequencias, grupo = np.unique(todas, return_inverse=True)
+    excitacoes = np.zeros((len(frequencias), circuito.dimensao + 1), dtype=complex)
+    np.add.at(excitacoes, (grupo, ramos), fasores)
+    return frequencias, excitacoes[:, :circuito.dimensao]
+
+def possui_espectro(circuito, frequencia):
+    """
+    Se alguma fonte tem harmônicas ou frequência diferente da de análise (a
+    análise fasorial sozinha não descreve o circuito).
+    """
+    frequencias, _ = espectro_fontes(circuito, frequencia)
+    return len(frequencias) > 1 or frequencias[0] != frequencia
+
+class ResultadoHarmonico:
+    """
+    Espectro da resposta: fasores indexados por frequência (F, ...) das
+    tensões nodais e das tensões e correntes dos componentes. A fundamental é
+    a frequência de análise, se alguma fonte a usa, senão a menor frequência;
+    resultado_fundamental é a solução (ResultadoAnalise) nessa frequência, só
+    com as fontes dela, a que a tabela de resultados e os fasores mostram.
+    """
+    def __init__(self, frequencias, fundamental, nos, tensoes_nos, componentes, tensoes, correntes, i_total=None,
+                 resultado_fundamental=None):
+        self.frequencias = frequencias
+        self.fundamental = fundamental
+        self.indice_fundamental = int(np.argmin(np.abs(frequencias - fundamental)))
+        self.nos = nos
+        self.tensoes_nos = tensoes_nos
+        self.componentes = componentes
+        self.tensoes = tensoes
+        self.correntes = correntes
+        self.i_total = i_total
+        self.resultado_fundamental = resultado_fundamental
+
+    def sinais(self):
+        """
+        Dicionário nome do sinal -> array complexo indexado por frequência,
+        com os mesmos nomes usados nas listas de sinais da interface.
+        """
+        sinais = {f"V({no})": self.tensoes_nos[:, k] for k, no in enumerate(self.nos)}
+        for k, nome in enumerate(self.componentes):
+            sinais[f"V({nome})"] = self.tensoes[:, k]
+        for k, nome in enumerate(self.componentes):
+            sinais[f"I({nome})"] = self.correntes[:, k]
+        if self.i_total is not None:
+            sinais["I(Total)"] = self.i_total
+        return sinais
+
+    @staticmethod
+    def eficaz(espectro):
+        # Valor eficaz verdadeiro: raiz da soma dos quadrados das componentes
+        return np.sqrt(np.sum(np.abs(espectro) ** 2, axis=0))
+
+    def thd(self, espectro):
+        """
+        Distorção harmônica total (fração) em relação à fundamental; NaN onde a
+        fundamental é nula.
+        """
+        modulo = np.abs(espectro)
+        fundamental = modulo[self.indice_fundamental]
+        demais = np.sqrt(np.maximum(np.sum(modulo ** 2, axis=0) - fundamental ** 2, 0.0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(fundamental > 0, demais / fundamental, np.nan)
+
+    def potencias(self):
+        """
+        Potência ativa P (soma das frequências) e aparente S = Vef·Ief de cada componente.
+        """
+        ativa = np.sum((self.tensoes * np.conj(self.correntes)).real, axis=0)
+        return ativa, self.eficaz(self.tensoes) * self.eficaz(self.correntes)
+
+    def resumo(self):
+        """
+        THD e valor eficaz por nó; tensão e corrente eficazes, THD da corrente,
+        P, S e fator de potência verdadeiro (P/S) por componente.
+        """
+        v_nos, thd_nos = self.eficaz(self.tensoes_nos), self.thd(self.tensoes_nos)
+        v_ef, i_ef = self.eficaz(self.tensoes), self.eficaz(self.correntes)
+        thd_i = self.thd(self.correntes)
+        ativa, aparente = self.potencias()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fp = np.where(aparente > 0, ativa / aparente, np.nan)
+        return {
+            "nos": {no: {"v_rms": float(v_nos[k]), "thd": float(thd_nos[k])} for k, no in enumerate(self.nos)},
+            "componentes": {nome: {"v_rms": float(v_ef[k]), "i_rms": float(i_ef[k]), "thd_i": float(thd_i[k]),
+                                   "p": float(ativa[k]), "s": float(aparente[k]), "fp": float(fp[k])}
+                            for k, nome in enumerate(self.componentes)},
+        }
+
+def analisar_harmonicos(componentes, frequencia=60, metodo='auto', tamanho_bloco=None):
+    """
+    Resolve o circuito em todas as frequências das fontes de uma vez e devolve
+    o espectro da resposta (ResultadoHarmonico).
+    """
+    circuito = componentes if isinstance(componentes, CompiledCircuit) else CompiledCircuit(componentes, metodo)
+    frequencias, excitacoes = espectro_fontes(circuito, frequencia)
+    solucao = np.empty((len(frequencias), circuito.dimensao), dtype=complex)
+    for inicio, solucoes in circuito.iterar_lote(frequencias, tamanho_bloco=tamanho_bloco, excitacoes=excitacoes):
+        solucao[inicio:inicio + len(solucoes)] = solucoes
+
+    tensoes, correntes, _ = circuito.pos_processar(solucao, frequencias)
+    fontes = np.flatnonzero(circuito.tipos == V)
+    fundamental = frequencia if np.isin(frequencia, frequencias) else frequencias.min()
+    i = int(np.argmin(np.abs(frequencias - fundamental)))
+    return ResultadoHarmonico(frequencias, fundamental, circuito.nos, solucao[:, :circuito.N], circuito.nomes,
+                              tensoes, correntes, correntes[:, fontes[0]] if fontes.size else None,
+                              ResultadoAnalise(circuito, frequencias[i], solucao[i]))
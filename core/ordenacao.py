@@ -0,0 +1,132 @@
+# core/ordenacao.py
+
+"""
+Ordenação das incógnitas para reduzir o preenchimento da LU esparsa.
+
+A ordem dos nós na ANM é alfabética e não tem relação com a estrutura da
+matriz. Cada estratégia dá uma ordem de eliminação sobre o grafo de A + Aᵀ,
+calculada uma vez por topologia (CompiledCircuit.ordem_fatoracao) e aplicada
+como permutação simétrica na fatoração; a solução volta à ordem original, então
+os resultados continuam indexados pelos nomes dos nós.
+
+    natural  ordem alfabética, sem reordenação
+    colamd   ordem de colunas do próprio SuperLU, recalculada a cada fatoração
+    rcm      Cuthill-McKee reverso (banda estreita)
+    amd      grau mínimo em A + Aᵀ (MMD do SuperLU)
+    nd       dissecação aninhada por separadores de nível no grafo da netlist
+    auto     amd
+"""
+
+import time
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from scipy.sparse.csgraph import connected_components, dijkstra, reverse_cuthill_mckee
+
+ESTRATEGIAS = ('auto', 'natural', 'colamd', 'rcm', 'amd', 'nd')
+# Subgrafos até este tamanho não são mais divididos na dissecação aninhada
+LIMITE_FOLHA = 128
+
+def padrao_simetrico(indices, indptr, n):
+    """
+    Grafo de A + Aᵀ (CSR de uns, sem a diagonal) a partir do padrão CSC da matriz.
+    """
+    A = sp.csc_matrix((np.ones(indices.size), indices, indptr), shape=(n, n))
+    padrao = (A + A.T).tocsr()
+    padrao.setdiag(0)
+    padrao.eliminate_zeros()
+    padrao.data[:] = 1.0
+    return padrao
+
+def grau_minimo(padrao):
+    """
+    Ordem de grau mínimo de A + Aᵀ. O SciPy não expõe a ordenação sozinha: ela
+    sai da fatoração de uma matriz diagonal dominante com o mesmo padrão.
+    """
+    n = padrao.shape[0]
+    if n == 0:
+        return np.arange(0)
+    M = (sp.diags(np.diff(padrao.indptr) + 1.0) - padrao).tocsc()
+    lu = spla.splu(M, permc_spec='MMD_AT_PLUS_A')
+    return np.argsort(lu.perm_c)
+
+def dissecacao_aninhada(padrao, limite=LIMITE_FOLHA):
+    """
+    Ordem por dissecação aninhada: cada subgrafo conexo é dividido pelo nível
+    mediano da busca em largura a partir de um nó pseudo-periférico, e o
+    separador é eliminado depois das duas metades. Subgrafos pequenos (ou que
+    não se dividem) são ordenados por Cuthill-McKee reverso.
+    """
+    ordem = []
+    # Pilha de (dividir?, nós): as metades são empilhadas depois do separador
+    pilha = [(True, np.arange(padrao.shape[0]))]
+    while pilha:
+        dividir, nos = pilha.pop()
+        if not dividir:
+            ordem.append(nos)
+            continue
+        sub = padrao[nos][:, nos]
+        if len(nos) <= limite:
+            ordem.append(nos[reverse_cuthill_mckee(sub, symmetric_mode=True)])
+            continue
+        componentes, rotulos = connected_components(sub, directed=False)
+        if componentes > 1:
+            # Componentes pequenos vão juntos numa folha; os grandes são divididos
+            tamanhos = np.bincount(rotulos)
+            pequenos = tamanhos[rotulos] <= limite
+            if pequenos.any():
+                folha = np.flatnonzero(pequenos)
+                pilha.append((False, nos[folha[np.argsort(rotulos[folha], kind='stable')]]))
+            pilha.extend((True, nos[rotulos == c]) for c in np.flatnonzero(tamanhos > limite)[::-1])
+            continue
+        distancia = dijkstra(sub, unweighted=True, indices=0)
+        distancia = dijkstra(sub, unweighted=True, indices=int(np.argmax(distancia))).astype(np.int64)
+        meio = int(np.searchsorted(np.cumsum(np.bincount(distancia)), len(nos) / 2))
+        if meio == 0 or meio >= distancia.max():
+            ordem.append(nos[reverse_cuthill_mckee(sub, symmetric_mode=True)])
+            continue
+        pilha.append((False, nos[distancia == meio]))
+        pilha.append((True, nos[distancia > meio]))
+        pilha.append((True, nos[distancia < meio]))
+    return np.concatenate(ordem) if ordem else np.arange(0)
+
+def ordenar(padrao, estrategia):
+    """
+    Ordem de eliminação (permutação das incógnitas) da estratégia, ou None
+    para deixar a ordem de colunas com o SuperLU (colamd).
+    """
+    if estrategia not in ESTRATEGIAS:
+        raise ValueError(f"Ordenação desconhecida: '{estrategia}' (use {', '.join(ESTRATEGIAS)}).")
+    if estrategia == 'colamd':
+        return None
+    if estrategia == 'natural':
+        return np.arange(padrao.shape[0])
+    if estrategia == 'rcm':
+        return reverse_cuthill_mckee(padrao, symmetric_mode=True).astype(np.int64)
+    if estrategia == 'nd':
+        return dissecacao_aninhada(padrao)
+    return grau_minimo(padrao)
+
+def relatorio_preenchimento(circuito, frequencia=60, estrategias=('colamd', 'rcm', 'amd', 'nd')):
+    """
+    Não nulos da matriz da ANM e dos fatores L + U com cada estratégia (natural
+    fica de fora por padrão: o preenchimento explode em redes grandes), com os
+    tempos de ordenação (uma vez por topologia) e de fatoração. Lista de dicts
+    com estrategia, nnz_matriz, nnz_fatores, preenchimento (fatores/matriz),
+    tempo_ordenacao e tempo_fatoracao (s).
+    """
+    from core.fatoracao import fatorar
+    A = sp.csc_matrix(circuito.evaluate(frequencia))
+    padrao = padrao_simetrico(A.indices, A.indptr, A.shape[0])
+    relatorio = []
+    for estrategia in estrategias:
+        inicio = time.perf_counter()
+        ordem = ordenar(padrao, estrategia)
+        meio = time.perf_counter()
+        fatoracao = fatorar(A, True, circuito.incognitas, ordem)
+        fim = time.perf_counter()
+        relatorio.append({"estrategia": estrategia, "nnz_matriz": int(A.nnz), "nnz_fatores": fatoracao.nnz_fatores(),
+                          "preenchimento": fatoracao.nnz_fatores() / max(A.nnz, 1),
+                          "tempo_ordenacao": meio - inicio, "tempo_fatoracao": fim - meio})
+    return relatorio
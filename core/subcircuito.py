@@ -0,0 +1,137 @@
+# core/subcircuito.py
+
+"""
+Redução de subcircuitos (.SUBCKT) às suas portas.
+
+Cada definição é compilada uma vez como um circuito próprio e, em cada
+frequência, reduzida pelo complemento de Schur das incógnitas internas (nós
+internos e correntes das fontes de tensão) à matriz de admitância das portas:
+
+    Y = A_pp - A_pi · A_ii⁻¹ · A_ip
+
+As matrizes ficam guardadas por frequência e são compartilhadas por todas as
+instâncias da definição (e entre análises de definições idênticas): cada
+instância estampa só o seu bloco k x k no sistema principal, e os nós internos
+nunca entram nele. Como Y é a das portas em aberto, o subcircuito não pode ter
+fontes independentes (fontes V de valor zero servem de amperímetro para F e H).
+Os caches são compartilhados pelas análises em paralelo (threads da interface)
+e protegidos por travas; cada redução monta a sua própria matriz.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from core.circuito import CompiledCircuit, V, E, H
+from core.diagnostico import CircuitoSingularError
+from core.fatoracao import fatorar
+
+# Definições compiladas mantidas entre análises e frequências guardadas por definição
+LIMITE_DEFINICOES = 64
+LIMITE_FREQUENCIAS = 4096
+
+_compilados = OrderedDict()
+_trava_compilados = threading.Lock()
+
+class SubcircuitoCompilado:
+    """
+    Circuito interno de uma definição .SUBCKT com a partição portas/internas e
+    o cache das matrizes de admitância das portas por frequência.
+    """
+    def __init__(self, subcircuito):
+        tabela = subcircuito.componentes
+        self.nome = subcircuito.nome
+        fontes = [tabela.nomes[k] for k in np.flatnonzero((tabela.tipos == V) & (tabela.valores != 0))]
+        if fontes:
+            raise ValueError(f"Subcircuito '{self.nome}': fontes independentes não são suportadas ({', '.join(fontes[:10])}); "
+                             "use fontes de 0 V para medir correntes.")
+        fontes_v = {tabela.nomes[k] for k in np.flatnonzero(np.isin(tabela.tipos, [V, E, H]))}
+        for linha, controle in tabela.controles.items():
+            if controle not in fontes_v:
+                raise CircuitoSingularError(
+                    f"Fonte {tabela.nomes[linha]} do subcircuito '{self.nome}' é controlada por '{controle}', "
+                    "que não é uma fonte de tensão do subcircuito.", componentes=[tabela.nomes[linha]])
+
+        self.circuito = c = CompiledCircuit(tabela, verificar=False)
+        self.portas = len(subcircuito.portas)
+        # Portas sem componentes ligados dentro do subcircuito ficam em aberto (linha e coluna nulas)
+        indices = np.array([c.mapa_nos.get(porta, -1) for porta in subcircuito.portas], dtype=np.int64)
+        self._ligadas = np.flatnonzero(indices >= 0)
+        self._p = indices[self._ligadas]
+        self._i = np.setdiff1d(np.arange(c.dimensao), self._p)
+        self._nomes_internos = [c.incognitas[j] for j in self._i]
+        self._admitancias = OrderedDict()
+        self._trava = threading.Lock()
+
+    def __getstate__(self):
+        # A trava não é serializável (cache em disco); as admitâncias vão junto
+        estado = self.__dict__.copy()
+        with self._trava:
+            estado['_admitancias'] = self._admitancias.copy()
+        del estado['_trava']
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._trava = threading.Lock()
+
+    def admitancia(self, frequencia):
+        """
+        Matriz de admitância (k, k) das portas na frequência dada.
+        """
+        chave = float(frequencia)
+        with self._trava:
+            Y = self._admitancias.get(chave)
+            if Y is not None:
+                self._admitancias.move_to_end(chave)
+                return Y
+        # Calculada fora da trava: duas threads podem reduzir a mesma frequência,
+        # com o mesmo resultado, mas nenhuma espera pela outra
+        c, p, i = self.circuito, self._p, self._i
+        A = c.evaluate(chave, nova=True)
+        if c.esparso:
+            linhas_p, linhas_i = A[p], A[i]
+            A_pp, A_pi = linhas_p[:, p].toarray(), linhas_p[:, i].toarray()
+            A_ip, A_ii = linhas_i[:, p].toarray(), linhas_i[:, i].tocsc()
+        else:
+            A_pp, A_pi, A_ip, A_ii = A[np.ix_(p, p)], A[np.ix_(p, i)], A[np.ix_(i, p)], A[np.ix_(i, i)]
+        try:
+            fatoracao = fatorar(A_ii, c.esparso, self._nomes_internos)
+        except CircuitoSingularError as e:
+            raise CircuitoSingularError(f"Subcircuito '{self.nome}': {e.message}", nos=e.nos, componentes=e.componentes)
+        Y = np.zeros((self.portas, self.portas), dtype=complex)
+        Y[np.ix_(self._ligadas, self._ligadas)] = A_pp - A_pi @ fatoracao.solve(A_ip)
+        Y.flags.writeable = False
+        with self._trava:
+            self._admitancias[chave] = Y
+            self._admitancias.move_to_end(chave)
+            if len(self._admitancias) > LIMITE_FREQUENCIAS:
+                self._admitancias.popitem(last=False)
+        return Y
+
+    def admitancias(self, frequencias):
+        """
+        Matrizes das portas achatadas, (F, k*k), para as frequências (F,).
+        """
+        frequencias = np.asarray(frequencias, dtype=float).ravel()
+        return np.array([self.admitancia(f).ravel() for f in frequencias]).reshape(len(frequencias), -1)
+
+def compilar_subcircuito(subcircuito):
+    """
+    SubcircuitoCompilado da definição, reaproveitado (com as admitâncias já
+    calculadas) para definições de mesmo conteúdo.
+    """
+    with _trava_compilados:
+        compilado = _compilados.get(subcircuito.chave)
+        if compilado is not None:
+            _compilados.move_to_end(subcircuito.chave)
+            return compilado
+    novo = SubcircuitoCompilado(subcircuito)
+    with _trava_compilados:
+        # Outra thread pode ter compilado a mesma definição nesse meio tempo: vale a primeira
+        compilado = _compilados.setdefault(subcircuito.chave, novo)
+        _compilados.move_to_end(subcircuito.chave)
+        if len(_compilados) > LIMITE_DEFINICOES:
+            _compilados.popitem(last=False)
+    return compilado
@@ -0,0 +1,145 @@
+# core/tolerancia.py
+
+import numpy as np
+
+from core.circuito import CompiledCircuit
+
+PERCENTIS_PADRAO = (1, 5, 50, 95, 99)
+
+def amostrar_valores(circuito, n_amostras, distribuicao='UNIFORME', semente=None):
+    """
+    Sorteia de uma só vez todos os vetores de valores (n_amostras, K).
+    UNIFORME: fator em [1 - tol, 1 + tol]; NORMAL: desvio tol/3, truncado em ±tol.
+    """
+    rng = np.random.default_rng(semente)
+    tol = circuito.tolerancias
+    forma = (n_amostras, tol.size)
+    distribuicao = distribuicao.upper()
+    if distribuicao == 'UNIFORME':
+        desvio = rng.uniform(-1.0, 1.0, forma)
+    elif distribuicao == 'NORMAL':
+        desvio = np.clip(rng.standard_normal(forma) / 3, -1.0, 1.0)
+    else:
+        raise ValueError(f"Distribuição desconhecida: '{distribuicao}'")
+    return circuito.valores * (1 + tol * desvio)
+
+def _indices_sinais(circuito, sinais):
+    # "V(no)" -> tensão nodal; "V(comp)", "I(comp)", "P(comp)" -> grandezas do componente
+    if sinais is None:
+        sinais = [f"V({no})" for no in circuito.nos] + [f"P({nome})" for nome in circuito.nomes]
+    selecionados = []
+    for sinal in sinais:
+        grandeza, alvo = sinal[0].upper(), sinal[2:-1]
+        if grandeza == 'V' and alvo in circuito.mapa_nos:
+            selecionados.append((sinal, 'no', circuito.mapa_nos[alvo]))
+        elif grandeza in ('V', 'I', 'P') and alvo in circuito.indice_componente:
+            selecionados.append((sinal, grandeza, circuito.indice_componente[alvo]))
+        else:
+            raise ValueError(f"Sinal desconhecido: '{sinal}'")
+    return selecionados
+
+def _extrair(circuito, selecionados, solucoes, frequencia, valores):
+    tensoes, correntes, potencias = circuito.pos_processar(solucoes, frequencia, valores)
+    fonte = {'no': solucoes, 'V': tensoes, 'I': correntes}
+    saida = {}
+    for sinal, grandeza, idx in selecionados:
+        # Potência como ativa (W); tensões e correntes como módulo
+        saida[sinal] = potencias[:, idx].real if grandeza == 'P' else np.abs(fonte[grandeza][:, idx])
+    return saida
+
+class ResultadoMonteCarlo:
+    def __init__(self, amostras, nominal):
+        self.amostras = amostras
+        self.nominal = nominal
+
+    def estatisticas(self, sinais=None, percentis=PERCENTIS_PADRAO):
+        estat = {}
+        for sinal in (self.amostras if sinais is None else sinais):
+            valores = self.amostras[sinal]
+            estat[sinal] = {
+                "nominal": self.nominal[sinal], "media": float(np.mean(valores)),
+                "desvio": float(np.std(valores)), "minimo": float(np.min(valores)), "maximo": float(np.max(valores)),
+                **{f"p{p:g}": float(v) for p, v in zip(percentis, np.percentile(valores, percentis))},
+            }
+        return estat
+
+    def histograma(self, sinal, bins=50):
+        return np.histogram(self.amostras[sinal], bins=bins)
+
+def analisar_monte_carlo(componentes, frequencia, n_amostras=1000, sinais=None,
+                         distribuicao='UNIFORME', semente=None, tamanho_bloco=None, progresso=None):
+    """
+    Análise de Monte Carlo: sorteia todos os valores de uma vez e resolve as
+    amostras em blocos de matrizes ANM empilhadas.
+    sinais = nomes como "V(n2)", "I(R1)" ou "P(R1)"; padrão: tensões nodais e potências.
+    progresso(fracao) é chamado após cada bloco de amostras.
+    """
+    circuito = componentes if isinstance(componentes, CompiledCircuit) else CompiledCircuit(componentes)
+    selecionados = _indices_sinais(circuito, sinais)
+    valores = amostrar_valores(circuito, n_amostras, distribuicao, semente)
+
+    amostras = {sinal: np.empty(n_amostras) for sinal, _, _ in selecionados}
+    for inicio, solucoes in circuito.iterar_lote(frequencia, valores, tamanho_bloco):
+        v = valores[inicio:inicio + len(solucoes)]
+        for sinal, dados in _extrair(circuito, selecionados, solucoes, frequencia, v).items():
+            amostras[sinal][inicio:inicio + len(solucoes)] = dados
+        if progresso: progresso((inicio + len(solucoes)) / n_amostras)
+
+    nominal = circuito.resolver(frequencia).solucao[None, :]
+    nominal = {s: float(d[0]) for s, d in _extrair(circuito, selecionados, nominal, frequencia, circuito.valores[None, :]).items()}
+    return ResultadoMonteCarlo(amostras, nominal)
+
+def analisar_cantos(componentes, frequencia, sinais=None, max_enumeracao=10):
+    """
+    Pior caso nos cantos de tolerância (cada valor em 1 - tol ou 1 + tol).
+    Até max_enumeracao componentes com tolerância todos os 2^k cantos são
+    avaliados; acima disso o canto de cada sinal é escolhido pelo sinal da
+    sensibilidade de primeira ordem.
+    Retorna {sinal: {"nominal", "minimo", "maximo", "canto_minimo", "canto_maximo"}},
+    com os cantos como dicts nome -> -1/+1.
+    """
+    circuito = componentes if isinstance(componentes, CompiledCircuit) else CompiledCircuit(componentes)
+    selecionados = _indices_sinais(circuito, sinais)
+    com_tol = np.flatnonzero(circuito.tolerancias > 0)
+    k = com_tol.size
+
+    def avaliar(direcoes):
+        valores = np.tile(circuito.valores, (len(direcoes), 1))
+        valores[:, com_tol] *= 1 + circuito.tolerancias[com_tol] * direcoes
+        saida = {sinal: np.empty(len(direcoes)) for sinal, _, _ in selecionados}
+        for inicio, solucoes in circuito.iterar_lote(frequencia, valores):
+            v = valores[inicio:inicio + len(solucoes)]
+            for sinal, dados in _extrair(circuito, selecionados, solucoes, frequencia, v).items():
+                saida[sinal][inicio:inicio + len(solucoes)] = dados
+        return saida
+
+    nominal = avaliar(np.zeros((1, k)))
+    if k <= max_enumeracao:
+        direcoes = ((np.arange(2 ** k)[:, None] >> np.arange(k)) & 1) * 2.0 - 1.0
+        por_sinal = {sinal: direcoes for sinal, _, _ in selecionados}
+        resultados = avaliar(direcoes)
+    else:
+        # Sensibilidades: uma perturbação +tol por componente, todas num único lote
+        variacoes = avaliar(np.eye(k))
+        por_sinal, resultados = {}, {}
+        for sinal, _, _ in selecionados:
+            sentido = np.sign(variacoes[sinal] - nominal[sinal][0])
+            sentido[sentido == 0] = 1.0
+            por_sinal[sinal] = np.array([-sentido, sentido])
+        lote = np.concatenate(list(por_sinal.values()))
+        todos = avaliar(lote)
+        for j, (sinal, _, _) in enumerate(selecionados):
+            resultados[sinal] = todos[sinal][2 * j:2 * j + 2]
+
+    cantos = {}
+    nomes_tol = [circuito.nomes[i] for i in com_tol]
+    for sinal, _, _ in selecionados:
+        valores, direcoes = resultados[sinal], por_sinal[sinal]
+        i_min, i_max = int(np.argmin(valores)), int(np.argmax(valores))
+        cantos[sinal] = {
+            "nominal": float(nominal[sinal][0]),
+            "minimo": float(valores[i_min]), "maximo": float(valores[i_max]),
+            "canto_minimo": dict(zip(nomes_tol, direcoes[i_min].astype(int).tolist())),
+            "canto_maximo": dict(zip(nomes_tol, direcoes[i_max].astype(int).tolist())),
+        }
+    return cantos
@@ -0,0 +1,442 @@
+# core/transiente.py
+
+"""
+Análise no domínio do tempo (.TRAN) sobre a ANM compilada do circuito.
+
+L e C viram modelos companheiros: uma condutância g em paralelo com uma fonte
+de corrente de histórico, com h o passo de tempo:
+
+    BE    C: g = C/h     L: g = h/L
+    TRAP  C: g = 2C/h    L: g = h/(2L)
+
+Com o passo fixo a matriz é a mesma em todos os passos: ela é fatorada uma vez
+para cada (método, passo). Como o circuito é linear, a LU também dá a resposta
+W = A⁻¹·P às fontes de histórico (P: incidência dos elementos reativos) e o
+passo se reduz ao estado dos R elementos reativos: um produto pela matriz de
+transição (2R x 2R). As tensões nodais de um bloco inteiro de passos saem
+depois de uma substituição e um produto de matrizes. Quando esse produto
+custaria mais que uma substituição com a LU (muitos elementos reativos), cada
+passo é uma substituição.
+
+Impedâncias Z entram pelo equivalente em paralelo na frequência de análise
+(condutância mais um C ou um L) e fontes sem forma de onda são somas de
+cossenoides: a fundamental (na frequência própria da fonte ou na de análise) e
+as harmônicas do seu espectro, as mesmas da análise harmônica. O circuito
+parte do repouso: capacitores descarregados e indutores sem corrente. O
+instante t = 0 é esse estado (capacitores em curto, indutores em aberto, as
+fontes no seu valor em t = 0) e a integração começa no passo seguinte, com o
+histórico dos modelos companheiros tirado dele.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+from core.circuito import CompiledCircuit, LIMITE_BYTES_BLOCO, R, L, C, Z, V, E, F, G, H
+from core.diagnostico import CircuitoSingularError
+from core.fatoracao import fatorar
+from core.harmonicos import componentes_fonte
+
+METODOS = ('BE', 'TRAP')
+PASSOS_POR_BLOCO = 4096
+# Teto de memória dos valores decimados guardados em ResultadoTransiente
+LIMITE_BYTES_RESULTADO = 64 * 1024 * 1024
+# Operações por passo abaixo das quais o custo é dominado pelo interpretador
+CUSTO_MINIMO_PASSO = 65536
+# Passo, relativo ao da análise, da partida dos circuitos com t = 0 singular
+PASSO_INICIAL_RELATIVO = 1e-6
+
+# Parâmetros omitidos das formas de onda (ver parser.parse_forma_onda)
+_PADRAO_SIN = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+_PADRAO_PULSE = (0.0, 0.0, 0.0, 0.0, 0.0, np.inf, 0.0)
+
+def avaliar_forma(forma, t):
+    """
+    Valores nos instantes t da forma de onda (tipo, parâmetros) de uma fonte:
+    DC v, SIN(vo va freq td theta fase) ou PULSE(v1 v2 td tr tf pw per).
+    """
+    tipo, p = forma
+    t = np.asarray(t, dtype=float)
+    if tipo == 'DC':
+        return np.full(t.shape, p[0])
+    if tipo == 'SIN':
+        vo, va, freq, td, theta, fase = p + _PADRAO_SIN[len(p):]
+        tau = np.maximum(t - td, 0.0)
+        return vo + va * np.exp(-theta * tau) * np.sin(2 * np.pi * freq * tau + np.deg2rad(fase))
+    if tipo == 'PULSE':
+        v1, v2, td, tr, tf, pw, per = p + _PADRAO_PULSE[len(p):]
+        tau = t - td
+        if per > 0:
+            tau = np.where(tau >= 0, np.mod(tau, per), tau)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            subida = v1 + (v2 - v1) * tau / tr
+            descida = v2 + (v1 - v2) * (tau - tr - pw) / tf
+        return np.select([tau < 0, tau < tr, tau < tr + pw, tau < tr + pw + tf], [v1, subida, v2, descida], v1)
+    raise ValueError(f"Forma de onda desconhecida: '{tipo}'")
+
+def instantes(passo, t_final, t_inicio=0.0):
+    """
+    Índices (primeiro, ultimo) dos passos gravados: os instantes k * passo em
+    [t_inicio, t_final].
+    """
+    return int(np.ceil(t_inicio / passo - 1e-9)), int(np.floor(t_final / passo + 1e-9))
+
+class SimulacaoTransiente:
+    """
+    Modelos companheiros de um CompiledCircuit para a análise no tempo. As
+    fatorações ficam guardadas por (método, passo): simular de novo com o mesmo
+    passo (outro intervalo, exportação em resolução total) não refatora.
+    """
+    def __init__(self, circuito, frequencia=60):
+        self.circuito = c = circuito
+        self.frequencia = frequencia
+        t = c.tipos
+        coef = c.coeficientes()[:-1]
+        resistivo = np.isin(t, [R, Z])
+        complexos = ~resistivo & (coef.imag != 0)
+        if complexos.any():
+            nomes = [c.nomes[k] for k in np.flatnonzero(complexos)]
+            raise ValueError(f"Valores complexos só têm modelo no domínio do tempo em R e Z: {', '.join(nomes[:10])}.")
+        # Z = 1/(g + jb): b > 0 é um capacitor b/w em paralelo; b < 0, um indutor de 1/L = -b*w
+        b = np.where(resistivo, coef.imag, 0.0)
+        w = 2 * np.pi * frequencia
+        if w <= 0 and b.any():
+            raise ValueError("Impedâncias complexas requerem uma frequência de análise positiva na análise no tempo.")
+        self.condutancia = np.where(np.isin(t, [L, C]), 0.0, coef.real)  # Inclui os ganhos das fontes controladas
+        self.capacitancia = np.where(t == C, coef.real, np.where(b > 0, b / (w or 1), 0.0))
+        self.inverso_indutancia = np.where(t == L, coef.real, np.where(b < 0, -b * w, 0.0))
+
+        self.reativos = np.flatnonzero((self.capacitancia != 0) | (self.inverso_indutancia != 0))
+        self.fontes = np.flatnonzero(t == V)
+        self.nomes_sinais = ([f"V({no})" for no in c.nos] + [f"V({nome})" for nome in c.nomes]
+                             + [f"I({nome})" for nome in c.nomes])
+        self._fatoracoes = {}
+        self._respostas = {}
+        self._iniciais = {}
+
+    def __getstate__(self):
+        # As LU esparsas não são serializáveis; são refeitas sob demanda
+        estado = self.__dict__.copy()
+        estado['_fatoracoes'] = {}
+        estado['_respostas'] = {}
+        estado['_iniciais'] = {}
+        return estado
+
+    @staticmethod
+    def _fatores(metodo, passo):
+        # Multiplicadores de C e de 1/L na condutância companheira
+        return (1 / passo, passo) if metodo == 'BE' else (2 / passo, passo / 2)
+
+    def companheiros(self, metodo, passo):
+        """
+        (g, hv, hi) dos elementos reativos: a corrente de cada um é
+        i = g * v - I_hist, com I_hist = hv * v_anterior + hi * i_anterior.
+        """
+        a, b = self._fatores(metodo, passo)
+        r = self.reativos
+        capacitor = self.capacitancia[r] != 0
+        g = a * self.capacitancia[r] + b * self.inverso_indutancia[r]
+        trapezio = metodo == 'TRAP'
+        hv = np.where(capacitor, 1.0, -1.0 if trapezio else 0.0) * g
+        hi = np.where(capacitor, 1.0 if trapezio else 0.0, -1.0)
+        return g, hv, hi
+
+    def fatoracao(self, metodo, passo):
+        chave = (metodo, passo)
+        if chave not in self._fatoracoes:
+            a, b = self._fatores(metodo, passo)
+            coef = np.append(self.condutancia + a * self.capacitancia + b * self.inverso_indutancia, 1.0)
+            c = self.circuito
+            self._fatoracoes[chave] = fatorar(c.montar(coef), c.esparso, c.incognitas, c.ordem_fatoracao())
+        return self._fatoracoes[chave]
+
+    def resposta_reativa(self, metodo, passo):
+        """
+        Forma reduzida aos elementos reativos: (P, W, M), com P a incidência
+        (n, R) deles, W = A⁻¹P a resposta às suas fontes de histórico e M a
+        transição do estado s = [tensões; correntes] desses elementos:
+        s_k = M s_(k-1) + [Pᵀx_k; g Pᵀx_k], x_k a resposta só às fontes.
+        None quando um passo com M custaria mais que uma substituição com a LU.
+        """
+        chave = (metodo, passo)
+        if chave not in self._respostas:
+            c, r = self.circuito, self.reativos
+            n, R = c.dimensao, self.reativos.size
+            fatoracao = self.fatoracao(metodo, passo)
+            custo_lu = 2 * fatoracao.nnz_fatores()
+            if R == 0 or 4 * R * R > max(custo_lu, CUSTO_MINIMO_PASSO) or 8 * n * R > LIMITE_BYTES_BLOCO:
+                self._respostas[chave] = None
+            else:
+                incidencia = np.zeros((n + 1, R))
+                incidencia[c.n1[r], np.arange(R)] += 1
+                incidencia[c.n2[r], np.arange(R)] -= 1
+                incidencia = incidencia[:n]
+                W = fatoracao.solve(incidencia).reshape(n, R)
+                g, hv, hi = self.companheiros(metodo, passo)
+                # v_k = Pᵀx_k + PᵀW (hv v + hi i); i_k = g v_k - (hv v + hi i)
+                historico = np.concatenate([np.diag(hv), np.diag(hi)], axis=1)
+                tensao = (incidencia.T @ W) @ historico
+                transicao = np.concatenate([tensao, g[:, None] * tensao - historico])
+                self._respostas[chave] = (incidencia, W, transicao)
+        return self._respostas[chave]
+
+    def estado_inicial(self, metodo, passo):
+        """
+        Solução (N + M,) e correntes dos elementos reativos em t = 0, com o
+        circuito em repouso: cada capacitor é uma fonte de 0 V (sua corrente é
+        incógnita) e cada indutor, um aberto. Se esse circuito for singular
+        (fonte de tensão em paralelo com um capacitor, nó ligado só por
+        indutores), o estado sai de dois passos minúsculos de Euler implícito
+        (fração PASSO_INICIAL_RELATIVO do passo) a partir do repouso.
+        """
+        chave = (metodo, passo)
+        if chave not in self._iniciais:
+            c, r = self.circuito, self.reativos
+            n = c.dimensao
+            excitacao = np.zeros(n + 1)
+            excitacao[c.ramo[self.fontes]] = self.tensoes_fontes(np.zeros(1))[0]
+            capacitores = r[self.capacitancia[r] != 0]
+            # Incidência (n, capacitores) das correntes dos capacitores em curto
+            colunas = np.arange(capacitores.size)
+            incidencia = sp.csc_matrix((np.r_[np.ones(capacitores.size), -np.ones(capacitores.size)],
+                                        (np.r_[c.n1[capacitores], c.n2[capacitores]], np.r_[colunas, colunas])),
+                                       shape=(n + 1, capacitores.size))[:n]
+            A = c.montar(np.append(self.condutancia, 1.0))
+            if capacitores.size == 0:
+                aumentada = A
+            elif c.esparso:
+                aumentada = sp.bmat([[A, incidencia], [incidencia.T, None]], format='csc')
+            else:
+                densa = incidencia.toarray()
+                aumentada = np.block([[A, densa], [densa.T, np.zeros((capacitores.size, capacitores.size))]])
+            nomes = c.incognitas + [f"I({c.nomes[k]})" for k in capacitores]
+            try:
+                y = fatorar(aumentada, c.esparso, nomes).solve(np.r_[excitacao[:n], np.zeros(capacitores.size)])
+                solucao = y[:n]
+                correntes = np.zeros(r.size)
+                correntes[np.isin(r, capacitores)] = y[n:]
+            except CircuitoSingularError:
+                solucao, correntes = self._inicio_regularizado(passo)
+            self._iniciais[chave] = (solucao, correntes)
+        return self._iniciais[chave]
+
+    def _inicio_regularizado(self, passo):
+        # Dois passos de Euler implícito muito curtos a partir do repouso: o
+        # primeiro leva os capacitores presos a fontes de tensão à tensão
+        # delas, o segundo dá as correntes (C·dv/dt) e as tensões dos indutores
+        # (L·di/dt) coerentes com esse estado. O erro é da ordem de delta.
+        c, r = self.circuito, self.reativos
+        n = c.dimensao
+        delta = passo * PASSO_INICIAL_RELATIVO
+        fatoracao = self.fatoracao('BE', delta)
+        g, hv, hi = self.companheiros('BE', delta)
+        n1, n2 = c.n1[r], c.n2[r]
+        x, correntes = np.zeros(n + 1), np.zeros(r.size)
+        for fontes in self.tensoes_fontes([delta, 2 * delta]):
+            historico = hv * (x[n1] - x[n2]) + hi * correntes
+            b = np.zeros(n + 1)
+            b[c.ramo[self.fontes]] = fontes
+            b += np.bincount(n1, historico, n + 1) - np.bincount(n2, historico, n + 1)
+            x[:n] = fatoracao.solve(b[:n])
+            correntes = g * (x[n1] - x[n2]) - historico
+        return x[:n], correntes
+
+    def tensoes_fontes(self, t):
+        """
+        Tensões (len(t), fontes) das fontes independentes nos instantes t.
+        """
+        c = self.circuito
+        t = np.asarray(t, dtype=float)
+        valores = np.empty((t.size, self.fontes.size))
+        for j, k in enumerate(self.fontes.tolist()):
+            forma = c.componentes.formas.get(k)
+            if forma is None or forma[0] == 'AC':
+                frequencias, fasores = componentes_fonte(c, k, self.frequencia)
+                valores[:, j] = (np.exp(2j * np.pi * t[:, None] * frequencias) @ fasores).real
+            else:
+                valores[:, j] = avaliar_forma(forma, t)
+        return valores
+
+    def iterar(self, passo, t_final, metodo='TRAP', t_inicio=0.0, passos_por_bloco=None, progresso=None):
+        """
+        Integra o circuito de 0 a t_final e gera, bloco a bloco, tuplas
+        (tempos, valores) com valores (B, sinais) na ordem de nomes_sinais;
+        só os instantes a partir de t_inicio são gerados. O instante 0 é o
+        estado inicial (estado_inicial) e o passo k dá o instante k * passo. A memória usada não
+        depende do número de passos. progresso(fracao) é chamado a cada bloco.
+        """
+        metodo = metodo.upper()
+        if metodo not in METODOS:
+            raise ValueError(f"Método de integração desconhecido: '{metodo}' (use {' ou '.join(METODOS)})")
+        if passo <= 0:
+            raise ValueError("O passo de tempo deve ser positivo.")
+        c = self.circuito
+        n = c.dimensao
+        fatoracao = self.fatoracao(metodo, passo)
+        primeiro, ultimo = instantes(passo, t_final, t_inicio)
+
+        r = self.reativos
+        g, hv, hi = self.companheiros(metodo, passo)
+        n1, n2 = c.n1[r], c.n2[r]
+        ramos = c.ramo[self.fontes]
+
+        resposta = self.resposta_reativa(metodo, passo)
+        solucao, corrente = self.estado_inicial(metodo, passo)
+        x = np.append(solucao, 0.0)  # Posição n: nó '0'
+        estado = np.concatenate([x[n1] - x[n2], corrente])  # Tensões e correntes dos elementos reativos
+        if primeiro <= 0 <= ultimo:
+            yield np.zeros(1), self.sinais(solucao[None], corrente[None])
+        if passos_por_bloco is None:
+            por_passo = 8 * (n + r.size + len(self.nomes_sinais))
+            passos_por_bloco = max(1, min(PASSOS_POR_BLOCO, LIMITE_BYTES_BLOCO // por_passo))
+
+        for inicio in range(1, ultimo + 1, passos_por_bloco):
+            k = np.arange(inicio, min(inicio + passos_por_bloco, ultimo + 1))
+            tempos = k * passo
+            excitacao = np.zeros((k.size, n + 1))
+            excitacao[:, ramos] = self.tensoes_fontes(tempos)
+            if r.size == 0:
+                # Sem elementos reativos não há estado: o bloco inteiro numa só substituição
+                solucoes = fatoracao.solve(excitacao[:, :n].T).T.reshape(k.size, n)
+                correntes = np.zeros((k.size, 0))
+            elif resposta is not None:
+                # x = A⁻¹·fontes + W·historico: só o histórico depende do passo anterior
+                incidencia, W, transicao = resposta
+                particular = fatoracao.solve(excitacao[:, :n].T).T.reshape(k.size, n)
+                tensoes_particular = particular @ incidencia
+                entradas = np.concatenate([tensoes_particular, g * tensoes_particular], axis=1)
+                estados = np.empty((k.size + 1, 2 * r.size))
+                estados[0] = estado
+                for j in range(k.size):
+                    estados[j + 1] = estado = transicao @ estado + entradas[j]
+                anteriores = estados[:-1]
+                historicos = hv * anteriores[:, :r.size] + hi * anteriores[:, r.size:]
+                solucoes = particular + historicos @ W.T
+                correntes = estados[1:, r.size:]
+            else:
+                solucoes = np.empty((k.size, n))
+                correntes = np.empty((k.size, r.size))
+                for j in range(k.size):
+                    historico = hv * (x[n1] - x[n2]) + hi * corrente
+                    b_passo = excitacao[j]
+                    b_passo += np.bincount(n1, historico, n + 1) - np.bincount(n2, historico, n + 1)
+                    x[:n] = fatoracao.solve(b_passo[:n])
+                    corrente = g * (x[n1] - x[n2]) - historico
+                    solucoes[j] = x[:n]
+                    correntes[j] = corrente
+            gravar = k >= primeiro
+            if gravar.any():
+                yield tempos[gravar], self.sinais(solucoes[gravar], correntes[gravar])
+            if progresso: progresso(min(k[-1] / max(ultimo, 1), 1.0))
+
+    def sinais(self, solucoes, correntes_reativas):
+        """
+        Tensões nodais, tensões e correntes dos componentes (B, sinais) a partir
+        das soluções (B, N + M) e das correntes dos elementos reativos.
+        """
+        c = self.circuito
+        t = c.tipos
+        x = np.concatenate([solucoes, np.zeros((len(solucoes), 1))], axis=1)
+        tensoes = x[:, c.n1] - x[:, c.n2]
+        correntes = tensoes * np.where(np.isin(t, [R, Z]), self.condutancia, 0.0)
+        correntes[:, self.reativos] += correntes_reativas
+        ganhos = c.valores.real
+        correntes = np.where(np.isin(t, [V, E, H]), -x[:, c.ramo], correntes)
+        correntes = np.where(t == G, ganhos * (x[:, c.nc1] - x[:, c.nc2]), correntes)
+        correntes = np.where(t == F, ganhos * -x[:, c.controle], correntes)
+        return np.concatenate([solucoes[:, :c.N], tensoes, correntes], axis=1)
+
+class ResultadoTransiente:
+    """
+    Formas de onda da análise .TRAN. Se decimado, cada trecho de passos foi
+    reduzido ao seu mínimo e máximo (a resolução total é refeita a partir da
+    simulacao, com a fatoração já guardada).
+    """
+    def __init__(self, tempos, nos, tensoes_nos, componentes, tensoes, correntes,
+                 simulacao=None, parametros=None, decimado=False):
+        self.tempos = tempos
+        self.nos = nos
+        self.tensoes_nos = tensoes_nos
+        self.componentes = componentes
+        self.tensoes = tensoes
+        self.correntes = correntes
+        self.simulacao = simulacao
+        self.parametros = parametros or {}
+        self.decimado = decimado
+
+    def sinais(self):
+        """
+        Dicionário nome do sinal -> array real indexado pelo tempo, com os
+        mesmos nomes das demais análises.
+        """
+        sinais = {f"V({no})": self.tensoes_nos[:, k] for k, no in enumerate(self.nos)}
+        for k, nome in enumerate(self.componentes):
+            sinais[f"V({nome})"] = self.tensoes[:, k]
+        for k, nome in enumerate(self.componentes):
+            sinais[f"I({nome})"] = self.correntes[:, k]
+        return sinais
+
+def _minimo_maximo(tempos, valores, trecho):
+    # Cada trecho de passos vira dois pontos (início e fim do trecho), com o
+    # mínimo e o máximo na ordem em que ocorrem
+    n = len(tempos) // trecho
+    blocos = valores[:n * trecho].reshape(n, trecho, -1)
+    i_min, i_max = blocos.argmin(axis=1), blocos.argmax(axis=1)
+    minimos = np.take_along_axis(blocos, i_min[:, None], axis=1)[:, 0]
+    maximos = np.take_along_axis(blocos, i_max[:, None], axis=1)[:, 0]
+    antes = i_min <= i_max
+    saida = np.empty((2 * n, blocos.shape[2]))
+    saida[0::2] = np.where(antes, minimos, maximos)
+    saida[1::2] = np.where(antes, maximos, minimos)
+    t = np.stack([tempos[:n * trecho:trecho], tempos[trecho - 1:n * trecho:trecho]], axis=1).ravel()
+    return t, saida
+
+def analisar_transiente(componentes, passo, t_final, metodo='TRAP', t_inicio=0.0, frequencia=60,
+                        pontos_maximos=None, progresso=None):
+    """
+    Análise .TRAN completa. Com pontos_maximos, cada sinal guarda no máximo
+    esse número de pontos (mínimo e máximo de cada trecho de passos, limitado
+    também por LIMITE_BYTES_RESULTADO), então a memória não cresce com o número
+    de passos; sem ele, todos os instantes são guardados.
+    componentes pode ser uma tabela, um CompiledCircuit ou uma SimulacaoTransiente.
+    progresso(fracao) é chamado a cada bloco de passos.
+    """
+    if isinstance(componentes, SimulacaoTransiente):
+        simulacao = componentes
+    else:
+        circuito = componentes if isinstance(componentes, CompiledCircuit) else CompiledCircuit(componentes)
+        simulacao = SimulacaoTransiente(circuito, frequencia)
+    c = simulacao.circuito
+    n_sinais = len(simulacao.nomes_sinais)
+    primeiro, ultimo = instantes(passo, t_final, t_inicio)
+    total = max(ultimo - primeiro + 1, 0)
+    trecho = 1
+    if pontos_maximos is not None:
+        pontos_maximos = max(2, min(pontos_maximos, LIMITE_BYTES_RESULTADO // (8 * max(n_sinais, 1))))
+        if total > pontos_maximos:
+            trecho = -(-total // (pontos_maximos // 2))
+
+    partes_t, partes_v = [], []
+    resto_t, resto_v = np.empty(0), np.empty((0, n_sinais))
+    for tempos, valores in simulacao.iterar(passo, t_final, metodo, t_inicio, progresso=progresso):
+        if trecho > 1:
+            # Passos que não completam um trecho ficam para o próximo bloco
+            tempos, valores = np.concatenate([resto_t, tempos]), np.concatenate([resto_v, valores])
+            completos = len(tempos) // trecho * trecho
+            resto_t, resto_v = tempos[completos:], valores[completos:]
+            if completos == 0:
+                # Bloco menor que um trecho (o instante 0 sozinho, blocos pequenos)
+                continue
+            tempos, valores = _minimo_maximo(tempos[:completos], valores[:completos], trecho)
+        partes_t.append(tempos)
+        partes_v.append(valores)
+    if len(resto_t):
+        tempos, valores = _minimo_maximo(resto_t, resto_v, len(resto_t))
+        partes_t.append(tempos)
+        partes_v.append(valores)
+
+    tempos = np.concatenate(partes_t) if partes_t else np.empty(0)
+    valores = np.concatenate(partes_v) if partes_v else np.empty((0, n_sinais))
+    N, K = c.N, len(c.nomes)
+    parametros = {"passo": passo, "t_final": t_final, "t_inicio": t_inicio, "metodo": metodo.upper()}
+    return ResultadoTransiente(tempos, c.nos, valores[:, :N], c.nomes, valores[:, N:N + K], valores[:, N + K:],
+                               simulacao, parametros, decimado=trecho > 1)
@@ -0,0 +1,235 @@
+# core/trifasico.py
+
+"""
+Solução de circuitos trifásicos pela simetria entre as fases.
+
+As barras trifásicas são os trios de nós <barra>_A, <barra>_B e <barra>_C (os
+elementos T da netlist são expandidos assim). Se trocar cada nó A -> B -> C
+leva cada componente num componente do mesmo tipo e valor, a matriz da ANM é
+invariante por essa rotação e se separa nas três componentes simétricas: em
+cada sequência (0, 1 e 2) a solução é x_B = μ·x_A e x_C = μ²·x_A, e basta
+resolver o sistema reduzido das incógnitas de uma fase (mais os nós fora das
+barras, como neutros, na sequência zero), com cerca de um terço do tamanho:
+
+    equilibrado (fontes só de sequência positiva): um sistema por fase
+    fontes desequilibradas: um sistema por sequência presente, desacoplados
+    componentes desequilibrados (valores diferentes entre as fases): ANM completa
+
+O sistema reduzido é montado direto das estampas compiladas, só com as linhas
+das incógnitas de uma fase.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+from core.circuito import PARTE_G, ResultadoAnalise, R, L, C, Z, V
+from core.fatoracao import fatorar
+from netlist_parser.parser import FASES
+
+# Fator μ de cada sequência (x_B = μ·x_A): positiva atrasa 120°, negativa adianta
+SEQUENCIAS = {1: np.exp(-2j * np.pi / 3), 2: np.exp(2j * np.pi / 3), 0: 1.0}
+# Abaixo disso (relativo à excitação total) a sequência é considerada ausente
+TOLERANCIA_SEQUENCIA = 1e-12
+
+class SimetriaTrifasica:
+    """
+    Rotação A -> B -> C das incógnitas e dos componentes de um CompiledCircuit.
+    Só depende da topologia: fica guardada no circuito e é compartilhada pelas
+    cópias de com_valores(), que só trocam valores.
+    """
+    def __init__(self, circuito, incognita, componente):
+        self.incognita = incognita    # (n,) imagem de cada incógnita pela rotação
+        self.componente = componente  # (K,) imagem de cada componente
+        n = circuito.dimensao
+        fixas = incognita == np.arange(n)
+        # Trios [x, P(x), P²(x)] das órbitas da rotação, a partir do menor índice de cada uma
+        primeiras = np.flatnonzero(~fixas & (np.arange(n) < incognita) & (np.arange(n) < incognita[incognita]))
+        self.trios = np.stack([primeiras, incognita[primeiras], incognita[incognita[primeiras]]], axis=1)
+        self.fixas = np.flatnonzero(fixas)
+        self._reducoes = {}
+
+    def reducao(self, circuito, com_fixas):
+        """
+        Estampas do sistema reduzido (sequência zero com as incógnitas fixas ou
+        demais sequências sem elas): índices das estampas usadas, linha e coluna
+        reduzidas e a potência de μ de cada coluna.
+        """
+        if com_fixas not in self._reducoes:
+            n = circuito.dimensao
+            reduzida = np.full(n + 1, -1, dtype=np.int64)
+            potencia = np.zeros(n + 1, dtype=np.int64)
+            for m in range(3):
+                reduzida[self.trios[:, m]] = np.arange(len(self.trios))
+                potencia[self.trios[:, m]] = m
+            linhas = np.full(n + 1, -1, dtype=np.int64)
+            linhas[self.trios[:, 0]] = np.arange(len(self.trios))
+            if com_fixas:
+                reduzida[self.fixas] = linhas[self.fixas] = len(self.trios) + np.arange(len(self.fixas))
+            usadas = np.flatnonzero((linhas[circuito.estampa_linha] >= 0) & (reduzida[circuito.estampa_coluna] >= 0))
+            self._reducoes[com_fixas] = (usadas, linhas[circuito.estampa_linha[usadas]],
+                                         reduzida[circuito.estampa_coluna[usadas]],
+                                         potencia[circuito.estampa_coluna[usadas]])
+        return self._reducoes[com_fixas]
+
+def _rotacao_nos(circuito):
+    """
+    Imagem de cada nó pela rotação A -> B -> C (tamanho dimensao + 1, com o
+    sumidouro), ou None se não há barras trifásicas completas.
+    """
+    rotacao = np.arange(circuito.dimensao + 1)
+    barras = {}
+    for i, no in enumerate(circuito.nos):
+        if len(no) > 2 and no[-2] == '_' and no[-1] in FASES:
+            barras.setdefault(no[:-2], [None] * 3)[FASES.index(no[-1])] = i
+    trios = [indices for indices in barras.values() if None not in indices]
+    if not trios:
+        return None
+    trios = np.array(trios)
+    rotacao[trios[:, 0]], rotacao[trios[:, 1]], rotacao[trios[:, 2]] = trios[:, 1], trios[:, 2], trios[:, 0]
+    return rotacao
+
+def _casar(chaves, imagens, desempate):
+    """
+    Bijeção k -> componente cuja chave é a imagem da chave de k (linhas de
+    inteiros), ou None se as chaves não se correspondem. Chaves repetidas
+    (componentes em paralelo) são pareadas na ordem de desempate.
+    """
+    _, ids = np.unique(np.concatenate([chaves, imagens]), axis=0, return_inverse=True)
+    ids = ids.ravel()
+    id_chave, id_imagem = ids[:len(chaves)], ids[len(chaves):]
+    ordem_chave = np.lexsort((*desempate, id_chave))
+    ordem_imagem = np.lexsort((*desempate, id_imagem))
+    if not np.array_equal(id_chave[ordem_chave], id_imagem[ordem_imagem]):
+        return None
+    imagem = np.empty(len(chaves), dtype=np.int64)
+    imagem[ordem_imagem] = ordem_chave
+    return imagem
+
+def simetria_trifasica(circuito):
+    """
+    SimetriaTrifasica do circuito (calculada uma vez), ou None se ele não tem
+    barras trifásicas ou a topologia não é a mesma nas três fases.
+    """
+    if circuito.simetria is None:
+        circuito.simetria = _calcular_simetria(circuito) or False
+    return circuito.simetria or None
+
+def _calcular_simetria(circuito):
+    # O sistema reduzido é montado das estampas; os blocos de subcircuitos ficam de fora
+    rotacao = None if circuito.subcircuitos else _rotacao_nos(circuito)
+    if rotacao is None:
+        return None
+    n, K = circuito.dimensao, len(circuito.nomes)
+    t = circuito.tipos.astype(np.int64)
+    n1, n2 = circuito.n1, circuito.n2
+    # R, L, C e Z não têm orientação na matriz
+    passivo = np.isin(t, [R, L, C, Z])
+    a, b = np.where(passivo, np.minimum(n1, n2), n1), np.where(passivo, np.maximum(n1, n2), n2)
+    ra, rb = rotacao[n1], rotacao[n2]
+    ra, rb = np.where(passivo, np.minimum(ra, rb), ra), np.where(passivo, np.maximum(ra, rb), rb)
+    # Componente controlador (F, H), pela incógnita de ramo que ele possui
+    dono_ramo = np.full(n + 1, -1, dtype=np.int64)
+    com_ramo = np.flatnonzero(circuito.ramo < n)
+    dono_ramo[circuito.ramo[com_ramo]] = com_ramo
+    controlador = dono_ramo[circuito.controle]
+
+    # Os controladores são casados primeiro; F e H usam a imagem deles na chave
+    imagem = np.arange(K)
+    desempate = (circuito.valores.imag, circuito.valores.real)
+    por_controle = controlador >= 0
+    for grupo in (~por_controle, por_controle):
+        k = np.flatnonzero(grupo)
+        if not k.size:
+            continue
+        ctrl = np.where(controlador[k] >= 0, imagem[np.maximum(controlador[k], 0)], -1)
+        chaves = np.stack([t[k], a[k], b[k], circuito.nc1[k], circuito.nc2[k], controlador[k]], axis=1)
+        imagens = np.stack([t[k], ra[k], rb[k], rotacao[circuito.nc1[k]], rotacao[circuito.nc2[k]], ctrl], axis=1)
+        # Fontes independentes têm valores diferentes por fase: pareadas só pela posição
+        casados = _casar(chaves, imagens, [np.where(t[k] == V, 0, d[k]) for d in desempate])
+        if casados is None:
+            return None
+        imagem[k] = k[casados]
+    if not np.array_equal(imagem[imagem[imagem]], np.arange(K)):
+        return None
+
+    incognita = np.arange(n)
+    incognita[:circuito.N] = rotacao[:circuito.N]
+    incognita[circuito.ramo[com_ramo]] = circuito.ramo[imagem[com_ramo]]
+    if np.array_equal(incognita, np.arange(n)):
+        return None
+    return SimetriaTrifasica(circuito, incognita, imagem)
+
+def equilibrado(circuito, simetria, valores=None):
+    """
+    Se os componentes (exceto as fontes independentes) têm os mesmos valores
+    nas três fases: a matriz fica invariante pela rotação.
+    """
+    valores = circuito.valores if valores is None else np.asarray(valores, dtype=complex)
+    comparar = circuito.tipos != V
+    return np.allclose(valores[simetria.componente][comparar], valores[comparar], rtol=1e-12, atol=0.0)
+
+def _sistema_reduzido(circuito, simetria, frequencia, mu, valores):
+    com_fixas = mu == 1.0
+    usadas, linhas, colunas, potencia = simetria.reducao(circuito, com_fixas)
+    tamanho = len(simetria.trios) + (len(simetria.fixas) if com_fixas else 0)
+    jw = 2j * np.pi * frequencia
+    with np.errstate(divide='ignore', invalid='ignore'):
+        escala = np.array([1.0, jw, 1 / jw])[np.append(circuito.parte, PARTE_G)]
+    coeficientes = circuito.coeficientes(valores) * escala
+    elementos = circuito.estampa_elemento[usadas]
+    pesos = circuito.estampa_sinal[usadas] * coeficientes[elementos] * np.asarray(mu, dtype=complex) ** potencia
+    A = sp.csc_matrix((pesos, (linhas, colunas)), shape=(tamanho, tamanho))
+    return A if circuito.esparso else A.toarray()
+
+def resolver_trifasico(circuito, frequencia, valores=None):
+    """
+    Resolve o circuito na frequência dada aproveitando a simetria entre as
+    fases quando possível. Retorna (ResultadoAnalise, modo), com modo 'por fase'
+    (um sistema reduzido), 'sequencias' (um por sequência presente) ou
+    'completo' (ANM inteira, sem simetria ou com componentes desequilibrados).
+    """
+    simetria = simetria_trifasica(circuito)
+    if simetria is None or not equilibrado(circuito, simetria, valores):
+        return circuito.resolver(frequencia, valores), 'completo'
+
+    z = np.append(circuito.excitacao(valores), 0)
+    trios, fixas = simetria.trios, simetria.fixas
+    nomes = [circuito.incognitas[i] for i in trios[:, 0]]
+    escala = np.abs(z).max() or 1.0
+    solucao = np.zeros(circuito.dimensao, dtype=complex)
+    resolvidas = 0
+    for sequencia, mu in SEQUENCIAS.items():
+        # Componente da excitação na sequência: média das fases giradas de volta
+        lado_direito = (z[trios[:, 0]] + np.conj(mu) * z[trios[:, 1]] + np.conj(mu) ** 2 * z[trios[:, 2]]) / 3
+        if sequencia == 0:
+            lado_direito = np.concatenate([lado_direito, z[fixas]])
+        presente = np.abs(lado_direito).max(initial=0.0) > TOLERANCIA_SEQUENCIA * escala
+        # A sequência positiva é sempre resolvida (mesmo sem fontes) para o diagnóstico de singularidade
+        if not presente and sequencia != 1:
+            continue
+        A = _sistema_reduzido(circuito, simetria, frequencia, mu, valores)
+        y = fatorar(A, circuito.esparso, nomes + [circuito.incognitas[i] for i in fixas] * (sequencia == 0)).solve(lado_direito)
+        for m in range(3):
+            solucao[trios[:, m]] += mu ** m * y[:len(trios)]
+        if sequencia == 0:
+            solucao[fixas] += y[len(trios):]
+        resolvidas += 1
+    modo = 'por fase' if resolvidas == 1 else 'sequencias'
+    return ResultadoAnalise(circuito, frequencia, solucao, valores), modo
+
+def grupos_trifasicos(circuito):
+    """
+    Componentes trifásicos pelos nomes dos elementos T expandidos:
+    {nome: [linha A, linha B, linha C]} para cada trio <nome>_A, _B e _C (ou
+    _AB, _BC e _CA) presente no circuito.
+    """
+    grupos = {}
+    for sufixos in (FASES, ('AB', 'BC', 'CA')):
+        for k, nome in enumerate(circuito.nomes):
+            base, _, sufixo = nome.rpartition('_')
+            if not base or sufixo != sufixos[0]:
+                continue
+            linhas = [circuito.indice_componente.get(f"{base}_{s}") for s in sufixos]
+            if None not in linhas:
+                grupos[base] = linhas
+    return grupos
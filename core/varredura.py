@@ -0,0 +1,64 @@
+# core/varredura.py
+
+import numpy as np
+
+from core.circuito import CompiledCircuit
+
+def gerar_frequencias(modo, pontos, f_inicial, f_final):
+    modo = modo.upper()
+    if modo == 'LIN':
+        return np.linspace(f_inicial, f_final, pontos)
+    if modo in ('DEC', 'OCT'):
+        base = 10.0 if modo == 'DEC' else 2.0
+        intervalos = np.log(f_final / f_inicial) / np.log(base)
+        total = max(int(np.floor(pontos * intervalos + 1e-9)) + 1, 1)
+        return np.logspace(np.log10(f_inicial), np.log10(f_final), total)
+    raise ValueError(f"Modo de varredura desconhecido: '{modo}'")
+
+def iterar_varredura_ac(circuito, frequencias, tamanho_bloco=None):
+    """
+    Resolve o circuito compilado em todas as frequências, bloco a bloco.
+    As partes G, C e L já estão estampadas no circuito; cada bloco é resolvido com
+    um único np.linalg.solve sobre as matrizes empilhadas (ou LU esparsa por ponto).
+    Gera tuplas (frequencias_do_bloco, solucoes) com solucoes de forma (F_bloco, N + M).
+    """
+    frequencias = np.asarray(frequencias, dtype=float)
+    for inicio, solucoes in circuito.iterar_lote(frequencias, tamanho_bloco=tamanho_bloco):
+        yield frequencias[inicio:inicio + len(solucoes)], solucoes
+
+class ResultadoVarredura:
+    def __init__(self, frequencias, nos, tensoes_nos, componentes, tensoes, correntes):
+        self.frequencias = frequencias
+        self.nos = nos
+        self.tensoes_nos = tensoes_nos
+        self.componentes = componentes
+        self.tensoes = tensoes
+        self.correntes = correntes
+
+    def sinais(self):
+        """
+        Dicionário nome do sinal -> array complexo indexado por frequência,
+        com os mesmos nomes usados nas listas de sinais da interface.
+        """
+        sinais = {f"V({no})": self.tensoes_nos[:, k] for k, no in enumerate(self.nos)}
+        for k, nome in enumerate(self.componentes):
+            sinais[f"V({nome})"] = self.tensoes[:, k]
+        for k, nome in enumerate(self.componentes):
+            sinais[f"I({nome})"] = self.correntes[:, k]
+        return sinais
+
+def analisar_varredura_ac(componentes, frequencias, metodo='auto', tamanho_bloco=None, progresso=None):
+    """
+    progresso(fracao) é chamado após cada bloco resolvido (fracao em [0, 1]).
+    """
+    circuito = componentes if isinstance(componentes, CompiledCircuit) else CompiledCircuit(componentes, metodo)
+    frequencias = np.asarray(frequencias, dtype=float)
+    solucao = np.empty((len(frequencias), circuito.dimensao), dtype=complex)
+    inicio = 0
+    for bloco, solucoes in iterar_varredura_ac(circuito, frequencias, tamanho_bloco):
+        solucao[inicio:inicio + len(bloco)] = solucoes
+        inicio += len(bloco)
+        if progresso: progresso(inicio / len(frequencias))
+
+    tensoes, correntes, _ = circuito.pos_processar(solucao, frequencias)
+    return ResultadoVarredura(frequencias, circuito.nos, solucao[:, :circuito.N], circuito.nomes, tensoes, correntes)
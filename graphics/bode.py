@@ -0,0 +1,43 @@
+# graphics/bode.py
+
+import numpy as np
+
+def plotar_bode(ax_mag, ax_fase, frequencias, dados, escala_log=True, titulo="Diagrama de Bode"):
+    """
+    Plota magnitude (dB) e fase (graus) de sinais de uma varredura em frequência.
+    dados = lista de dicts com: {"nome": str, "valor": array complexo indexado por frequência}
+    """
+    # Os eixos compartilham x: voltar ao linear antes de limpar evita que os
+    # limites padrão de um (0 a 1) caiam no outro ainda em escala log
+    ax_mag.set_xscale('linear')
+    ax_fase.set_xscale('linear')
+    ax_mag.clear()
+    ax_fase.clear()
+    frequencias = np.asarray(frequencias, dtype=float)
+    positivas = frequencias[frequencias > 0]
+    if escala_log and positivas.size:
+        # Limites só com as frequências positivas antes de passar ao log
+        f_min, f_max = positivas.min(), positivas.max()
+        if f_min == f_max:
+            f_min, f_max = f_min / 2, f_max * 2
+        ax_mag.set_xlim(f_min, f_max)
+        ax_mag.set_xscale('log')
+        ax_fase.set_xlim(f_min, f_max)
+        ax_fase.set_xscale('log')
+    plot_mag = ax_mag.semilogx if escala_log else ax_mag.plot
+    plot_fase = ax_fase.semilogx if escala_log else ax_fase.plot
+
+    for d in dados:
+        valores = np.asarray(d["valor"])
+        magnitude_db = 20 * np.log10(np.maximum(np.abs(valores), 1e-300))
+        fase_graus = np.rad2deg(np.unwrap(np.angle(valores)))
+        plot_mag(frequencias, magnitude_db, label=d["nome"])
+        plot_fase(frequencias, fase_graus, label=d["nome"])
+
+    ax_mag.set_title(titulo)
+    ax_mag.set_ylabel("Magnitude (dB)")
+    ax_mag.grid(True, which="both")
+    ax_mag.legend()
+    ax_fase.set_xlabel("Frequência (Hz)")
+    ax_fase.set_ylabel("Fase (°)")
+    ax_fase.grid(True, which="both")
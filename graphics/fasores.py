@@ -1,29 +1,198 @@
 # graphics/fasores.py
 
-import matplotlib.pyplot as plt
 import numpy as np
 
-def plotar_fasores(ax, dados, titulo="Diagrama Fasorial"):
+# Escalas do raio: linear (o maior fasor visível tem raio 1), por grandeza (V, I e
+# Z normalizados cada um pelo seu maior) e log (DECADAS_LOG décadas abaixo do maior)
+ESCALAS = ('linear', 'grandeza', 'log')
+DECADAS_LOG = 6
+ROTULOS_MAXIMOS = 8
+DISTANCIA_MINIMA_ROTULOS = 0.15  # Entre pontas rotuladas, no raio normalizado
+RAIO_EIXOS = 1.3
+CORES_GRANDEZA = {'V': 'C0', 'I': 'C3', 'Z': 'C2'}
+
+def grandeza_do_sinal(nome):
+    return nome.split('(', 1)[0]
+
+def vetores_fasores(valores, grandezas=None, escala='linear'):
     """
-    Plota fasores em um eixo (ax) do Matplotlib.
-    dados = lista de dicts com: {"nome": str, "valor": complex}
+    Pontas (u, v) dos fasores no plano normalizado (raio máximo 1), mantendo
+    os ângulos; em escala log o raio é o número de décadas acima do piso.
     """
-    ax.clear()  # Limpa o eixo antes de desenhar
+    valores = np.asarray(valores, dtype=complex)
+    modulo = np.abs(valores)
+    if escala == 'log':
+        topo = np.log10(modulo.max()) if modulo.size and modulo.max() > 0 else 0.0
+        with np.errstate(divide='ignore'):
+            raio = np.clip((np.log10(modulo) - topo) / DECADAS_LOG + 1, 0, 1)
+    elif escala == 'grandeza' and grandezas is not None:
+        _, grupo = np.unique(np.asarray(grandezas), return_inverse=True)
+        maximos = np.zeros(grupo.max() + 1 if grupo.size else 0)
+        np.maximum.at(maximos, grupo, modulo)
+        raio = modulo / np.where(maximos[grupo] > 0, maximos[grupo], 1.0)
+    else:
+        maximo = modulo.max() if modulo.size else 0.0
+        raio = modulo / (maximo if maximo > 0 else 1.0)
+    angulo = np.angle(valores)
+    return raio * np.cos(angulo), raio * np.sin(angulo)
+
+def escolher_rotulos(u, v, maximo=ROTULOS_MAXIMOS, distancia=DISTANCIA_MINIMA_ROTULOS):
+    """
+    Índices dos fasores a rotular: os de maior raio, pulando pontas próximas
+    demais de uma já rotulada, até o máximo.
+    """
+    escolhidos = []
+    for i in np.argsort(-np.hypot(u, v), kind='stable').tolist():
+        if len(escolhidos) >= maximo:
+            break
+        if all((u[i] - u[j]) ** 2 + (v[i] - v[j]) ** 2 >= distancia ** 2 for j in escolhidos):
+            escolhidos.append(i)
+    return escolhidos
+
+def _configurar_eixo(ax, titulo):
     ax.set_title(titulo)
     ax.grid(True)
     ax.set_xlabel("Re")
     ax.set_ylabel("Im")
     ax.axhline(0, color='black', linewidth=0.5)
     ax.axvline(0, color='black', linewidth=0.5)
-    
-    # Normalização para melhor visualização
-    max_val = max((abs(d["valor"]) for d in dados), default=1.0)
-    fator = 1.0 / max_val if max_val > 0 else 1.0
-
-    for d in dados:
-        val_norm = d["valor"] * fator
-        ax.arrow(0, 0, val_norm.real, val_norm.imag, head_width=0.05, 
-                 length_includes_head=True, label=d["nome"])
-        ax.text(val_norm.real * 1.1, val_norm.imag * 1.1, d["nome"])
-
-    ax.set_aspect('equal', adjustable='box')
\ No newline at end of file
+    ax.set_xlim(-RAIO_EIXOS, RAIO_EIXOS)
+    ax.set_ylim(-RAIO_EIXOS, RAIO_EIXOS)
+    ax.set_aspect('equal', adjustable='box')
+
+def _posicionar_rotulo(texto, x, y, nome):
+    texto.set_position((x * 1.08, y * 1.08))
+    texto.set_horizontalalignment('left' if x >= 0 else 'right')
+    texto.set_text(nome)
+    texto.set_visible(True)
+
+def plotar_fasores(ax, dados, titulo="Diagrama Fasorial", escala='linear'):
+    """
+    Plota fasores em um eixo (ax) do Matplotlib, numa única coleção (quiver).
+    dados = lista de dicts com: {"nome": str, "valor": complex}
+    """
+    ax.clear()  # Limpa o eixo antes de desenhar
+    _configurar_eixo(ax, titulo)
+    nomes = [d["nome"] for d in dados]
+    grandezas = [grandeza_do_sinal(n) for n in nomes]
+    u, v = vetores_fasores([d["valor"] for d in dados], grandezas, escala)
+    ax.quiver(np.zeros(len(u)), np.zeros(len(u)), u, v, angles='xy', scale_units='xy', scale=1,
+              color=[CORES_GRANDEZA.get(g, 'C1') for g in grandezas], width=0.004)
+    for i in escolher_rotulos(u, v):
+        _posicionar_rotulo(ax.text(0, 0, "", fontsize=8), u[i], v[i], nomes[i])
+
+class GraficoFasores:
+    """
+    Diagrama fasorial com artistas persistentes: todos os fasores numa única
+    coleção (quiver), atualizada no lugar; os ocultos ficam mascarados. Só os
+    ROTULOS_MAXIMOS maiores (sem sobreposição) recebem rótulo; os demais são
+    identificados ao passar o mouse sobre a ponta.
+    """
+    def __init__(self, canvas, ax, titulo="Diagrama Fasorial"):
+        self.canvas = canvas
+        self.ax = ax
+        self.nomes = []
+        self.valores = np.zeros(0, dtype=complex)
+        self.visiveis = np.zeros(0, dtype=bool)
+        self.escala = 'linear'
+        self.quiver = None
+        self._pontas = np.zeros((0, 2))
+        self._indice_anotado = None
+        ax.clear()
+        _configurar_eixo(ax, titulo)
+        self.rotulos = [ax.text(0, 0, "", fontsize=8, visible=False) for _ in range(ROTULOS_MAXIMOS)]
+        # Anéis de década da escala log (um único artista) e seus valores
+        angulo = np.linspace(0, 2 * np.pi, 121)
+        self.aneis = ax.plot(*self._curvas_aneis(angulo), color='0.75', linewidth=0.6, visible=False)[0]
+        self.valores_aneis = [ax.text(0, 0, "", fontsize=7, color='0.4', visible=False) for _ in range(DECADAS_LOG)]
+        self.anotacao = ax.annotate("", xy=(0, 0), xytext=(10, 10), textcoords='offset points', fontsize=8,
+                                    bbox=dict(boxstyle='round', fc='lightyellow', alpha=0.9), visible=False)
+        canvas.mpl_connect('motion_notify_event', self._ao_mover)
+
+    @staticmethod
+    def _curvas_aneis(angulo):
+        # Círculos concatenados, separados por NaN, para caberem numa só Line2D
+        raios = np.arange(1, DECADAS_LOG + 1) / DECADAS_LOG
+        x = np.concatenate([np.r_[r * np.cos(angulo), np.nan] for r in raios])
+        y = np.concatenate([np.r_[r * np.sin(angulo), np.nan] for r in raios])
+        return x, y
+
+    def definir_fasores(self, nomes, valores, visiveis=None, escala=None):
+        """
+        Troca os fasores; o quiver só é recriado se a lista de sinais mudou.
+        visiveis (padrão: os já visíveis) e escala são repassados a mostrar().
+        """
+        nomes = list(nomes)
+        if nomes != self.nomes:
+            # Sem visiveis: continuam os já visíveis (na primeira vez, todos)
+            anteriores = [self.nomes[i] for i in np.flatnonzero(self.visiveis)] if self.nomes else nomes
+            if self.quiver is not None:
+                self.quiver.remove()
+            zeros = np.zeros(len(nomes))
+            self.quiver = self.ax.quiver(zeros, zeros, zeros, zeros, angles='xy', scale_units='xy', scale=1,
+                                         color=[CORES_GRANDEZA.get(grandeza_do_sinal(n), 'C1') for n in nomes],
+                                         width=0.004)
+            self.nomes = nomes
+            self.grandezas = [grandeza_do_sinal(n) for n in nomes]
+            if visiveis is None:
+                visiveis = anteriores
+        self.valores = np.asarray(valores, dtype=complex)
+        self.mostrar(visiveis if visiveis is not None else [self.nomes[i] for i in np.flatnonzero(self.visiveis)],
+                     escala)
+
+    def mostrar(self, visiveis, escala=None):
+        if escala is not None:
+            self.escala = escala
+        marcados = set(visiveis)
+        self.visiveis = np.fromiter((n in marcados for n in self.nomes), dtype=bool, count=len(self.nomes))
+        indices = np.flatnonzero(self.visiveis)
+        u = np.zeros(len(self.nomes))
+        v = np.zeros(len(self.nomes))
+        u[indices], v[indices] = vetores_fasores(self.valores[indices], [self.grandezas[i] for i in indices], self.escala)
+        self._pontas = np.column_stack([u, v])
+        if self.quiver is not None:
+            self.quiver.set_UVC(np.ma.masked_array(u, ~self.visiveis), np.ma.masked_array(v, ~self.visiveis))
+
+        for texto in self.rotulos:
+            texto.set_visible(False)
+        for texto, k in zip(self.rotulos, escolher_rotulos(u[indices], v[indices])):
+            i = indices[k]
+            _posicionar_rotulo(texto, u[i], v[i], self.nomes[i])
+        self._atualizar_aneis(indices)
+        self.anotacao.set_visible(False)
+        self._indice_anotado = None
+        self.canvas.draw_idle()
+
+    def _atualizar_aneis(self, indices):
+        log = self.escala == 'log' and len(indices) > 0
+        self.aneis.set_visible(log)
+        modulo = np.abs(self.valores[indices]) if log else np.zeros(0)
+        topo = np.log10(modulo.max()) if log and modulo.max() > 0 else 0.0
+        for k, texto in enumerate(self.valores_aneis, start=1):
+            texto.set_visible(log)
+            if log:
+                r = k / DECADAS_LOG
+                texto.set_position((r * np.cos(np.pi / 4), r * np.sin(np.pi / 4)))
+                texto.set_text(f"{10 ** (topo - DECADAS_LOG + k):.3g}")
+
+    def _ao_mover(self, evento):
+        # Mostra nome e valor do fasor cuja ponta está a menos de 8 pixels do mouse
+        indice = None
+        if evento.inaxes is self.ax and self.visiveis.any():
+            indices = np.flatnonzero(self.visiveis)
+            pontas = self.ax.transData.transform(self._pontas[indices])
+            distancias = np.hypot(pontas[:, 0] - evento.x, pontas[:, 1] - evento.y)
+            mais_perto = int(np.argmin(distancias))
+            if distancias[mais_perto] <= 8:
+                indice = int(indices[mais_perto])
+        if indice == self._indice_anotado:
+            return
+        self._indice_anotado = indice
+        if indice is None:
+            self.anotacao.set_visible(False)
+        else:
+            valor = self.valores[indice]
+            self.anotacao.xy = tuple(self._pontas[indice])
+            self.anotacao.set_text(f"{self.nomes[indice]} = {abs(valor):.4g} ∠ {np.degrees(np.angle(valor)):.1f}°")
+            self.anotacao.set_visible(True)
+        self.canvas.draw_idle()
@@ -0,0 +1,23 @@
+# graphics/histograma.py
+
+def plotar_histogramas(ax, resultado, sinais, bins=50, titulo="Monte Carlo"):
+    """
+    Plota os histogramas das amostras de Monte Carlo em um eixo (ax) do Matplotlib,
+    com a média e os percentis P5/P95 de cada sinal na legenda.
+    resultado = ResultadoMonteCarlo; sinais = lista de nomes (ex: "V(n2)", "P(R1)")
+    """
+    ax.clear()
+    estatisticas = resultado.estatisticas(sinais)
+    for sinal in sinais:
+        e = estatisticas[sinal]
+        rotulo = f"{sinal}: μ={e['media']:.4g}, P5={e['p5']:.4g}, P95={e['p95']:.4g}"
+        _, _, barras = ax.hist(resultado.amostras[sinal], bins=bins, alpha=0.5, label=rotulo)
+        cor = barras[0].get_facecolor() if len(barras) else None
+        ax.axvline(e['p5'], color=cor, linestyle='--', linewidth=1)
+        ax.axvline(e['p95'], color=cor, linestyle='--', linewidth=1)
+
+    ax.set_title(titulo)
+    ax.set_xlabel("Valor (|V|, |I| ou P em W)")
+    ax.set_ylabel("Ocorrências")
+    ax.grid(True)
+    ax.legend()
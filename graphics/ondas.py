@@ -1,26 +1,212 @@
 # graphics/ondas.py
 
-import matplotlib.pyplot as plt
 import numpy as np
 
+# Acima disso a legenda atrapalha mais do que ajuda
+LEGENDA_MAXIMA = 15
+# Amostras avaliadas por vez nas ondas com várias frequências (sinais x instantes)
+AMOSTRAS_POR_BLOCO = 1 << 20
+
+def gerar_ondas(valores, f=60, ciclos=2, amostras=1000, pontos_maximos=None):
+    """
+    Formas de onda de todos os fasores de uma vez: retorna (t, ondas) com ondas
+    de forma (sinais, pontos), em que ondas[k] = Re(valores[k] * e^(j w t)).
+    Com mais amostras que pontos_maximos (ex.: 2x a largura do eixo em pixels),
+    as amostras são decimadas: cada trecho vira o seu mínimo e máximo, obtidos
+    analiticamente (o custo não depende do número de amostras).
+    """
+    valores = np.asarray(valores, dtype=complex).ravel()
+    duracao = ciclos / f
+    if pontos_maximos is None or amostras <= pontos_maximos:
+        t = np.linspace(0, duracao, amostras)
+        return t, (valores[:, None] * np.exp(2j * np.pi * f * t)).real
+
+    # Trechos de amostras consecutivas; cada um começa e termina numa amostra
+    n_trechos = max(pontos_maximos // 2, 1)
+    limites = np.linspace(0, amostras - 1, n_trechos + 1).round()
+    passo_t = duracao / (amostras - 1)
+    t_inicio, t_fim = limites[:-1] * passo_t, np.maximum(limites[1:] - 1, limites[:-1]) * passo_t
+    t_fim[-1] = duracao
+
+    amplitude = np.abs(valores)[:, None]
+    fase = np.angle(valores)[:, None]
+    inicio = 2 * np.pi * f * t_inicio + fase
+    fim = 2 * np.pi * f * t_fim + fase
+    y_inicio, y_fim = amplitude * np.cos(inicio), amplitude * np.cos(fim)
+    # O trecho passa por um pico (ângulo 2kπ) ou vale ((2k+1)π) da senoide?
+    volta = 2 * np.pi
+    tem_pico = np.floor(fim / volta) >= np.ceil(inicio / volta)
+    tem_vale = np.floor((fim - np.pi) / volta) >= np.ceil((inicio - np.pi) / volta)
+
+    minimos = np.where(tem_vale, -amplitude, np.minimum(y_inicio, y_fim))
+    maximos = np.where(tem_pico, amplitude, np.maximum(y_inicio, y_fim))
+    # Em trechos descendentes o máximo vem primeiro (evita o serrilhado nas bordas)
+    descendo = y_inicio > y_fim
+    ondas = np.empty((len(valores), 2 * n_trechos))
+    ondas[:, 0::2] = np.where(descendo, maximos, minimos)
+    ondas[:, 1::2] = np.where(descendo, minimos, maximos)
+    return np.stack([t_inicio, t_fim], axis=1).ravel(), ondas
+
+def gerar_ondas_espectro(espectros, frequencias, duracao, amostras=1000, pontos_maximos=None):
+    """
+    Formas de onda com várias frequências (ex.: harmônicas): espectros de forma
+    (sinais, F), um fasor por frequência, e ondas[k] = Σ Re(espectros[k, f] * e^(j 2π f t)).
+    Com mais amostras que pontos_maximos, cada trecho de amostras vira o seu
+    mínimo e máximo; as amostras são avaliadas em blocos, sem guardar todas.
+    """
+    espectros = np.atleast_2d(np.asarray(espectros, dtype=complex))
+    frequencias = np.asarray(frequencias, dtype=float)
+    passo_t = duracao / max(amostras - 1, 1)
+    onda = lambda indices: (espectros @ np.exp(2j * np.pi * frequencias[:, None] * (indices * passo_t))).real
+    if pontos_maximos is None or amostras <= pontos_maximos:
+        return np.arange(amostras) * passo_t, onda(np.arange(amostras))
+
+    n_trechos = max(pontos_maximos // 2, 1)
+    limites = np.linspace(0, amostras, n_trechos + 1).round().astype(np.int64)
+    minimos = np.empty((len(espectros), n_trechos))
+    maximos = np.empty_like(minimos)
+    descendo = np.empty(minimos.shape, dtype=bool)
+    # Trechos inteiros por bloco, com cerca de AMOSTRAS_POR_BLOCO valores
+    trechos_por_bloco = max(1, AMOSTRAS_POR_BLOCO // (len(espectros) * max(amostras // n_trechos, 1)))
+    for inicio in range(0, n_trechos, trechos_por_bloco):
+        fim = min(inicio + trechos_por_bloco, n_trechos)
+        valores = onda(np.arange(limites[inicio], limites[fim]))
+        cortes = limites[inicio:fim] - limites[inicio]
+        minimos[:, inicio:fim] = np.minimum.reduceat(valores, cortes, axis=1)
+        maximos[:, inicio:fim] = np.maximum.reduceat(valores, cortes, axis=1)
+        # Em trechos descendentes o máximo vem primeiro, como em gerar_ondas
+        descendo[:, inicio:fim] = valores[:, cortes] > valores[:, np.r_[cortes[1:], valores.shape[1]] - 1]
+    ondas = np.empty((len(espectros), 2 * n_trechos))
+    ondas[:, 0::2] = np.where(descendo, maximos, minimos)
+    ondas[:, 1::2] = np.where(descendo, minimos, maximos)
+    t = np.stack([limites[:-1], limites[1:] - 1], axis=1).ravel() * passo_t
+    return t, ondas
+
 def plotar_ondas(ax, dados, f=60, ciclos=2, titulo="Formas de Onda"):
     """
     Plota formas de onda em um eixo (ax) do Matplotlib.
     dados = lista de dicts com: {"nome": str, "valor": complex}
     """
     ax.clear() # Limpa o eixo antes de desenhar
-    t = np.linspace(0, ciclos / f, 1000)
-
-    for dado in dados:
-        nome = dado["nome"]
-        val = dado["valor"]
-        amplitude = abs(val)
-        fase = np.angle(val)
-        onda = amplitude * np.cos(2 * np.pi * f * t + fase)
-        ax.plot(t, onda, label=nome)
+    t, ondas = gerar_ondas([d["valor"] for d in dados], f, ciclos)
+    for dado, onda in zip(dados, ondas):
+        ax.plot(t, onda, label=dado["nome"])
 
     ax.set_title(titulo)
     ax.set_xlabel("Tempo (s)")
     ax.set_ylabel("Amplitude")
     ax.grid(True)
-    ax.legend()
\ No newline at end of file
+    ax.legend()
+
+class GraficoOndas:
+    """
+    Formas de onda com artistas persistentes: cada sinal tem uma Line2D criada
+    uma vez e depois só tem os dados ou a visibilidade trocados. As linhas são
+    animadas (fora do desenho normal) e pintadas por blitting sobre o fundo
+    guardado, então marcar e desmarcar sinais não redesenha a figura; isso só
+    acontece quando a escala do eixo muda.
+    """
+    def __init__(self, canvas, ax, titulo="Formas de Onda"):
+        self.canvas = canvas
+        self.ax = ax
+        self.linhas = {}  # nome -> Line2D
+        self.amplitudes = {}
+        self.visiveis = set()
+        self.legenda = None
+        self.fundo = None
+        self._parametros = None
+        self._valores = None
+        ax.clear()
+        ax.set_title(titulo)
+        ax.set_xlabel("Tempo (s)")
+        ax.set_ylabel("Amplitude")
+        ax.grid(True)
+        canvas.mpl_connect('draw_event', self._ao_desenhar)
+
+    def definir_sinais(self, nomes, valores, f=60, ciclos=2, amostras=1000, visiveis=None, frequencias=None):
+        """
+        Recalcula as formas de onda (numa única operação vetorizada) se os
+        fasores ou os parâmetros mudaram; linhas de sinais que sumiram são
+        removidas. visiveis (padrão: os já visíveis) é repassado a mostrar().
+        Com frequencias (F,), valores é o espectro (sinais, F) de cada sinal e
+        as ondas somam todas as frequências; os ciclos continuam sendo de f.
+        """
+        valores = np.asarray(valores, dtype=complex)
+        pontos_maximos = 2 * max(int(self.ax.bbox.width), 1)
+        espectro = None if frequencias is None else tuple(np.asarray(frequencias, dtype=float).tolist())
+        parametros = (tuple(nomes), f, ciclos, amostras, pontos_maximos, espectro)
+        novo_eixo_t = False
+        if parametros != self._parametros or not np.array_equal(valores, self._valores):
+            self._parametros, self._valores = parametros, valores.copy()
+            if espectro is None:
+                t, ondas = gerar_ondas(valores, f, ciclos, amostras, pontos_maximos)
+            else:
+                t, ondas = gerar_ondas_espectro(valores.reshape(len(nomes), -1), espectro, ciclos / f,
+                                                amostras, pontos_maximos)
+            for nome in set(self.linhas) - set(nomes):
+                self.linhas.pop(nome).remove()
+            for nome, onda in zip(nomes, ondas):
+                linha = self.linhas.get(nome)
+                if linha is None:
+                    linha, = self.ax.plot(t, onda, label=nome, animated=True, visible=False)
+                    self.linhas[nome] = linha
+                else:
+                    linha.set_data(t, onda)
+            if espectro is None:
+                self.amplitudes = dict(zip(nomes, np.abs(valores).tolist()))
+            else:
+                self.amplitudes = dict(zip(nomes, np.abs(ondas).max(axis=1, initial=0.0).tolist()))
+            novo_eixo_t = tuple(self.ax.get_xlim()) != (0, ciclos / f)
+            if novo_eixo_t:
+                self.ax.set_xlim(0, ciclos / f)
+        self.mostrar(self.visiveis if visiveis is None else visiveis, forcar=novo_eixo_t)
+
+    def mostrar(self, visiveis, forcar=False):
+        """
+        Mostra só os sinais em visiveis; redesenha a figura apenas se a escala
+        vertical mudou, senão pinta as linhas por blitting.
+        """
+        anteriores = self.visiveis
+        self.visiveis = set(visiveis) & set(self.linhas)
+        for nome, linha in self.linhas.items():
+            linha.set_visible(nome in self.visiveis)
+        tinha_legenda = self.legenda is not None
+        if self.visiveis != anteriores or forcar:
+            self._atualizar_legenda()
+
+        limite = 1.1 * max((self.amplitudes[n] for n in self.visiveis), default=0.0) or 1.0
+        if forcar or self.fundo is None or not np.isclose(limite, self.ax.get_ylim()[1]):
+            self.ax.set_ylim(-limite, limite)
+            self.fundo = None
+            self.canvas.draw_idle()  # O draw_event guarda o novo fundo e pinta as linhas
+            return
+        if self.visiveis >= anteriores and not tinha_legenda and self.legenda is None:
+            # Só linhas novas e sem legenda: basta pintá-las sobre o quadro atual
+            for nome in self.visiveis - anteriores:
+                self.ax.draw_artist(self.linhas[nome])
+        else:
+            self.canvas.restore_region(self.fundo)
+            self._desenhar_animados()
+        self.canvas.blit(self.ax.bbox)
+
+    def _atualizar_legenda(self):
+        if self.legenda is not None:
+            self.legenda.remove()
+            self.legenda = None
+        linhas = [l for nome, l in self.linhas.items() if nome in self.visiveis]
+        if 0 < len(linhas) <= LEGENDA_MAXIMA:
+            self.legenda = self.ax.legend(handles=linhas, loc='upper right')
+            self.legenda.set_animated(True)
+
+    def _desenhar_animados(self):
+        for nome, linha in self.linhas.items():
+            if nome in self.visiveis:
+                self.ax.draw_artist(linha)
+        if self.legenda is not None:
+            self.ax.draw_artist(self.legenda)
+
+    def _ao_desenhar(self, evento):
+        # Após cada desenho completo (inclusive redimensionamento), o fundo sem as
+        # linhas é guardado e as linhas são pintadas por cima
+        self.fundo = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._desenhar_animados()
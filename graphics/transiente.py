@@ -0,0 +1,21 @@
+# graphics/transiente.py
+
+from graphics.ondas import LEGENDA_MAXIMA
+
+def plotar_transiente(ax, tempos, dados, titulo="Análise no Tempo (.TRAN)"):
+    """
+    Plota as formas de onda da análise .TRAN em um eixo (ax) do Matplotlib.
+    dados = lista de dicts com: {"nome": str, "valor": array real indexado por tempos}
+    """
+    ax.clear()
+    for d in dados:
+        ax.plot(tempos, d["valor"], label=d["nome"], linewidth=1)
+
+    ax.set_title(titulo)
+    ax.set_xlabel("Tempo (s)")
+    ax.set_ylabel("Amplitude (V ou A)")
+    ax.grid(True)
+    if len(tempos):
+        ax.set_xlim(tempos[0], tempos[-1])
+    if 0 < len(dados) <= LEGENDA_MAXIMA:
+        ax.legend(loc='upper right')
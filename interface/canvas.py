@@ -4,14 +4,19 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
 class MplCanvas(FigureCanvas):
-    def __init__(self, width=5, height=4, dpi=100):
+    def __init__(self, width=5, height=4, dpi=100, n_eixos=1):
         self.fig = Figure(figsize=(width, height), dpi=dpi)
-        self.ax = self.fig.add_subplot(111)
+        if n_eixos > 1:
+            self.axs = list(self.fig.subplots(n_eixos, 1, sharex=True))
+        else:
+            self.axs = [self.fig.add_subplot(111)]
+        self.ax = self.axs[0]
         super().__init__(self.fig)
 
     def clear(self):
-        self.ax.clear()
-        self.draw()
+        for ax in self.axs:
+            ax.clear()
+        self.draw_idle()
 
     def set_title(self, title):
-        self.ax.set_title(title)
\ No newline at end of file
+        self.ax.set_title(title)
@@ -0,0 +1,40 @@
+# interface/inicializacao.py
+
+import sys
+import time
+
+class RelatorioInicializacao:
+    """
+    Cronômetro das fases de inicialização da aplicação, no estilo de
+    `python -X importtime`: tempo de cada fase e tempo acumulado desde o início.
+    Não importa nada pesado, para poder ser criado antes do Qt e do matplotlib.
+    """
+    def __init__(self, ativo=True):
+        self.ativo = ativo
+        self.inicio = time.perf_counter()
+        self._ultimo = self.inicio
+        self.fases = []
+
+    def marcar(self, fase):
+        agora = time.perf_counter()
+        self.fases.append((fase, agora - self._ultimo, agora - self.inicio))
+        self._ultimo = agora
+
+    def medir(self, fase, funcao, *args):
+        # Para fases fora da sequência de inicialização (ex: abas criadas sob demanda)
+        inicio = time.perf_counter()
+        resultado = funcao(*args)
+        duracao = time.perf_counter() - inicio
+        if self.ativo:
+            print(f"inicialização: {fase:<44} | {duracao * 1000:9.1f} ms (sob demanda)", file=sys.stderr)
+        return resultado
+
+    def texto(self):
+        linhas = [f"inicialização: {'fase':<44} | {'própria':>9}    | {'acumulado':>9}"]
+        for fase, duracao, acumulado in self.fases:
+            linhas.append(f"inicialização: {fase:<44} | {duracao * 1000:9.1f} ms | {acumulado * 1000:9.1f} ms")
+        return "\n".join(linhas)
+
+    def imprimir(self):
+        if self.ativo:
+            print(self.texto(), file=sys.stderr)
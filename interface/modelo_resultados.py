@@ -0,0 +1,250 @@
+# interface/modelo_resultados.py
+
+import numpy as np
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QColor
+
+# Categorias das linhas da tabela de resultados
+TOTAL_I, TOTAL_Z, NO, COMP_V, COMP_I, COMP_S, SEP_TOTAIS, SEP_NOS, SEP_COMP = range(9)
+SEPARADORES = (SEP_TOTAIS, SEP_NOS, SEP_COMP)
+
+class ModeloResultados(QAbstractTableModel):
+    """
+    Tabela de resultados lida diretamente dos arrays da solução. Cada linha é
+    só (categoria, alvo, posição no vetor de grandezas); o texto das células é
+    formatado quando a view pede as linhas visíveis. Filtro e ordenação operam
+    sobre os arrays de índices, sem criar objetos por linha.
+    """
+    CABECALHOS = ["Agrupamento", "Grandeza", "Valor Polar", "Valor Retangular",
+                  "Potência Ativa (P)", "Potência Reativa (Q)", "Fator de Potência (FP)"]
+    COR_SEPARADOR = QColor(60, 60, 60)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._nos, self._componentes = [], []
+        self._grandezas = np.empty(0, dtype=complex)
+        self._categoria = np.empty(0, dtype=np.int8)
+        self._alvo = np.empty(0, dtype=np.int64)
+        self._posicao = np.empty(0, dtype=np.int64)
+        self._visiveis = np.empty(0, dtype=np.int64)  # Linha da view -> linha do layout agrupado
+        self._filtro = ""
+        self._coluna_ordem, self._sentido_ordem = -1, Qt.SortOrder.AscendingOrder
+
+    # --- Dados ---------------------------------------------------------------
+
+    @staticmethod
+    def _vetor_grandezas(resultado):
+        # [I_total, Z_eq, tensões nodais, tensões, correntes e potências dos componentes]
+        totais = [resultado.i_total if resultado.i_total is not None else np.nan,
+                  resultado.z_eq if resultado.z_eq is not None else np.nan]
+        return np.concatenate([np.asarray(totais, dtype=complex), resultado.tensoes_nos,
+                               resultado.tensoes, resultado.correntes, resultado.potencias])
+
+    @staticmethod
+    def _totais_visiveis(resultado):
+        z_eq = resultado.z_eq
+        return resultado.i_total is not None, bool(z_eq) and not np.isinf(z_eq.real)
+
+    def definir_resultado(self, resultado):
+        self.beginResetModel()
+        self._nos, self._componentes = list(resultado.nos), list(resultado.componentes)
+        self._grandezas = self._vetor_grandezas(resultado)
+        self._totais = self._totais_visiveis(resultado)
+        N, K = len(self._nos), len(self._componentes)
+        self._nos_minusculos = np.char.lower(np.array(self._nos, dtype=str)) if N else np.empty(0, dtype=str)
+        self._comp_minusculos = np.char.lower(np.array(self._componentes, dtype=str)) if K else np.empty(0, dtype=str)
+
+        categorias, alvos, posicoes = [[SEP_TOTAIS]], [[-1]], [[-1]]
+        for visivel, categoria, posicao in zip(self._totais, (TOTAL_I, TOTAL_Z), (0, 1)):
+            if visivel:
+                categorias.append([categoria]); alvos.append([-1]); posicoes.append([posicao])
+        categorias.append([SEP_NOS]); alvos.append([-1]); posicoes.append([-1])
+        categorias.append(np.full(N, NO)); alvos.append(np.arange(N)); posicoes.append(2 + np.arange(N))
+
+        # Componentes auxiliares (Vctrl_) não aparecem; cada um dos demais vira separador + V, I, S
+        comp = np.flatnonzero(~np.char.startswith(np.array(self._componentes, dtype=str), 'Vctrl_')) if K else np.empty(0, np.int64)
+        categorias.append(np.tile([SEP_COMP, COMP_V, COMP_I, COMP_S], comp.size))
+        alvos.append(np.repeat(comp, 4))
+        base = 2 + N + comp
+        posicoes.append(np.stack([np.full(comp.size, -1), base, base + K, base + 2 * K], axis=1).ravel())
+
+        self._categoria = np.concatenate(categorias).astype(np.int8)
+        self._alvo = np.concatenate(alvos).astype(np.int64)
+        self._posicao = np.concatenate(posicoes).astype(np.int64)
+        self._visiveis = self._calcular_visiveis()
+        self.endResetModel()
+
+    def atualizar_resultado(self, resultado):
+        """
+        Troca os valores mantendo o layout (mesmos nós e componentes, como no
+        modo ao vivo) e notifica só o intervalo de linhas cujos valores mudaram.
+        Retorna o número de grandezas alteradas.
+        """
+        if (len(resultado.nos) != len(self._nos) or list(resultado.componentes) != self._componentes
+                or self._totais_visiveis(resultado) != self._totais):
+            self.definir_resultado(resultado)
+            return self._grandezas.size
+        novas = self._vetor_grandezas(resultado)
+        alteradas = ~np.isclose(novas, self._grandezas, rtol=1e-9, atol=1e-12, equal_nan=True)
+        self._grandezas = novas
+        if not alteradas.any():
+            return 0
+        if self._coluna_ordem >= 2:
+            # A ordem depende dos valores
+            self.layoutAboutToBeChanged.emit()
+            self._visiveis = self._calcular_visiveis()
+            self.layoutChanged.emit()
+        else:
+            posicoes = self._posicao[self._visiveis]
+            linhas = np.flatnonzero((posicoes >= 0) & alteradas[np.maximum(posicoes, 0)])
+            if linhas.size:
+                self.dataChanged.emit(self.index(int(linhas[0]), 0),
+                                      self.index(int(linhas[-1]), self.columnCount() - 1),
+                                      [Qt.ItemDataRole.DisplayRole])
+        return int(alteradas.sum())
+
+    def limpar(self):
+        self.beginResetModel()
+        self._categoria = self._categoria[:0]
+        self._alvo = self._alvo[:0]
+        self._posicao = self._posicao[:0]
+        self._visiveis = self._visiveis[:0]
+        self.endResetModel()
+
+    # --- Filtro e ordenação --------------------------------------------------
+
+    def definir_filtro(self, texto):
+        self._filtro = texto.strip().lower()
+        self.layoutAboutToBeChanged.emit()
+        self._visiveis = self._calcular_visiveis()
+        self.layoutChanged.emit()
+
+    def sort(self, coluna, ordem=Qt.SortOrder.AscendingOrder):
+        # coluna -1 (indicador de ordenação limpo) volta ao layout agrupado
+        self._coluna_ordem, self._sentido_ordem = coluna, ordem
+        self.layoutAboutToBeChanged.emit()
+        self._visiveis = self._calcular_visiveis()
+        self.layoutChanged.emit()
+
+    def _calcular_visiveis(self):
+        categoria, alvo = self._categoria, self._alvo
+        mascara = np.ones(categoria.size, dtype=bool)
+        if self._filtro:
+            alvo_valido = np.maximum(alvo, 0)
+            de_no = categoria == NO
+            de_comp = np.isin(categoria, [SEP_COMP, COMP_V, COMP_I, COMP_S])
+            nos = np.char.find(self._nos_minusculos, self._filtro) >= 0 if self._nos else np.zeros(1, bool)
+            comps = np.char.find(self._comp_minusculos, self._filtro) >= 0 if self._componentes else np.zeros(1, bool)
+            mascara = np.where(de_no, nos[np.minimum(alvo_valido, nos.size - 1)], mascara)
+            mascara = np.where(de_comp, comps[np.minimum(alvo_valido, comps.size - 1)], mascara)
+            mascara[np.isin(categoria, [TOTAL_I, TOTAL_Z])] = self._filtro in "circuito"
+            # Separadores de seção só aparecem se alguma linha da seção aparecer
+            mascara[categoria == SEP_TOTAIS] = mascara[np.isin(categoria, [TOTAL_I, TOTAL_Z])].any()
+            mascara[categoria == SEP_NOS] = mascara[de_no].any()
+
+        if self._coluna_ordem < 0:
+            return np.flatnonzero(mascara)
+        # Ordenado: lista plana, sem separadores
+        linhas = np.flatnonzero(mascara & ~np.isin(categoria, SEPARADORES))
+        chave = self._chave_ordenacao(self._coluna_ordem, linhas)
+        decrescente = self._sentido_ordem == Qt.SortOrder.DescendingOrder
+        if chave.dtype.kind in 'fc':
+            chave = np.where(np.isnan(chave), np.inf, -chave if decrescente else chave)  # Vazios sempre no fim
+            return linhas[np.argsort(chave, kind='stable')]
+        ordem = np.argsort(chave, kind='stable')
+        return linhas[ordem[::-1] if decrescente else ordem]
+
+    def _chave_ordenacao(self, coluna, linhas):
+        categoria, alvo = self._categoria[linhas], self._alvo[linhas]
+        if coluna <= 1:
+            nomes = np.array(["Circuito"] + self._nos + self._componentes, dtype=str)
+            indice_nome = np.where(categoria == NO, 1 + alvo, np.where(alvo >= 0, 1 + len(self._nos) + alvo, 0))
+            if coluna == 0:
+                return nomes[indice_nome]
+            # Grandeza: agrupa por tipo de grandeza e ordena pelo nome dentro dele
+            return np.char.add(categoria.astype(str), nomes[indice_nome])
+        valores = self._grandezas[self._posicao[linhas]]
+        potencia = categoria == COMP_S
+        with np.errstate(invalid='ignore', divide='ignore'):
+            chaves = {
+                2: np.abs(valores), 3: valores.real,
+                4: np.where(potencia, valores.real, np.nan), 5: np.where(potencia, valores.imag, np.nan),
+                6: np.where(potencia, np.where(np.abs(valores) > 1e-9, np.abs(valores.real) / np.abs(valores), 1.0), np.nan),
+            }
+        return chaves[coluna]
+
+    # --- Interface do QAbstractTableModel ------------------------------------
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else int(self._visiveis.size)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.CABECALHOS)
+
+    def headerData(self, secao, orientacao, papel=Qt.ItemDataRole.DisplayRole):
+        if papel == Qt.ItemDataRole.DisplayRole and orientacao == Qt.Orientation.Horizontal:
+            return self.CABECALHOS[secao]
+        return super().headerData(secao, orientacao, papel)
+
+    def eh_separador(self, linha):
+        return int(self._categoria[self._visiveis[linha]]) in SEPARADORES
+
+    def linhas_separadoras(self):
+        # Linhas visíveis que são separadores (a view as estende pela largura toda)
+        return np.flatnonzero(np.isin(self._categoria[self._visiveis], SEPARADORES))
+
+    def data(self, indice, papel=Qt.ItemDataRole.DisplayRole):
+        if not indice.isValid():
+            return None
+        linha = self._visiveis[indice.row()]
+        separador = int(self._categoria[linha]) in SEPARADORES
+        if papel == Qt.ItemDataRole.DisplayRole:
+            return self._texto(linha, indice.column())
+        if separador and papel == Qt.ItemDataRole.BackgroundRole:
+            return self.COR_SEPARADOR
+        if separador and papel == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def texto_linha(self, linha):
+        """
+        Textos das células de uma linha visível (separadores: só o título).
+        """
+        base = self._visiveis[linha]
+        if int(self._categoria[base]) in SEPARADORES:
+            return [self._texto(base, 0)]
+        return [self._texto(base, coluna) or '' for coluna in range(len(self.CABECALHOS))]
+
+    def _texto(self, linha, coluna):
+        categoria, alvo = int(self._categoria[linha]), int(self._alvo[linha])
+        if categoria in SEPARADORES:
+            if coluna != 0: return None
+            if categoria == SEP_TOTAIS: return "--- Totais do Circuito ---"
+            if categoria == SEP_NOS: return "--- Tensões Nodais ---"
+            return f"--- Componente: {self._componentes[alvo]} ---"
+
+        if coluna == 0:
+            if categoria in (TOTAL_I, TOTAL_Z): return "Circuito"
+            if categoria == NO: return f"Nó '{self._nos[alvo]}'"
+            return self._componentes[alvo]
+        if coluna == 1:
+            if categoria == TOTAL_I: return "Corrente Total"
+            if categoria == TOTAL_Z: return "Impedância Equivalente"
+            if categoria == NO: return f"Tensão V({self._nos[alvo]})"
+            nome = self._componentes[alvo]
+            return {COMP_V: f"Tensão V({nome})", COMP_I: f"Corrente I({nome})", COMP_S: f"Potência S({nome})"}[categoria]
+
+        valor = complex(self._grandezas[self._posicao[linha]])
+        if categoria != COMP_S:
+            if coluna == 2: return f"{abs(valor):.2f} ∠ {np.angle(valor, deg=True):.2f}°"
+            if coluna == 3: return f"{valor.real:.2f} + j({valor.imag:.2f})"
+            return None
+        S = valor
+        P, Q = S.real, S.imag
+        if coluna == 2: return f"{abs(S):.2f} VA ∠ {np.angle(S, deg=True):.2f}°"
+        if coluna == 3: return f"{P:.2f} + j({Q:.2f})"
+        if coluna == 4: return f"{P:.2f} W"
+        if coluna == 5: return f"{Q:.2f} VAR"
+        fp_val = P / abs(S) if abs(S) > 1e-9 else 1.0
+        fp_status = "adiantado" if Q < 0 else "atrasado"
+        return f"{abs(fp_val):.3f} {fp_status}"
@@ -1,8 +1,18 @@
 # interface/schematic_scene.py
 
+import math
+
 from PySide6.QtWidgets import QGraphicsScene
-from PySide6.QtGui import QPen, QBrush, QColor
-from PySide6.QtCore import Qt
+from PySide6.QtGui import QPen, QColor, QPolygonF, QTransform
+from PySide6.QtCore import QPointF
+
+# A grade é desenhada em blocos de PONTOS_POR_BLOCO x PONTOS_POR_BLOCO pontos:
+# um único drawPoints por bloco, com o polígono de pontos criado uma só vez
+PONTOS_POR_BLOCO = 64
+# Nível de detalhe: o passo da grade dobra enquanto os pontos ficariam mais
+# próximos que ESPACAMENTO_MINIMO_PX na tela; acima de MULTIPLICADOR_MAXIMO a grade some
+ESPACAMENTO_MINIMO_PX = 8
+MULTIPLICADOR_MAXIMO = 16
 
 class SchematicScene(QGraphicsScene):
     def __init__(self, parent=None):
@@ -10,22 +20,42 @@ class SchematicScene(QGraphicsScene):
         self.grid_size = 20
         self.setBackgroundBrush(QColor(30, 30, 30)) # Fundo escuro
 
+        self._caneta_grade = QPen(QColor(60, 60, 60))
+        self._caneta_grade.setWidth(0)  # Cosmética: 1 pixel em qualquer zoom
+        self._bloco_grade = QPolygonF([QPointF(i, j) for i in range(PONTOS_POR_BLOCO) for j in range(PONTOS_POR_BLOCO)])
+
+    def passo_grade(self, escala):
+        """
+        Espaçamento da grade (em unidades da cena) visível na escala dada, ou
+        None quando o zoom está afastado demais para desenhá-la.
+        """
+        multiplicador = 1
+        while self.grid_size * multiplicador * escala < ESPACAMENTO_MINIMO_PX:
+            multiplicador *= 2
+            if multiplicador > MULTIPLICADOR_MAXIMO:
+                return None
+        return self.grid_size * multiplicador
+
     def drawBackground(self, painter, rect):
         super().drawBackground(painter, rect)
-        
-        # Define a cor e o estilo da caneta para a grade
-        pen = QPen(QColor(60, 60, 60))
-        pen.setWidth(0)
-        painter.setPen(pen)
-
-        # Desenha os pontos da grade
-        left = int(rect.left()) - int(rect.left()) % self.grid_size
-        top = int(rect.top()) - int(rect.top()) % self.grid_size
-
-        points = []
-        for x in range(left, int(rect.right()), self.grid_size):
-            for y in range(top, int(rect.bottom()), self.grid_size):
-                points.append((x, y))
-        
-        for p in points:
-            painter.drawPoint(p[0], p[1])
\ No newline at end of file
+
+        transformacao = painter.worldTransform()
+        passo = self.passo_grade(math.hypot(transformacao.m11(), transformacao.m12()))
+        if passo is None:
+            return
+
+        painter.setPen(self._caneta_grade)
+        # Blocos alinhados a múltiplos do passo cobrindo a área exposta; cada bloco
+        # é o mesmo polígono em coordenadas unitárias, escalado e transladado
+        tamanho_bloco = passo * PONTOS_POR_BLOCO
+        x_inicial = math.floor(rect.left() / tamanho_bloco) * tamanho_bloco
+        y_inicial = math.floor(rect.top() / tamanho_bloco) * tamanho_bloco
+        x = x_inicial
+        while x < rect.right():
+            y = y_inicial
+            while y < rect.bottom():
+                painter.setWorldTransform(QTransform(passo, 0, 0, passo, x, y) * transformacao)
+                painter.drawPoints(self._bloco_grade)
+                y += tamanho_bloco
+            x += tamanho_bloco
+        painter.setWorldTransform(transformacao)
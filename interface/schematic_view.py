@@ -0,0 +1,74 @@
+# interface/schematic_view.py
+
+import time
+from collections import deque
+
+from PySide6.QtWidgets import QGraphicsView
+from PySide6.QtGui import QPainter
+from PySide6.QtCore import Qt, Signal
+
+ZOOM_MINIMO, ZOOM_MAXIMO = 0.01, 20.0
+JANELA_MEDICAO = 1.0  # Segundos considerados no cálculo de FPS
+
+class SchematicView(QGraphicsView):
+    """
+    View do esquemático com zoom pela roda do mouse, arraste para mover e um
+    medidor opcional de desempenho: com medir = True, emite periodicamente
+    desempenho(quadros por segundo, tempo médio de pintura em ms).
+    """
+    desempenho = Signal(float, float)
+
+    def __init__(self, scene=None, parent=None):
+        super().__init__(scene, parent)
+        self.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self.setDragMode(QGraphicsView.DragMode.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+        # O fundo (grade) fica num pixmap reaproveitado ao rolar a view
+        self.setCacheMode(QGraphicsView.CacheModeFlag.CacheBackground)
+        self.medir = False
+        self._quadros = deque()  # (instante, duração da pintura)
+        self._ultimo_aviso = 0.0
+
+    def wheelEvent(self, event):
+        fator = 1.15 ** (event.angleDelta().y() / 120)
+        escala = self.transform().m11()
+        fator = min(max(fator, ZOOM_MINIMO / escala), ZOOM_MAXIMO / escala)
+        self.scale(fator, fator)
+
+    def enquadrar(self, retangulo):
+        """
+        Ajusta o zoom para mostrar o retângulo; em circuitos grandes demais para o
+        zoom mínimo, mostra o seu início (canto superior esquerdo).
+        """
+        self.fitInView(retangulo, Qt.AspectRatioMode.KeepAspectRatio)
+        if self.transform().m11() >= ZOOM_MINIMO:
+            return
+        self.resetTransform()
+        self.scale(ZOOM_MINIMO, ZOOM_MINIMO)
+        largura = self.viewport().width() / ZOOM_MINIMO
+        altura = self.viewport().height() / ZOOM_MINIMO
+        self.centerOn(retangulo.left() + min(retangulo.width(), largura) / 2,
+                      retangulo.top() + min(retangulo.height(), altura) / 2)
+
+    def paintEvent(self, event):
+        if not self.medir:
+            super().paintEvent(event)
+            return
+        inicio = time.perf_counter()
+        super().paintEvent(event)
+        fim = time.perf_counter()
+        self._quadros.append((fim, fim - inicio))
+        while self._quadros and self._quadros[0][0] < fim - JANELA_MEDICAO:
+            self._quadros.popleft()
+        if fim - self._ultimo_aviso >= 0.5:
+            self._ultimo_aviso = fim
+            self.desempenho.emit(*self.estatisticas())
+
+    def estatisticas(self):
+        """
+        (quadros por segundo, tempo médio de pintura em ms) no último segundo.
+        """
+        if not self._quadros:
+            return 0.0, 0.0
+        duracoes = [d for _, d in self._quadros]
+        return len(duracoes) / JANELA_MEDICAO, 1000 * sum(duracoes) / len(duracoes)
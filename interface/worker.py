@@ -0,0 +1,73 @@
+# interface/worker.py
+
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+class AnaliseCancelada(Exception):
+    pass
+
+class SinaisAnalise(QObject):
+    # Todos os sinais levam a geração da análise, para a janela descartar resultados obsoletos
+    progresso = Signal(int, str, int)
+    concluido = Signal(int, object)
+    falhou = Signal(int, object)
+
+class TrabalhoAnalise(QRunnable):
+    """
+    Parse e solução de uma netlist fora da thread da interface. O resultado
+    (ou a exceção) volta por sinais; cancelar() interrompe a análise na próxima
+    etapa ou bloco da varredura/Monte Carlo.
+    """
+    def __init__(self, geracao, texto, frequencia, cache=None):
+        super().__init__()
+        self.geracao = geracao
+        self.texto = texto
+        self.frequencia = frequencia
+        self.cache = cache
+        self.sinais = SinaisAnalise()
+        self._cancelado = threading.Event()
+
+    def cancelar(self):
+        self._cancelado.set()
+
+    def _progresso(self, etapa, fracao):
+        if self._cancelado.is_set():
+            raise AnaliseCancelada()
+        self.sinais.progresso.emit(self.geracao, etapa, int(round(100 * fracao)))
+
+    def run(self):
+        # Importado aqui para não carregar SciPy na inicialização da interface
+        from core.analise import analisar_netlist
+        try:
+            analise = analisar_netlist(self.texto, self.frequencia, cache=self.cache, progresso=self._progresso)
+            if self._cancelado.is_set():
+                raise AnaliseCancelada()
+        except Exception as e:
+            self.sinais.falhou.emit(self.geracao, e)
+            return
+        self.sinais.concluido.emit(self.geracao, analise)
+
+class TrabalhoLayout(QRunnable):
+    """
+    Layout do esquemático fora da thread da interface; a chave identifica a
+    topologia para a janela reaproveitar o resultado.
+    """
+    def __init__(self, geracao, chave, n_nos, n1, n2, raizes):
+        super().__init__()
+        self.geracao = geracao
+        self.chave = chave
+        self.n_nos = n_nos
+        self.n1 = n1
+        self.n2 = n2
+        self.raizes = raizes
+        self.sinais = SinaisAnalise()
+
+    def run(self):
+        from schematic.layout import calcular_layout
+        try:
+            layout = calcular_layout(self.n_nos, self.n1, self.n2, self.raizes)
+        except Exception as e:
+            self.sinais.falhou.emit(self.geracao, e)
+            return
+        self.sinais.concluido.emit(self.geracao, layout)
@@ -22,26 +22,37 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
-limpar_cache_python()
+# O bytecode em __pycache__ é mantido entre execuções (inicialização rápida);
+# a limpeza só acontece sob demanda com --limpar-cache
+if "--limpar-cache" in sys.argv:
+    limpar_cache_python()
+
+from interface.inicializacao import RelatorioInicializacao
+relatorio_inicializacao = RelatorioInicializacao(
+    "--tempo-inicializacao" in sys.argv or bool(os.environ.get("CR_TEMPO_INICIALIZACAO")))
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout, QTextEdit,
-    QPushButton, QLabel, QMessageBox, QHBoxLayout, QTableWidget, QTableWidgetItem,
-    QComboBox, QLineEdit, QFormLayout, QHeaderView, QFileDialog,
-    QListWidget, QListWidgetItem, QGraphicsView, QGraphicsLineItem, QDialog,
-    QDialogButtonBox
+    QPushButton, QLabel, QMessageBox, QHBoxLayout, QTableView,
+    QComboBox, QLineEdit, QFormLayout, QFileDialog,
+    QListWidget, QListWidgetItem, QDialog,
+    QDialogButtonBox, QProgressBar, QCheckBox, QSpinBox
 )
-from PySide6.QtGui import QAction, QColor, QTextCursor, QTextCharFormat, QPainter, QPen
-from PySide6.QtCore import Qt, QPointF
+from PySide6.QtGui import QAction, QColor, QTextCursor, QTextCharFormat
+from PySide6.QtCore import Qt, QPointF, QRectF, QTimer, QThreadPool
+relatorio_inicializacao.marcar("imports PySide6")
 import numpy as np
-import csv
-from collections import defaultdict, deque
+import time
 
-from netlist_parser.parser import parse_netlist_linhas, NetlistParseError
-from core import analise
-from interface.canvas import MplCanvas
-from graphics import fasores, ondas
+# matplotlib (gráficos) e SciPy (núcleo de análise) são importados sob demanda:
+# o primeiro na criação de cada aba de gráficos, o segundo na primeira análise
+from netlist_parser.parser import NetlistParseError, diferenca_de_valores
+from netlist_parser.tabela import TabelaComponentes, CODIGO_TIPO
+from core.cache import CacheResultados
 from interface.schematic_scene import SchematicScene
+from interface.schematic_view import SchematicView
+from interface.worker import TrabalhoAnalise, TrabalhoLayout
+from interface.modelo_resultados import ModeloResultados
 from schematic.node_item import NodeItem
 from schematic.resistor_item import ResistorItem
 from schematic.vsource_item import VSourceItem
@@ -49,6 +60,7 @@ from schematic.inductor_item import InductorItem
 from schematic.capacitor_item import CapacitorItem
 from schematic.impedance_item import ImpedanceItem
 from schematic.dependent_source_item import DependentSourceItem
+relatorio_inicializacao.marcar("imports da aplicação")
 
 class HelpDialog(QDialog):
     def __init__(self, title, html_content, parent=None):
@@ -71,7 +83,10 @@ class MainWindow(QMainWindow):
         self.setGeometry(100, 100, 1200, 800)
         self._create_menu_bar()
         
-        self.componentes = []
+        self.componentes = TabelaComponentes()
+        self.circuito = None
+        self.resultado = None
+        self.modo_trifasico = None
         self.frequencia = 60
         self.tensoes = {}
         self.correntes = {}
@@ -80,6 +95,44 @@ class MainWindow(QMainWindow):
         self.z_eq = None
         self.i_total = None
         self.todos_sinais = []
+        self.harmonicos = None  # Espectro da resposta, se as fontes têm harmônicas ou outras frequências
+        self.varredura = None
+        self.diretiva_ac = None
+        self.sinais_varredura = {}
+        self.monte_carlo = None
+        self.transiente = None
+        self.sinais_transiente = {}
+        self.diretivas = {}
+        # Modo ao vivo: linhas da netlist que originaram os resultados atuais, base
+        # para detectar edições que só trocam valores
+        self.linhas_analisadas = None
+        self.texto_ao_vivo = None
+        self.ao_vivo = False
+        self.destaque_ativo = False
+        self.itens_componentes = {}  # nome -> item do esquemático
+        self.itens_nos = {}
+        # Layout do esquemático: calculado fora da thread da interface e reaproveitado
+        # enquanto a topologia (nós e ligações) não muda
+        self.chave_layout = None
+        self.layout_esquematico = None
+        self.geracao_layout = 0
+        self.trabalhos_layout = {}
+        self.etapas_esquematico = None  # Aplicação do layout em andamento (gerador)
+        self.graficos_desatualizados = set()
+        # Definir CR_CACHE_DIR também guarda os resultados em disco entre sessões
+        self.cache = CacheResultados(diretorio=os.environ.get("CR_CACHE_DIR") or None)
+        # Análises rodam fora da thread da interface; a geração identifica a mais recente
+        self.pool_analise = QThreadPool(self)
+        self.geracao = 0
+        self.trabalho = None
+        self.trabalhos_ativos = {}  # Referências mantidas até cada trabalho responder
+        self.barra_progresso = QProgressBar()
+        self.barra_progresso.setMaximumWidth(320)
+        self.btn_cancelar = QPushButton("✖ Cancelar")
+        self.btn_cancelar.clicked.connect(self.cancelar_analise)
+        self.statusBar().addPermanentWidget(self.barra_progresso)
+        self.statusBar().addPermanentWidget(self.btn_cancelar)
+        self.esconder_progresso()
 
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
@@ -88,18 +141,62 @@ class MainWindow(QMainWindow):
         self.tab_esquematico = QWidget()
         self.tab_fasores = QWidget()
         self.tab_ondas = QWidget()
+        self.tab_bode = QWidget()
+        self.tab_monte_carlo = QWidget()
+        self.tab_transiente = QWidget()
 
         self.tabs.addTab(self.tab_netlist, "📝 Netlist")
         self.tabs.addTab(self.tab_resultados, "⚡ Resultados")
         self.tabs.addTab(self.tab_esquematico, "✍️ Esquemático")
         self.tabs.addTab(self.tab_fasores, "📊 Fasores")
         self.tabs.addTab(self.tab_ondas, "🌊 Ondas")
+        self.tabs.addTab(self.tab_bode, "📉 Bode")
+        self.tabs.addTab(self.tab_monte_carlo, "🎲 Monte Carlo")
+        self.tabs.addTab(self.tab_transiente, "⏱ Transiente")
 
         self.setup_netlist_tab()
         self.setup_resultados_tab()
-        self.setup_esquematico_tab()
         self.setup_graficos_tab(self.tab_fasores, "fasores")
         self.setup_graficos_tab(self.tab_ondas, "ondas")
+        self.setup_graficos_tab(self.tab_bode, "bode", n_eixos=2)
+        self.setup_graficos_tab(self.tab_monte_carlo, "monte_carlo", titulo="Monte Carlo")
+        self.setup_graficos_tab(self.tab_transiente, "transiente")
+
+        # Esquemático e canvases do matplotlib só são criados ao abrir a aba pela primeira vez
+        self.scene = None
+        self.view = None
+        self.grafico_ondas = None
+        self.alternancia_ondas_pendente = False
+        self.grafico_fasores = None
+        self.alternancia_fasores_pendente = False
+        self.abas_sob_demanda = {
+            self.tab_esquematico: ("aba Esquemático", self.setup_esquematico_tab),
+            self.tab_fasores: ("aba Fasores (matplotlib)", lambda: self.criar_canvas("fasores")),
+            self.tab_ondas: ("aba Ondas (matplotlib)", lambda: self.criar_canvas("ondas")),
+            self.tab_bode: ("aba Bode (matplotlib)", lambda: self.criar_canvas("bode")),
+            self.tab_monte_carlo: ("aba Monte Carlo (matplotlib)", lambda: self.criar_canvas("monte_carlo")),
+            self.tab_transiente: ("aba Transiente (matplotlib)", lambda: self.criar_canvas("transiente")),
+        }
+        self.abas_graficos = {self.tab_fasores: "fasores", self.tab_ondas: "ondas", self.tab_bode: "bode",
+                              self.tab_monte_carlo: "monte_carlo", self.tab_transiente: "transiente"}
+        self.tabs.currentChanged.connect(self.criar_aba_sob_demanda)
+        self.tabs.currentChanged.connect(self.redesenhar_aba_desatualizada)
+
+        self.timer_ao_vivo = QTimer(self)
+        self.timer_ao_vivo.setSingleShot(True)
+        self.timer_ao_vivo.setInterval(300)  # Espera uma pausa na digitação
+        self.timer_ao_vivo.timeout.connect(self.reanalisar_ao_vivo)
+        self.text_edit.textChanged.connect(self.agendar_ao_vivo)
+
+    def criar_aba_sob_demanda(self, indice):
+        fase, construtor = self.abas_sob_demanda.pop(self.tabs.widget(indice), (None, None))
+        if construtor is not None:
+            relatorio_inicializacao.medir(fase, construtor)
+
+    def redesenhar_aba_desatualizada(self, indice):
+        tipo = self.abas_graficos.get(self.tabs.widget(indice))
+        if tipo in self.graficos_desatualizados:
+            self.atualizar_graficos([tipo])
 
     def _create_menu_bar(self):
         menu_bar = self.menuBar()
@@ -124,6 +221,11 @@ class MainWindow(QMainWindow):
         tema_ocean_action = QAction("Tema Oceano", self)
         tema_ocean_action.triggered.connect(lambda: self.carregar_estilo("interface/ocean_style.qss"))
         menu_view.addAction(tema_ocean_action)
+        menu_view.addSeparator()
+        self.acao_medidor = QAction("Medidor de FPS do Esquemático", self)
+        self.acao_medidor.setCheckable(True)
+        self.acao_medidor.toggled.connect(self.alternar_medidor_esquematico)
+        menu_view.addAction(self.acao_medidor)
         menu_ajuda = menu_bar.addMenu("&Ajuda")
         guia_action = QAction("&Guia de Formato da Netlist", self)
         guia_action.triggered.connect(self.mostrar_guia_netlist)
@@ -175,6 +277,46 @@ class MainWindow(QMainWindow):
         Sintaxe: <code>Vx nó+ nó- AC magnitude [fase_em_graus]</code><br>
         <i>* O parâmetro de fase é opcional e assume 0 se não for especificado.</i><br>
         Exemplo: <code>V_entrada in 0 AC 120 -90</code></p>
+        <p><b>Frequência própria e harmônicas</b><br>
+        Sintaxe: <code>Vx nó+ nó- AC magnitude [fase] [FREQ f] [HARM ordem:amplitude[@fase],...]</code><br>
+        <i>* Amplitude relativa à fundamental (em % ou fração); sem @fase, vale a fase da fundamental.</i><br>
+        Exemplo: <code>V1 a 0 AC 220 0 HARM 3:10%,5:6%</code> (ondas com todas as frequências; THD, valores eficazes e potências no botão "Harmônicos" da aba Resultados).</p>
+        <hr>
+        <h3>Tolerâncias e Monte Carlo (.MC)</h3>
+        <p>Qualquer componente aceita uma tolerância no valor: <code>R1 A B 1k tol=5%</code><br>
+        Sintaxe da análise: <code>.MC amostras [UNIFORME|NORMAL] [semente]</code><br>
+        Exemplo: <code>.MC 2000 NORMAL</code> (histogramas e percentis na aba "Monte Carlo").</p>
+        <hr>
+        <h3>Varredura em Frequência (.AC)</h3>
+        <p>Sintaxe: <code>.AC DEC|OCT|LIN pontos f_inicial f_final</code><br>
+        <i>* DEC/OCT: pontos por década/oitava; LIN: total de pontos.</i><br>
+        Exemplo: <code>.AC DEC 20 10 100k</code> (resultados na aba "Bode").</p>
+        <hr>
+        <h3>Análise no Tempo (.TRAN)</h3>
+        <p>Sintaxe: <code>.TRAN passo t_final [t_inicio] [BE|TRAP]</code> (padrão: TRAP)<br>
+        Fontes de tensão aceitam formas de onda: <code>DC valor</code>,
+        <code>SIN(vo va freq [atraso] [amortecimento] [fase])</code> e
+        <code>PULSE(v1 v2 [atraso] [subida] [descida] [largura] [período])</code>;
+        as demais fontes seguem o seu fasor na frequência de análise.<br>
+        Exemplo: <code>.TRAN 1u 10m</code> (resultados na aba "Transiente", com o circuito partindo do repouso).</p>
+        <hr>
+        <h3>Elementos Trifásicos (T)</h3>
+        <p>Cada barra vira os nós <code>barra_A</code>, <code>barra_B</code> e <code>barra_C</code>; o elemento vira
+        três componentes (<code>nome_A</code>, <code>_B</code>, <code>_C</code>; em D, <code>_AB</code>, <code>_BC</code>, <code>_CA</code>).<br>
+        Em derivação: <code>Tx V|R|L|C|Z|M barra Y|D valores... [neutro=nó]</code> (neutro padrão: nó 0)<br>
+        Em série (linhas): <code>Tx R|L|C|Z barra1 barra2 valores...</code><br>
+        <i>* V: tensão de fase [fase] (sequência positiva; em D, tensão de linha); Z: real [imag];
+        M (motor): potência ativa total, FP [tensão de fase].</i><br>
+        Exemplo: <code>TS V rede Y 127 0</code>, <code>TL Z rede motor 0.5 0.3</code>, <code>TM M motor D 5000 0.85 127</code><br>
+        Circuitos simétricos entre as fases são resolvidos por um equivalente por fase (ou pelas componentes
+        simétricas, se as fontes forem desequilibradas); o resumo de cada elemento aparece abaixo da tabela de resultados.</p>
+        <hr>
+        <h3>Subcircuitos (.SUBCKT e X)</h3>
+        <p>Definição: <code>.SUBCKT nome porta1 porta2 ...</code>, os componentes internos e <code>.ENDS [nome]</code><br>
+        Instância: <code>Xnome nó1 nó2 ... nome_do_subcircuito</code> (nós na ordem das portas)<br>
+        <i>* A definição vem antes das instâncias; o nó 0 é o terra global. Subcircuitos não têm fontes
+        independentes (fontes de 0 V servem para medir correntes) e só valem nas análises em frequência.</i><br>
+        Exemplo: <code>.SUBCKT RC a b</code> / <code>R1 a b 1k</code> / <code>C1 b 0 1u</code> / <code>.ENDS</code> / <code>X1 in out RC</code></p>
         <hr>
         <h3>Fontes Dependentes (E, G, F, H)</h3>
         <p><b>Sintaxe Geral:</b> <code>Nome nó+ nó- nó_controle+ nó_controle- ganho</code></p>
@@ -247,88 +389,368 @@ class MainWindow(QMainWindow):
             except Exception as e:
                 QMessageBox.critical(self, "Erro ao Salvar", f"Não foi possível salvar o arquivo:\n{e}")
 
-    def setup_graficos_tab(self, tab_widget, tipo_grafico):
+    def setup_graficos_tab(self, tab_widget, tipo_grafico, n_eixos=1, titulo=None):
         main_layout = QHBoxLayout(tab_widget)
         selection_panel = QVBoxLayout()
-        selection_panel.addWidget(QLabel(f"Selecione os Sinais para Plotar ({tipo_grafico.capitalize()})"))
+        selection_panel.addWidget(QLabel(f"Selecione os Sinais para Plotar ({titulo or tipo_grafico.capitalize()})"))
         list_widget = QListWidget()
         setattr(self, f"lista_sinais_{tipo_grafico}", list_widget)
         selection_panel.addWidget(list_widget)
+        if tipo_grafico == "fasores":
+            # Marcar/desmarcar só mascara setas da coleção já desenhada
+            list_widget.itemChanged.connect(self.alternar_sinais_fasores)
+            form = QFormLayout()
+            self.combo_escala_fasores = QComboBox()
+            for rotulo, escala in (("Linear (maior = 1)", "linear"), ("Por grandeza (V, I, Z)", "grandeza"),
+                                   ("Log do módulo", "log")):
+                self.combo_escala_fasores.addItem(rotulo, escala)
+            self.combo_escala_fasores.setToolTip("Em log, o raio é o número de décadas acima do piso (6 décadas abaixo do maior fasor)")
+            self.combo_escala_fasores.currentIndexChanged.connect(lambda _: self.atualizar_graficos(["fasores"]))
+            form.addRow("Escala:", self.combo_escala_fasores)
+            selection_panel.addLayout(form)
+        if tipo_grafico == "ondas":
+            # Marcar/desmarcar só troca a visibilidade das linhas (sem recalcular)
+            list_widget.itemChanged.connect(self.alternar_sinais_ondas)
+            form = QFormLayout()
+            self.spin_ciclos = QSpinBox()
+            self.spin_ciclos.setRange(1, 1000)
+            self.spin_ciclos.setValue(2)
+            self.spin_amostras = QSpinBox()
+            self.spin_amostras.setRange(100, 10_000_000)
+            self.spin_amostras.setSingleStep(1000)
+            self.spin_amostras.setValue(1000)
+            self.spin_amostras.setToolTip("Acima de ~2 pontos por pixel do gráfico, as amostras são decimadas (mínimo/máximo por trecho)")
+            for spin in (self.spin_ciclos, self.spin_amostras):
+                spin.valueChanged.connect(lambda _: self.atualizar_graficos(["ondas"]))
+            form.addRow("Ciclos:", self.spin_ciclos)
+            form.addRow("Amostras:", self.spin_amostras)
+            selection_panel.addLayout(form)
         update_button = QPushButton("📈 Atualizar Gráfico")
-        update_button.clicked.connect(self.atualizar_graficos)
+        update_button.clicked.connect(lambda: self.atualizar_graficos())
         selection_panel.addWidget(update_button)
         main_layout.addLayout(selection_panel)
-        canvas = MplCanvas()
+        # O canvas é criado em criar_canvas(), quando a aba é aberta
+        setattr(self, f"{tipo_grafico}_canvas", None)
+        setattr(self, f"layout_{tipo_grafico}", (main_layout, n_eixos))
+
+    def criar_canvas(self, tipo_grafico):
+        from interface.canvas import MplCanvas
+        main_layout, n_eixos = getattr(self, f"layout_{tipo_grafico}")
+        canvas = MplCanvas(n_eixos=n_eixos)
         setattr(self, f"{tipo_grafico}_canvas", canvas)
         main_layout.addWidget(canvas, stretch=1)
+        if tipo_grafico == "fasores":
+            from graphics.fasores import GraficoFasores
+            self.grafico_fasores = GraficoFasores(canvas, canvas.ax)
+        if tipo_grafico == "ondas":
+            from graphics.ondas import GraficoOndas
+            self.grafico_ondas = GraficoOndas(canvas, canvas.ax)
+        if self.resultado is not None:
+            self.atualizar_graficos([tipo_grafico])
 
     def setup_esquematico_tab(self):
         layout = QVBoxLayout(self.tab_esquematico)
         self.scene = SchematicScene()
-        self.view = QGraphicsView(self.scene)
-        self.view.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self.view = SchematicView(self.scene)
         layout.addWidget(self.view)
+        self.rotulo_desempenho = QLabel()
+        self.view.desempenho.connect(self.mostrar_desempenho_esquematico)
+        layout.addWidget(self.rotulo_desempenho)
+        self.alternar_medidor_esquematico(self.acao_medidor.isChecked())
+        if self.resultado is not None:
+            self.desenhar_esquematico()
+
+    def alternar_medidor_esquematico(self, ativo):
+        if self.view is None:
+            return  # Aplicado quando a aba for criada
+        self.view.medir = ativo
+        self.rotulo_desempenho.setVisible(ativo)
+        self.rotulo_desempenho.setText("Mova ou aproxime o esquemático para medir...")
+
+    def mostrar_desempenho_esquematico(self, quadros_por_segundo, tempo_pintura):
+        self.rotulo_desempenho.setText(
+            f"{quadros_por_segundo:.0f} FPS | pintura média: {tempo_pintura:.1f} ms | "
+            f"{len(self.scene.items())} itens | zoom: {self.view.transform().m11():.2f}x")
 
     def setup_netlist_tab(self):
         layout = QVBoxLayout()
         self.text_edit = QTextEdit()
         self.text_edit.setPlaceholderText("Digite sua netlist aqui.\nEx: V1 A 0 AC 100 0\n    R1 A B 5k")
         layout.addWidget(self.text_edit)
+        hbox = QHBoxLayout()
         btn_analisar = QPushButton("⚡ Analisar Circuito")
         btn_analisar.clicked.connect(self.analisar)
-        layout.addWidget(btn_analisar)
+        hbox.addWidget(btn_analisar, 1)
+        self.check_ao_vivo = QCheckBox("Ao vivo")
+        self.check_ao_vivo.setToolTip("Reanalisa automaticamente enquanto a netlist é editada")
+        self.check_ao_vivo.toggled.connect(self.agendar_ao_vivo)
+        hbox.addWidget(self.check_ao_vivo)
+        layout.addLayout(hbox)
         self.tab_netlist.setLayout(layout)
 
     def setup_resultados_tab(self):
         layout = QVBoxLayout()
-        self.tabela = QTableWidget()
+        self.filtro_resultados = QLineEdit()
+        self.filtro_resultados.setPlaceholderText("🔎 Filtrar por nó ou componente...")
+        self.filtro_resultados.setClearButtonEnabled(True)
+        layout.addWidget(self.filtro_resultados)
+        # Tabela virtual: só as linhas visíveis são formatadas
+        self.modelo_resultados = ModeloResultados(self)
+        self.filtro_resultados.textChanged.connect(self.modelo_resultados.definir_filtro)
+        self.tabela = QTableView()
+        self.tabela.setModel(self.modelo_resultados)
+        self.tabela.verticalHeader().setDefaultSectionSize(self.tabela.verticalHeader().minimumSectionSize() + 6)
+        cabecalho = self.tabela.horizontalHeader()
+        cabecalho.setResizeContentsPrecision(200)  # Largura estimada pelas primeiras linhas
+        cabecalho.setSortIndicatorClearable(True)  # Terceiro clique volta ao agrupamento
+        cabecalho.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.tabela.setSortingEnabled(True)
+        # Spans dos separadores refeitos a cada troca de linhas (resultado novo, filtro, ordenação)
+        self.modelo_resultados.modelReset.connect(self.atualizar_spans_separadores)
+        self.modelo_resultados.layoutChanged.connect(self.atualizar_spans_separadores)
+        # Com fontes em outras frequências, a tabela não é a solução na frequência de análise
+        self.aviso_frequencia = QLabel()
+        self.aviso_frequencia.setVisible(False)
+        layout.addWidget(self.aviso_frequencia)
         layout.addWidget(self.tabela)
-        btn_exportar = QPushButton("💾 Exportar para CSV")
-        btn_exportar.clicked.connect(self.exportar_para_csv)
+        self.resumo_trifasico = QLabel()
+        self.resumo_trifasico.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        self.resumo_trifasico.setVisible(False)
+        layout.addWidget(self.resumo_trifasico)
+        btn_exportar = QPushButton("💾 Exportar Resultados")
+        btn_exportar.clicked.connect(self.exportar_resultados)
+        self.btn_exportar_varredura = QPushButton("💾 Exportar Varredura .AC")
+        self.btn_exportar_varredura.clicked.connect(self.exportar_varredura)
+        self.btn_exportar_varredura.setEnabled(False)
+        self.btn_harmonicos = QPushButton("📶 Harmônicos")
+        self.btn_harmonicos.setToolTip("THD por nó, valores eficazes verdadeiros e potências com todas as frequências das fontes")
+        self.btn_harmonicos.clicked.connect(self.mostrar_harmonicos)
+        self.btn_harmonicos.setEnabled(False)
+        self.btn_exportar_transiente = QPushButton("💾 Exportar Transiente")
+        self.btn_exportar_transiente.setToolTip("Grava a análise .TRAN em resolução total (o gráfico mostra uma versão decimada)")
+        self.btn_exportar_transiente.clicked.connect(self.exportar_transiente)
+        self.btn_exportar_transiente.setEnabled(False)
         hbox = QHBoxLayout()
         hbox.addStretch(1)
+        hbox.addWidget(self.btn_harmonicos)
+        hbox.addWidget(self.btn_exportar_varredura)
+        hbox.addWidget(self.btn_exportar_transiente)
         hbox.addWidget(btn_exportar)
         layout.addLayout(hbox)
         self.tab_resultados.setLayout(layout)
 
-    def analisar(self):
+    def analisar(self, ao_vivo=False):
         self.limpar_destaque()
         texto = self.text_edit.toPlainText()
+        self.texto_ao_vivo = texto
         if not texto.strip():
-            QMessageBox.warning(self, "Aviso", "A netlist está vazia.")
+            if not ao_vivo:
+                QMessageBox.warning(self, "Aviso", "A netlist está vazia.")
             return
-        try:
-            self.componentes = parse_netlist_linhas(texto.strip().split('\n'))
-            self.tensoes, self.correntes, self.potencias, self.tensoes_comp, self.z_eq, self.i_total = analise.montar_matriz_anm(self.componentes, self.frequencia)
-            
-            self.todos_sinais = []
-            self.todos_sinais.extend([{"nome": f"V({n})", "valor": v} for n, v in self.tensoes.items() if n != '0'])
-            
-            for nome, tensao in self.tensoes_comp.items():
-                 if not nome.startswith('Vctrl_'):
-                    self.todos_sinais.append({"nome": f"V({nome})", "valor": tensao})
+        # Uma nova análise substitui a anterior: o resultado antigo será descartado
+        self.cancelar_analise()
+        self.geracao += 1
+        trabalho = TrabalhoAnalise(self.geracao, texto, self.frequencia, self.cache)
+        trabalho.sinais.progresso.connect(self.mostrar_progresso)
+        trabalho.sinais.concluido.connect(self.receber_analise)
+        trabalho.sinais.falhou.connect(self.receber_falha)
+        self.trabalho = trabalho
+        self.trabalhos_ativos[self.geracao] = trabalho
+        self.ao_vivo = ao_vivo
+        self.barra_progresso.setValue(0)
+        self.barra_progresso.setFormat("Iniciando análise...")
+        self.barra_progresso.show()
+        self.btn_cancelar.show()
+        self.pool_analise.start(trabalho)
+
+    def cancelar_analise(self):
+        if self.trabalho is not None:
+            self.trabalho.cancelar()
+            self.trabalho = None
+            self.geracao += 1
+            self.esconder_progresso()
+            self.statusBar().showMessage("Análise cancelada.")
 
-            for comp in self.componentes:
-                nome_comp = comp['nome']
-                if not nome_comp.startswith('Vctrl_') and nome_comp in self.correntes:
-                    self.todos_sinais.append({"nome": f"I({nome_comp})", "valor": self.correntes[nome_comp]})
+    def mostrar_progresso(self, geracao, etapa, percentual):
+        if geracao != self.geracao: return
+        self.barra_progresso.setFormat(f"{etapa}: %p%")
+        self.barra_progresso.setValue(percentual)
 
-            if self.i_total is not None:
-                self.todos_sinais.append({"nome": "I(Total)", "valor": self.i_total})
-            if self.z_eq is not None and not np.isinf(self.z_eq.real):
-                self.todos_sinais.append({"nome": "Z(eq)", "valor": self.z_eq})
+    def esconder_progresso(self):
+        self.barra_progresso.hide()
+        self.btn_cancelar.hide()
+
+    def definir_resultado(self, resultado, varredura, harmonicos=None):
+        self.resultado = resultado
+        self.tensoes, self.correntes, self.potencias, self.tensoes_comp, self.z_eq, self.i_total = resultado.como_tupla()
+
+        self.todos_sinais = []
+        self.todos_sinais.extend([{"nome": f"V({n})", "valor": v} for n, v in self.tensoes.items() if n != '0'])
+
+        for nome, tensao in self.tensoes_comp.items():
+             if not nome.startswith('Vctrl_'):
+                self.todos_sinais.append({"nome": f"V({nome})", "valor": tensao})
+
+        for nome_comp in self.componentes.nomes:
+            if not nome_comp.startswith('Vctrl_') and nome_comp in self.correntes:
+                self.todos_sinais.append({"nome": f"I({nome_comp})", "valor": self.correntes[nome_comp]})
+
+        if self.i_total is not None:
+            self.todos_sinais.append({"nome": "I(Total)", "valor": self.i_total})
+        if self.z_eq is not None and not np.isinf(self.z_eq.real):
+            self.todos_sinais.append({"nome": "Z(eq)", "valor": self.z_eq})
+
+        self.varredura = varredura
+        self.sinais_varredura = varredura.sinais() if varredura else {}
+        self.btn_exportar_varredura.setEnabled(varredura is not None)
+        self.harmonicos = harmonicos
+        self.btn_harmonicos.setEnabled(harmonicos is not None)
+        if harmonicos is not None:
+            outras = len(harmonicos.frequencias) - 1
+            self.aviso_frequencia.setText(
+                f"Tabela e fasores: fundamental em {resultado.frequencia:g} Hz, só com as fontes dessa frequência"
+                + (f" ({outras} outra(s) frequência(s) em 📶 Harmônicos)" if outras else ""))
+        self.aviso_frequencia.setVisible(harmonicos is not None)
+
+    def receber_analise(self, geracao, analise):
+        trabalho = self.trabalhos_ativos.pop(geracao, None)
+        if geracao != self.geracao: return  # Resultado de uma análise já substituída
+        self.trabalho = None
+        self.esconder_progresso()
+        try:
+            self.componentes = analise["componentes"]
+            self.circuito = analise["circuito"]
+            self.diretivas = analise["diretivas"]
+            self.diretiva_ac = self.diretivas.get('AC')
+            self.modo_trifasico = analise["trifasico"]
+            self.definir_resultado(analise["resultado"], analise["varredura"], analise["harmonicos"])
+            self.monte_carlo = analise["monte_carlo"]
+            self.transiente = analise["transiente"]
+            self.sinais_transiente = self.transiente.sinais() if self.transiente else {}
+            self.btn_exportar_transiente.setEnabled(self.transiente is not None)
+            self.linhas_analisadas = trabalho.texto.splitlines() if trabalho is not None else None
 
             self.atualizar_tabela()
             self.desenhar_esquematico()
             self.popular_listas_de_sinais()
             self.atualizar_graficos()
-            self.tabs.setCurrentIndex(1)
-        except NetlistParseError as e:
-            QMessageBox.critical(self, "Erro na Netlist", str(e))
-            self.destacar_linha_erro(e.line_number)
+            if not self.ao_vivo:
+                self.tabs.setCurrentIndex(1)
+            estat = self.cache.estatisticas()
+            erros_disco = f", {estat['erros_disco']} erros de gravação em disco" if estat['erros_disco'] else ""
+            avisos = "".join(f"{aviso} | " for aviso in analise["avisos"])
+            self.statusBar().showMessage(f"{avisos}Cache: {estat['acertos']} acertos, {estat['falhas']} falhas{erros_disco}")
         except Exception as e:
             QMessageBox.critical(self, "Erro na Análise", f"Ocorreu um erro inesperado:\n{e}\n\nIsso pode ser um bug. Verifique se o circuito está corretamente definido.")
 
+    def receber_falha(self, geracao, erro):
+        self.trabalhos_ativos.pop(geracao, None)
+        if geracao != self.geracao: return
+        self.trabalho = None
+        self.esconder_progresso()
+        if self.ao_vivo:
+            self.mostrar_erro_ao_vivo(erro)
+            return
+        from core.diagnostico import CircuitoSingularError
+        if isinstance(erro, NetlistParseError):
+            QMessageBox.critical(self, "Erro na Netlist", str(erro))
+            self.destacar_linha_erro(erro.line_number)
+        elif isinstance(erro, CircuitoSingularError):
+            QMessageBox.critical(self, "Circuito Inválido", str(erro))
+        else:
+            QMessageBox.critical(self, "Erro na Análise", f"Ocorreu um erro inesperado:\n{erro}\n\nIsso pode ser um bug. Verifique se o circuito está corretamente definido.")
+
+    def agendar_ao_vivo(self):
+        if self.check_ao_vivo.isChecked():
+            self.timer_ao_vivo.start()
+
+    def reanalisar_ao_vivo(self):
+        """
+        Edições que só trocam valores de componentes existentes são aplicadas
+        direto no circuito compilado (apenas as estampas afetadas mudam) e só as
+        linhas, rótulos e gráficos cujos resultados mudaram são atualizados.
+        Qualquer outra edição dispara uma análise completa em segundo plano.
+        """
+        texto = self.text_edit.toPlainText()
+        # Mudanças só de formatação (destaque de erro) também emitem textChanged
+        if not self.check_ao_vivo.isChecked() or texto == self.texto_ao_vivo:
+            return
+        self.texto_ao_vivo = texto
+        inicio = time.perf_counter()
+        linhas = texto.splitlines()
+        mudancas = None
+        # Monte Carlo e a análise no tempo dependem de todos os valores e são refeitos pela análise completa
+        if (self.trabalho is None and self.linhas_analisadas is not None
+                and 'MC' not in self.diretivas and 'TRAN' not in self.diretivas):
+            try:
+                mudancas = diferenca_de_valores(self.linhas_analisadas, linhas)
+            except NetlistParseError as e:
+                self.mostrar_erro_ao_vivo(e)
+                return
+        if mudancas is None:
+            self.analisar(ao_vivo=True)
+            return
+
+        from core.diagnostico import CircuitoSingularError
+        try:
+            if mudancas:
+                self.aplicar_mudancas_de_valores(mudancas)
+        except (CircuitoSingularError, ValueError) as e:
+            self.mostrar_erro_ao_vivo(e)
+            return
+        self.linhas_analisadas = linhas
+        self.limpar_destaque()
+        duracao = (time.perf_counter() - inicio) * 1000
+        self.statusBar().showMessage(f"Ao vivo: {len(mudancas)} componente(s) alterado(s), atualizado em {duracao:.1f} ms")
+
+    def aplicar_mudancas_de_valores(self, mudancas):
+        linhas = [self.componentes.indice[nome] for nome in mudancas]
+        valores, fases, tolerancias = zip(*mudancas.values())
+        sem_ausentes = lambda dados: [np.nan if x is None else x for x in dados]
+        circuito = self.circuito.com_valores(linhas, valores, sem_ausentes(fases), sem_ausentes(tolerancias))
+        harmonicos = None
+        if self.harmonicos is not None:
+            # Como em analisar_netlist: a tabela mostra a solução na fundamental
+            from core.harmonicos import analisar_harmonicos
+            harmonicos = analisar_harmonicos(circuito, self.frequencia)
+            resultado, self.modo_trifasico = harmonicos.resultado_fundamental, 'completo'
+        else:
+            from core.trifasico import resolver_trifasico
+            resultado, self.modo_trifasico = resolver_trifasico(circuito, self.frequencia)
+        varredura = None
+        if self.varredura is not None:
+            from core.varredura import analisar_varredura_ac
+            varredura = analisar_varredura_ac(circuito, self.varredura.frequencias)
+
+        self.circuito = circuito
+        self.componentes = circuito.componentes
+        self.definir_resultado(resultado, varredura, harmonicos)
+
+        # O modelo compara com os valores anteriores e só notifica as linhas alteradas
+        alteradas = self.modelo_resultados.atualizar_resultado(resultado)
+        self.atualizar_resumo_trifasico()
+        self.atualizar_rotulos_esquematico(mudancas)
+        tipos = set()
+        if alteradas or harmonicos is not None:
+            tipos.update(("fasores", "ondas"))
+        if varredura is not None:
+            tipos.add("bode")
+        self.atualizar_graficos_visiveis(tipos)
+
+    def mostrar_erro_ao_vivo(self, erro):
+        # No modo ao vivo o erro não interrompe a digitação com um diálogo
+        if isinstance(erro, NetlistParseError):
+            self.limpar_destaque()
+            self.destacar_linha_erro(erro.line_number)
+        self.statusBar().showMessage(f"Ao vivo: {erro}")
+
+    def atualizar_graficos_visiveis(self, tipos):
+        # Só o gráfico da aba aberta é redesenhado agora; os demais ao serem abertos
+        visivel = self.abas_graficos.get(self.tabs.currentWidget())
+        self.graficos_desatualizados.update(tipos)
+        if visivel in tipos:
+            self.atualizar_graficos([visivel])
+
     def popular_listas_de_sinais(self):
         self.lista_sinais_fasores.clear()
         self.lista_sinais_ondas.clear()
@@ -346,254 +768,370 @@ class MainWindow(QMainWindow):
                 item_onda.setCheckState(Qt.CheckState.Checked)
                 self.lista_sinais_ondas.addItem(item_onda)
 
-    def atualizar_graficos(self):
-        def get_selected_data(list_widget):
-            dados_selecionados = []
-            nomes_selecionados = [list_widget.item(i).text() for i in range(list_widget.count()) if list_widget.item(i).checkState() == Qt.CheckState.Checked]
-            for sinal in self.todos_sinais:
-                if sinal["nome"] in nomes_selecionados:
-                    dados_selecionados.append(sinal)
-            return dados_selecionados
-        
-        dados_fasores = get_selected_data(self.lista_sinais_fasores)
-        if dados_fasores:
-            fasores.plotar_fasores(self.fasores_canvas.ax, dados_fasores)
-        else:
-            self.fasores_canvas.clear()
-        self.fasores_canvas.draw()
-        
-        dados_ondas = get_selected_data(self.lista_sinais_ondas)
-        if dados_ondas:
-            ondas.plotar_ondas(self.ondas_canvas.ax, dados_ondas, f=self.frequencia)
-        else:
-            self.ondas_canvas.clear()
-        self.ondas_canvas.draw()
+        self.lista_sinais_bode.clear()
+        # Apenas as tensões nodais vêm marcadas para não poluir o diagrama
+        sinais_marcados = {f"V({no})" for no in self.varredura.nos} if self.varredura else set()
+        for nome_sinal in self.sinais_varredura:
+            item_bode = QListWidgetItem(nome_sinal)
+            item_bode.setFlags(item_bode.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            marcado = nome_sinal in sinais_marcados
+            item_bode.setCheckState(Qt.CheckState.Checked if marcado else Qt.CheckState.Unchecked)
+            self.lista_sinais_bode.addItem(item_bode)
+
+        self.lista_sinais_monte_carlo.clear()
+        sinais_mc = list(self.monte_carlo.amostras) if self.monte_carlo else []
+        # Marca apenas o primeiro sinal que de fato varia entre as amostras
+        sinal_padrao = next((s for s in sinais_mc if np.ptp(self.monte_carlo.amostras[s]) > 0), None)
+        for nome_sinal in sinais_mc:
+            item_mc = QListWidgetItem(nome_sinal)
+            item_mc.setFlags(item_mc.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item_mc.setCheckState(Qt.CheckState.Checked if nome_sinal == sinal_padrao else Qt.CheckState.Unchecked)
+            self.lista_sinais_monte_carlo.addItem(item_mc)
+
+        self.lista_sinais_transiente.clear()
+        # Como no Bode, só as tensões nodais vêm marcadas
+        sinais_marcados = {f"V({no})" for no in self.transiente.nos} if self.transiente else set()
+        for nome_sinal in self.sinais_transiente:
+            item_tran = QListWidgetItem(nome_sinal)
+            item_tran.setFlags(item_tran.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item_tran.setCheckState(Qt.CheckState.Checked if nome_sinal in sinais_marcados else Qt.CheckState.Unchecked)
+            self.lista_sinais_transiente.addItem(item_tran)
+
+    def nomes_marcados(self, list_widget):
+        return [list_widget.item(i).text() for i in range(list_widget.count())
+                if list_widget.item(i).checkState() == Qt.CheckState.Checked]
+
+    def alternar_sinais_ondas(self, item):
+        # Várias marcações no mesmo ciclo de eventos viram uma única atualização
+        if self.grafico_ondas is not None and self.grafico_ondas.linhas and not self.alternancia_ondas_pendente:
+            self.alternancia_ondas_pendente = True
+            QTimer.singleShot(0, self.mostrar_sinais_ondas)
+
+    def mostrar_sinais_ondas(self):
+        self.alternancia_ondas_pendente = False
+        self.grafico_ondas.mostrar(self.nomes_marcados(self.lista_sinais_ondas))
+
+    def alternar_sinais_fasores(self, item):
+        if self.grafico_fasores is not None and self.grafico_fasores.nomes and not self.alternancia_fasores_pendente:
+            self.alternancia_fasores_pendente = True
+            QTimer.singleShot(0, self.mostrar_sinais_fasores)
+
+    def mostrar_sinais_fasores(self):
+        self.alternancia_fasores_pendente = False
+        self.grafico_fasores.mostrar(self.nomes_marcados(self.lista_sinais_fasores))
+
+    def atualizar_graficos(self, tipos=None):
+        # tipos = gráficos a redesenhar (padrão: todos os que já têm canvas)
+        self.graficos_desatualizados.difference_update(self.abas_graficos.values() if tipos is None else tipos)
+        def redesenhar(tipo):
+            return getattr(self, f"{tipo}_canvas") is not None and (tipos is None or tipo in tipos)
+
+        if redesenhar("fasores"):
+            self.grafico_fasores.definir_fasores(
+                [s["nome"] for s in self.todos_sinais], [s["valor"] for s in self.todos_sinais],
+                visiveis=self.nomes_marcados(self.lista_sinais_fasores),
+                escala=self.combo_escala_fasores.currentData())
+
+        if redesenhar("ondas"):
+            # Mesma ordem da lista de sinais das ondas (sem as impedâncias)
+            sinais = [s for s in self.todos_sinais if not s["nome"].startswith("Z(")]
+            nomes = [s["nome"] for s in sinais]
+            valores, frequencias = [s["valor"] for s in sinais], None
+            if self.harmonicos is not None:
+                # Ondas com todas as frequências das fontes, a partir do espectro de cada sinal
+                espectros = self.harmonicos.sinais()
+                valores, frequencias = [espectros[n] for n in nomes], self.harmonicos.frequencias
+            self.grafico_ondas.definir_sinais(
+                nomes, valores, f=self.resultado.frequencia, ciclos=self.spin_ciclos.value(),
+                amostras=self.spin_amostras.value(), visiveis=self.nomes_marcados(self.lista_sinais_ondas),
+                frequencias=frequencias)
+
+        if redesenhar("bode"):
+            from graphics import bode
+            lista_bode = self.lista_sinais_bode
+            dados_bode = [{"nome": lista_bode.item(i).text(), "valor": self.sinais_varredura[lista_bode.item(i).text()]}
+                          for i in range(lista_bode.count()) if lista_bode.item(i).checkState() == Qt.CheckState.Checked]
+            if dados_bode and self.varredura is not None:
+                escala_log = self.diretiva_ac['modo'] != 'LIN'
+                bode.plotar_bode(self.bode_canvas.axs[0], self.bode_canvas.axs[1], self.varredura.frequencias, dados_bode, escala_log=escala_log)
+            else:
+                self.bode_canvas.clear()
+            self.bode_canvas.draw_idle()
+
+        if redesenhar("monte_carlo"):
+            from graphics import histograma
+            lista_mc = self.lista_sinais_monte_carlo
+            sinais_mc = [lista_mc.item(i).text() for i in range(lista_mc.count()) if lista_mc.item(i).checkState() == Qt.CheckState.Checked]
+            if sinais_mc and self.monte_carlo is not None:
+                histograma.plotar_histogramas(self.monte_carlo_canvas.ax, self.monte_carlo, sinais_mc)
+            else:
+                self.monte_carlo_canvas.clear()
+            self.monte_carlo_canvas.draw_idle()
+
+        if redesenhar("transiente"):
+            from graphics import transiente
+            sinais_tran = self.nomes_marcados(self.lista_sinais_transiente)
+            if sinais_tran and self.transiente is not None:
+                transiente.plotar_transiente(self.transiente_canvas.ax, self.transiente.tempos,
+                                             [{"nome": s, "valor": self.sinais_transiente[s]} for s in sinais_tran])
+            else:
+                self.transiente_canvas.clear()
+            self.transiente_canvas.draw_idle()
 
     def desenhar_esquematico(self):
-        self.scene.clear()
-        all_nodes = list(self.tensoes.keys())
-        if not all_nodes: return
-
-        adj = defaultdict(list)
-        for comp in self.componentes:
-            adj[comp['n1']].append(comp['n2'])
-            adj[comp['n2']].append(comp['n1'])
-
-        levels = {node: -1 for node in all_nodes}
-        max_level = 0
-        if '0' in all_nodes:
-            queue = deque([('0', 0)])
-            visited = {'0'}
-            levels['0'] = 0
-            
-            while queue:
-                curr_node, level = queue.popleft()
-                max_level = max(max_level, level)
-                for neighbor in adj[curr_node]:
-                    if neighbor not in visited:
-                        visited.add(neighbor)
-                        levels[neighbor] = level + 1
-                        queue.append((neighbor, level + 1))
-        
-        level_unconnected = max_level + 1
-        for node in all_nodes:
-            if levels[node] == -1:
-                levels[node] = level_unconnected
-                level_unconnected += 1
-        
-        nodes_by_level = defaultdict(list)
-        for node, level in levels.items():
-            nodes_by_level[level].append(node)
-
-        node_positions = {}
-        y_step, x_step = 150, 200
-        for level, nodes_in_level in sorted(nodes_by_level.items()):
-            y = -level * y_step
-            width = (len(nodes_in_level) - 1) * x_step
-            start_x = -width / 2
-            for i, node_name in enumerate(sorted(nodes_in_level)):
-                x = start_x + i * x_step
-                node_positions[node_name] = QPointF(x, y)
-                self.scene.addItem(NodeItem(node_name, x, y))
-
-        parallel_groups = defaultdict(list)
-        for comp in self.componentes:
-            key = tuple(sorted((comp['n1'], comp['n2'])))
-            parallel_groups[key].append(comp)
-        
-        wire_pen = QPen(QColor(160, 160, 160), 1)
-        
-        for node_pair, comps in parallel_groups.items():
-            n1, n2 = node_pair
-            if n1 not in node_positions or n2 not in node_positions: continue
-                
-            pos1, pos2 = node_positions[n1], node_positions[n2]
-            line_vec = pos2 - pos1
-            perp_vec = QPointF(-line_vec.y(), line_vec.x())
-            try:
-                norm_perp_vec = perp_vec / np.sqrt(perp_vec.x()**2 + perp_vec.y()**2)
-            except ZeroDivisionError:
-                norm_perp_vec = QPointF(0,0)
-
-            for i, comp in enumerate(comps):
-                offset_dist = 40
-                shift = (i - (len(comps) - 1) / 2.0) * offset_dist
-                offset = norm_perp_vec * shift
-                mid_point = ((pos1 + pos2) / 2) + offset
-                
-                comp_item = self.criar_item_componente(comp)
-                if comp_item:
-                    angle_rad = np.arctan2(line_vec.y(), line_vec.x())
-                    angle_deg = np.rad2deg(angle_rad)
-                    comp_item.setPos(mid_point)
-                    comp_item.setRotation(angle_deg)
-                    self.scene.addItem(comp_item)
-                    
-                    term1, term2 = comp_item.get_terminals()
-                    scene_term1, scene_term2 = comp_item.mapToScene(term1), comp_item.mapToScene(term2)
-                    
-                    wire1 = QGraphicsLineItem(pos1.x(), pos1.y(), scene_term1.x(), scene_term1.y())
-                    wire1.setPen(wire_pen)
-                    self.scene.addItem(wire1)
-                    
-                    wire2 = QGraphicsLineItem(pos2.x(), pos2.y(), scene_term2.x(), scene_term2.y())
-                    wire2.setPen(wire_pen)
-                    self.scene.addItem(wire2)
-
-        self.view.fitInView(self.scene.itemsBoundingRect(), Qt.AspectRatioMode.KeepAspectRatio)
+        if self.scene is None:
+            return  # Aba ainda não aberta: o desenho é feito ao criá-la
+        tabela = self.componentes
+        chave = (tuple(tabela.nos), tabela.n1.tobytes(), tabela.n2.tobytes())
+        if chave == self.chave_layout:
+            # Mesma topologia: os itens são só atualizados (ou o layout ainda está a caminho)
+            if self.layout_esquematico is not None:
+                self.aplicar_layout_esquematico()
+            return
+        self.chave_layout = chave
+        self.layout_esquematico = None
+        self.geracao_layout += 1
+        fontes = tabela.tipos == CODIGO_TIPO['V']
+        raizes = np.concatenate([tabela.n1[fontes], tabela.n2[fontes]]).tolist()
+        trabalho = TrabalhoLayout(self.geracao_layout, chave, len(tabela.nos), tabela.n1, tabela.n2, raizes)
+        trabalho.sinais.concluido.connect(self.receber_layout)
+        trabalho.sinais.falhou.connect(self.receber_falha_layout)
+        self.trabalhos_layout[self.geracao_layout] = trabalho
+        self.pool_analise.start(trabalho)
+
+    def receber_layout(self, geracao, layout):
+        self.trabalhos_layout.pop(geracao, None)
+        if geracao != self.geracao_layout: return  # Topologia já substituída
+        self.layout_esquematico = layout
+        self.aplicar_layout_esquematico(enquadrar=True)
+
+    def receber_falha_layout(self, geracao, erro):
+        self.trabalhos_layout.pop(geracao, None)
+        if geracao != self.geracao_layout: return
+        self.statusBar().showMessage(f"Falha no layout do esquemático: {erro}")
+
+    ITENS_POR_ETAPA = 1000
+
+    def aplicar_layout_esquematico(self, enquadrar=False):
+        """
+        Posiciona os itens segundo o layout atual, reaproveitando os itens de nós
+        e componentes que já estão na cena (por nome e tipo). Os itens são
+        atualizados em etapas de ITENS_POR_ETAPA, entre as quais a interface
+        continua respondendo.
+        """
+        if enquadrar and (limites := self.layout_esquematico.limites()) is not None:
+            retangulo = QRectF(*limites)
+            self.scene.setSceneRect(retangulo.adjusted(-400, -400, 400, 400))
+            self.view.enquadrar(retangulo)
+        self.etapas_esquematico = self.etapas_aplicacao_layout(self.layout_esquematico, self.componentes)
+        self.continuar_aplicacao_layout(self.etapas_esquematico)
+
+    def continuar_aplicacao_layout(self, etapas):
+        if etapas is not self.etapas_esquematico:
+            return  # Substituída por uma aplicação mais recente
+        try:
+            next(etapas)
+        except StopIteration:
+            self.etapas_esquematico = None
+            return
+        QTimer.singleShot(0, lambda: self.continuar_aplicacao_layout(etapas))
+
+    def etapas_aplicacao_layout(self, layout, tabela):
+        # Os dicionários de itens ficam sempre consistentes com a cena, mesmo que
+        # esta aplicação seja interrompida por outra
+        posicoes = layout.posicoes_nos.tolist()
+        nos_atuais = set(tabela.nos[1:])
+        for nome in [n for n in self.itens_nos if n not in nos_atuais]:
+            self.scene.removeItem(self.itens_nos.pop(nome))
+        for i, nome in enumerate(tabela.nos[1:], start=1):
+            item = self.itens_nos.get(nome)
+            if item is None:
+                self.itens_nos[nome] = item = NodeItem(nome, *posicoes[i])
+                self.scene.addItem(item)
+            else:
+                item.setPos(*posicoes[i])
+            if i % self.ITENS_POR_ETAPA == 0:
+                yield
+
+        componentes_atuais = set(tabela.nomes)
+        for nome in [n for n in self.itens_componentes if n not in componentes_atuais]:
+            self.scene.removeItem(self.itens_componentes.pop(nome))
+        centros, angulos = layout.centros.tolist(), layout.angulos.tolist()
+        pontas, terra = layout.pontas.tolist(), layout.terra.tolist()
+        for k, comp in enumerate(tabela):
+            nome, tipo = comp['nome'], comp['tipo']
+            item = self.itens_componentes.get(nome)
+            if item is not None and item.tipo != tipo:
+                self.scene.removeItem(self.itens_componentes.pop(nome))
+                item = None
+            novo = item is None
+            if novo:
+                item = self.criar_item_componente(comp)
+                if item is None: continue
+            else:
+                valor_str = f"{comp['valor']}{self.UNIDADES.get(tipo, '')}"
+                if item.value_str != valor_str:
+                    item.definir_valor(valor_str)
+            if item.geometria != (layout, k):
+                item.setPos(*centros[k])
+                item.setRotation(angulos[k])
+                (x1, y1), (x2, y2) = pontas[k]
+                item.definir_ligacoes(QPointF(x1, y1), QPointF(x2, y2), *terra[k])
+                item.geometria = (layout, k)
+            if novo:
+                self.itens_componentes[nome] = item
+                self.scene.addItem(item)  # Já posicionado: entra uma só vez no índice da cena
+            if (k + 1) % self.ITENS_POR_ETAPA == 0:
+                yield
+
+    UNIDADES = {'V': "V", 'R': "Ω", 'L': "H", 'C': "F", 'Z': "Ω"}
 
     def criar_item_componente(self, comp):
         tipo = comp['tipo']
-        valor = comp['valor']
+        valor_str = f"{comp['valor']}{self.UNIDADES.get(tipo, '')}"
 
-        if tipo == 'V': return VSourceItem(comp['nome'], f"{valor}V")
-        elif tipo == 'R': return ResistorItem(comp['nome'], f"{valor}Ω")
-        elif tipo == 'L': return InductorItem(comp['nome'], f"{valor}H")
-        elif tipo == 'C': return CapacitorItem(comp['nome'], f"{valor}F")
-        elif tipo == 'Z': return ImpedanceItem(comp['nome'], f"{valor}Ω")
+        if tipo == 'V': item = VSourceItem(comp['nome'], valor_str)
+        elif tipo == 'R': item = ResistorItem(comp['nome'], valor_str)
+        elif tipo == 'L': item = InductorItem(comp['nome'], valor_str)
+        elif tipo == 'C': item = CapacitorItem(comp['nome'], valor_str)
+        elif tipo == 'Z': item = ImpedanceItem(comp['nome'], valor_str)
         elif tipo in ['E', 'G', 'F', 'H']:
-            return DependentSourceItem(comp['nome'], f"{valor}", source_type=tipo)
-        return None
+            item = DependentSourceItem(comp['nome'], valor_str, source_type=tipo)
+        else:
+            return None
+        item.tipo = tipo
+        item.geometria = None  # (layout, índice) da última posição aplicada
+        item.definir_valor(valor_str)
+        return item
+
+    def atualizar_rotulos_esquematico(self, nomes):
+        for nome in nomes:
+            item = self.itens_componentes.get(nome)
+            if item is None: continue
+            comp = self.componentes.componente(nome)
+            item.definir_valor(f"{comp['valor']}{self.UNIDADES.get(comp['tipo'], '')}")
 
     def atualizar_tabela(self):
-        self.tabela.clear()
-        self.tabela.setRowCount(0)
-        self.tabela.setColumnCount(7)
-        self.tabela.setHorizontalHeaderLabels([
-            "Agrupamento", "Grandeza", "Valor Polar", "Valor Retangular", 
-            "Potência Ativa (P)", "Potência Reativa (Q)", "Fator de Potência (FP)"
-        ])
-        
-        def add_separator_row(text):
-            row = self.tabela.rowCount()
-            self.tabela.insertRow(row)
-            item = QTableWidgetItem(text)
-            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            item.setBackground(QColor(60, 60, 60))
-            self.tabela.setItem(row, 0, item)
-            self.tabela.setSpan(row, 0, 1, self.tabela.columnCount())
-        
-        def add_data_row(agrupamento, grandeza, valor_complexo):
-            row = self.tabela.rowCount()
-            self.tabela.insertRow(row)
-            self.tabela.setItem(row, 0, QTableWidgetItem(agrupamento))
-            self.tabela.setItem(row, 1, QTableWidgetItem(grandeza))
-            self.tabela.setItem(row, 2, QTableWidgetItem(f"{abs(valor_complexo):.2f} ∠ {np.angle(valor_complexo, deg=True):.2f}°"))
-            self.tabela.setItem(row, 3, QTableWidgetItem(f"{valor_complexo.real:.2f} + j({valor_complexo.imag:.2f})"))
-
-        def add_power_row(agrupamento, grandeza, S):
-            row = self.tabela.rowCount()
-            self.tabela.insertRow(row)
-            P, Q = S.real, S.imag
-            fp_val = P / abs(S) if abs(S) > 1e-9 else 1.0
-            fp_status = "adiantado" if Q < 0 else "atrasado"
-            self.tabela.setItem(row, 0, QTableWidgetItem(agrupamento))
-            self.tabela.setItem(row, 1, QTableWidgetItem(grandeza))
-            self.tabela.setItem(row, 2, QTableWidgetItem(f"{abs(S):.2f} VA ∠ {np.angle(S, deg=True):.2f}°"))
-            self.tabela.setItem(row, 3, QTableWidgetItem(f"{P:.2f} + j({Q:.2f})"))
-            self.tabela.setItem(row, 4, QTableWidgetItem(f"{P:.2f} W"))
-            self.tabela.setItem(row, 5, QTableWidgetItem(f"{Q:.2f} VAR"))
-            self.tabela.setItem(row, 6, QTableWidgetItem(f"{abs(fp_val):.3f} {fp_status}"))
-        
-        add_separator_row("--- Totais do Circuito ---")
-        if self.i_total is not None:
-            add_data_row("Circuito", "Corrente Total", self.i_total)
-        if self.z_eq and not np.isinf(self.z_eq.real):
-            add_data_row("Circuito", "Impedância Equivalente", self.z_eq)
-
-        add_separator_row("--- Tensões Nodais ---")
-        for nome, valor in sorted(self.tensoes.items()):
-            if nome == '0': continue
-            add_data_row(f"Nó '{nome}'", f"Tensão V({nome})", valor)
-
-        for comp in self.componentes:
-            nome = comp['nome']
-            if nome.startswith('Vctrl_'): continue
-            add_separator_row(f"--- Componente: {nome} ---")
-            
-            if nome in self.tensoes_comp:
-                add_data_row(nome, f"Tensão V({nome})", self.tensoes_comp[nome])
-            if nome in self.correntes:
-                add_data_row(nome, f"Corrente I({nome})", self.correntes[nome])
-            if nome in self.potencias:
-                add_power_row(nome, f"Potência S({nome})", self.potencias[nome])
-
-        motores_agrupados = defaultdict(list)
-        for comp in self.componentes:
-            if comp['nome'].startswith('Z_M'):
-                partes = comp['nome'].split('_')
-                nome_motor = partes[1]
-                if nome_motor not in motores_agrupados:
-                    motores_agrupados[nome_motor] = []
-                motores_agrupados[nome_motor].append(comp)
-        
-        for nome_motor, comps_motor in motores_agrupados.items():
-            if len(comps_motor) == 3:
-                self.adicionar_resumo_trifasico_agrupado(nome_motor, comps_motor)
+        self.modelo_resultados.definir_resultado(self.resultado)
 
+        self.atualizar_resumo_trifasico()
         self.tabela.resizeColumnsToContents()
-        self.tabela.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
 
-    def adicionar_resumo_trifasico_agrupado(self, nome_motor, comps_motor):
-        pass
+    def atualizar_spans_separadores(self):
+        self.tabela.clearSpans()
+        colunas = self.modelo_resultados.columnCount()
+        for linha in self.modelo_resultados.linhas_separadoras().tolist():
+            self.tabela.setSpan(linha, 0, 1, colunas)
+
+    def atualizar_resumo_trifasico(self):
+        from core.trifasico import grupos_trifasicos
+        self.resumos_trifasicos = []
+        for nome, linhas in grupos_trifasicos(self.circuito).items():
+            self.adicionar_resumo_trifasico_agrupado(nome, linhas)
+        if self.resumos_trifasicos:
+            modos = {"por fase": "equivalente por fase", "sequencias": "componentes simétricas", "completo": "ANM completa"}
+            self.resumos_trifasicos.insert(0, f"<b>Trifásicos</b> (solução: {modos[self.modo_trifasico]})")
+        self.resumo_trifasico.setText("<br>".join(self.resumos_trifasicos))
+        self.resumo_trifasico.setVisible(bool(self.resumos_trifasicos))
 
-    def exportar_para_csv(self):
-        if self.tabela.rowCount() == 0:
-            QMessageBox.warning(self, "Aviso", "Não há dados na tabela para exportar.")
+    def adicionar_resumo_trifasico_agrupado(self, nome, linhas):
+        # Potência total das três fases, corrente média e desequilíbrio (maior desvio da média)
+        S = complex(self.resultado.potencias[linhas].sum())
+        correntes = np.abs(self.resultado.correntes[linhas])
+        media = correntes.mean()
+        desequilibrio = 100 * np.abs(correntes - media).max() / media if media > 0 else 0.0
+        fp = f"{abs(S.real) / abs(S):.3f}" if abs(S) > 0 else "—"
+        self.resumos_trifasicos.append(
+            f"{nome}: P = {S.real:.2f} W | Q = {S.imag:.2f} var | FP = {fp} | "
+            f"I média = {media:.3f} A | desequilíbrio de corrente = {desequilibrio:.1f} %")
+
+    FILTROS_EXPORTACAO = {"CSV numérico (*.csv)": "csv", "JSON Lines (*.jsonl)": "jsonl", "NumPy (*.npz)": "npz"}
+
+    def escolher_arquivo_exportacao(self, titulo):
+        from core.exportacao import formato_do_caminho
+        caminho, filtro = QFileDialog.getSaveFileName(self, titulo, "", ";;".join(self.FILTROS_EXPORTACAO))
+        if not caminho:
+            return None, None
+        # A extensão digitada prevalece; sem extensão vale o filtro escolhido
+        formato = formato_do_caminho(caminho, self.FILTROS_EXPORTACAO.get(filtro, "csv"))
+        if not os.path.splitext(caminho)[1]:
+            caminho += f".{formato}"
+        return caminho, formato
+
+    def exportar_resultados(self):
+        if self.resultado is None:
+            QMessageBox.warning(self, "Aviso", "Não há resultados para exportar.")
             return
-        caminho_arquivo, _ = QFileDialog.getSaveFileName(self, "Salvar Resultados", "", "CSV Files (*.csv);;All Files (*)")
-        if not caminho_arquivo:
+        caminho, formato = self.escolher_arquivo_exportacao("Salvar Resultados")
+        if caminho:
+            from core.exportacao import exportar_resultado
+            self.exportar(lambda: exportar_resultado(self.resultado, caminho, formato), caminho)
+
+    def exportar_varredura(self):
+        if self.varredura is None:
+            QMessageBox.warning(self, "Aviso", "A netlist não tem uma varredura .AC para exportar.")
             return
+        caminho, formato = self.escolher_arquivo_exportacao("Salvar Varredura .AC")
+        if caminho:
+            from core.exportacao import exportar_varredura
+            self.exportar(lambda: exportar_varredura(self.varredura, caminho, formato), caminho)
+
+    def mostrar_harmonicos(self):
+        if self.harmonicos is None:
+            return
+        resumo = self.harmonicos.resumo()
+        porcentagem = lambda x: "—" if np.isnan(x) else f"{100 * x:.2f} %"
+        fator = lambda x: "—" if np.isnan(x) else f"{x:.3f}"
+        frequencias = ", ".join(f"{f:g}" for f in self.harmonicos.frequencias)
+        linhas_nos = "".join(f"<tr><td>{no}</td><td>{r['v_rms']:.4g}</td><td>{porcentagem(r['thd'])}</td></tr>"
+                             for no, r in resumo["nos"].items())
+        linhas_comp = "".join(
+            f"<tr><td>{nome}</td><td>{r['v_rms']:.4g}</td><td>{r['i_rms']:.4g}</td><td>{porcentagem(r['thd_i'])}</td>"
+            f"<td>{r['p']:.4g}</td><td>{r['s']:.4g}</td><td>{fator(r['fp'])}</td></tr>"
+            for nome, r in resumo["componentes"].items() if not nome.startswith('Vctrl_'))
+        html = f"""
+        <p>Frequências das fontes (Hz): {frequencias}<br>Fundamental: {self.harmonicos.fundamental:g} Hz</p>
+        <h3>Nós</h3>
+        <table border="1" cellpadding="4"><tr><th>Nó</th><th>V eficaz</th><th>THD</th></tr>{linhas_nos}</table>
+        <h3>Componentes</h3>
+        <table border="1" cellpadding="4"><tr><th>Componente</th><th>V eficaz</th><th>I eficaz</th><th>THD (I)</th>
+        <th>P (W)</th><th>S (VA)</th><th>FP</th></tr>{linhas_comp}</table>
+        """
+        HelpDialog("Análise Harmônica", html, self).exec()
+
+    def exportar_transiente(self):
+        if self.transiente is None:
+            QMessageBox.warning(self, "Aviso", "A netlist não tem uma análise .TRAN para exportar.")
+            return
+        caminho, formato = self.escolher_arquivo_exportacao("Salvar Análise no Tempo (.TRAN)")
+        if caminho:
+            from core.exportacao import exportar_transiente
+            self.exportar(lambda: exportar_transiente(self.transiente, caminho, formato), caminho)
+
+    def exportar(self, gravar, caminho):
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
         try:
-            with open(caminho_arquivo, 'w', newline='', encoding='utf-8') as arquivo_csv:
-                writer = csv.writer(arquivo_csv, delimiter=';')
-                headers = [self.tabela.horizontalHeaderItem(i).text() for i in range(self.tabela.columnCount())]
-                writer.writerow(headers)
-                for row in range(self.tabela.rowCount()):
-                    linha_dados = []
-                    is_separator = self.tabela.columnSpan(row, 0) > 1
-                    if is_separator:
-                        item = self.tabela.item(row, 0)
-                        linha_dados.append(item.text() if item else '')
-                    else:
-                        for col in range(self.tabela.columnCount()):
-                            item = self.tabela.item(row, col)
-                            linha_dados.append(item.text() if item else '')
-                    writer.writerow(linha_dados)
-            QMessageBox.information(self, "Sucesso", f"Resultados exportados para:\n{caminho_arquivo}")
+            gravar()
         except Exception as e:
+            QApplication.restoreOverrideCursor()
             QMessageBox.critical(self, "Erro de Exportação", f"Não foi possível salvar o arquivo:\n{e}")
+            return
+        QApplication.restoreOverrideCursor()
+        QMessageBox.information(self, "Sucesso", f"Resultados exportados para:\n{caminho}")
 
     def limpar_destaque(self):
+        if not self.destaque_ativo:
+            return
+        self.destaque_ativo = False
         fmt = QTextCharFormat()
         fmt.clearBackground()
-        cursor = self.text_edit.textCursor()
+        # Cursor próprio: o cursor de edição do usuário não sai do lugar (modo ao vivo)
+        cursor = QTextCursor(self.text_edit.document())
         cursor.select(QTextCursor.SelectionType.Document)
         cursor.setCharFormat(fmt)
-        cursor.clearSelection()
-        self.text_edit.setTextCursor(cursor)
 
     def destacar_linha_erro(self, linha_numero):
+        self.destaque_ativo = True
         fmt = QTextCharFormat()
         fmt.setBackground(QColor(139, 0, 0, 150))
         cursor = self.text_edit.textCursor()
@@ -604,16 +1142,23 @@ class MainWindow(QMainWindow):
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
-    
-    limpar_cache_python()
-    
+    relatorio_inicializacao.marcar("QApplication")
+
     caminho_estilo_inicial = resource_path("interface/style.qss")
     try:
         with open(caminho_estilo_inicial, "r") as f:
             app.setStyleSheet(f.read())
     except FileNotFoundError:
         print(f"Arquivo de estilo inicial não encontrado: {caminho_estilo_inicial}. Usando estilo padrão.")
-        
+    relatorio_inicializacao.marcar("folha de estilo")
+
     janela = MainWindow()
+    relatorio_inicializacao.marcar("MainWindow")
     janela.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    relatorio_inicializacao.marcar("show()")
+
+    def primeiro_ciclo_de_eventos():
+        relatorio_inicializacao.marcar("primeiro ciclo de eventos (janela visível)")
+        relatorio_inicializacao.imprimir()
+    QTimer.singleShot(0, primeiro_ciclo_de_eventos)
+    sys.exit(app.exec())
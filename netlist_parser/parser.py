@@ -1,7 +1,12 @@
 # netlist_parser/parser.py
 
+import gc
 import math
+import os
 import re
+from functools import lru_cache
+
+from netlist_parser.tabela import CAMPOS, Subcircuito, TabelaComponentes
 
 class NetlistParseError(Exception):
     def __init__(self, message, line_number):
@@ -9,14 +14,31 @@ class NetlistParseError(Exception):
         self.line_number = line_number
         super().__init__(f"Linha {line_number}: {message}")
 
+_UNIDADES = {'p': 1e-12, 'n': 1e-9, 'u': 1e-6, 'm': 1e-3, 'k': 1e3, 'meg': 1e6, 'g': 1e9, 't': 1e12}
+_RE_VALOR = re.compile(r"^(-?\d+\.?\d*)([a-z]+)?$")
+_FONTES_CONTROLADAS_TENSAO = frozenset('EG')
+_FONTES_CONTROLADAS_CORRENTE = frozenset('FH')
+_TIPOS_CONHECIDOS = frozenset('RLCZVEFGH')
+_RE_FORMA_ONDA = re.compile(r"^(SIN|PULSE)\s*\((.*)\)$", re.IGNORECASE)
+# Parâmetros (mínimo, máximo) das formas de onda das fontes na análise .TRAN
+_PARAMETROS_FORMA = {'SIN': (3, 6), 'PULSE': (2, 7)}
+METODOS_TRAN = ('BE', 'TRAP')
+# Opções das fontes AC após o valor e a fase (frequência própria e harmônicas)
+_OPCOES_ESPECTRO = ('FREQ', 'HARM')
+# Elementos trifásicos (T): fases dos nós e componentes expandidos e ligações aceitas
+FASES = ('A', 'B', 'C')
+_LIGACOES = {'Y': 'Y', 'D': 'D', 'Δ': 'D'}
+_TIPOS_TRIFASICOS = frozenset('VRLCZM')
+
+# Netlists geradas por ferramentas repetem poucos valores distintos milhões de vezes
+@lru_cache(maxsize=4096)
 def parse_valor_com_unidade(valor_str):
     valor_str = valor_str.lower()
-    unidades = {'p': 1e-12, 'n': 1e-9, 'u': 1e-6, 'm': 1e-3, 'k': 1e3, 'meg': 1e6, 'g': 1e9, 't': 1e12}
-    match = re.match(r"^(-?\d+\.?\d*)([a-z]+)?$", valor_str)
+    match = _RE_VALOR.match(valor_str)
     if match:
         valor_numerico, unidade = match.groups()
         if unidade:
-            multiplicador = unidades.get(unidade)
+            multiplicador = _UNIDADES.get(unidade)
             if multiplicador:
                 return float(valor_numerico) * multiplicador
             else:
@@ -24,70 +46,418 @@ def parse_valor_com_unidade(valor_str):
         return float(valor_numerico)
     raise ValueError(f"Formato de número inválido: '{valor_str}'")
 
-def parse_netlist_linhas(linhas):
-    componentes = []
-    for i, linha in enumerate(linhas):
-        linha_numero = i + 1
+def parse_tolerancia(tol_str):
+    if tol_str.endswith('%'):
+        tolerancia = parse_valor_com_unidade(tol_str[:-1]) / 100
+    else:
+        tolerancia = parse_valor_com_unidade(tol_str)
+    if not 0 <= tolerancia < 1:
+        raise ValueError(f"Tolerância fora do intervalo [0, 100%): '{tol_str}'")
+    return tolerancia
+
+def parse_diretiva(tokens, linha_numero):
+    nome = tokens[0].upper()
+    try:
+        if nome == '.AC':
+            if len(tokens) != 5: raise NetlistParseError("Diretiva .AC requer 4 parâmetros (.AC DEC|OCT|LIN pontos f_inicial f_final).", linha_numero)
+            modo = tokens[1].upper()
+            if modo not in ['DEC', 'OCT', 'LIN']: raise NetlistParseError(f"Modo de varredura desconhecido: '{tokens[1]}' (use DEC, OCT ou LIN).", linha_numero)
+            pontos = int(tokens[2])
+            f_inicial = parse_valor_com_unidade(tokens[3])
+            f_final = parse_valor_com_unidade(tokens[4])
+            if pontos < 1: raise NetlistParseError("A varredura .AC requer ao menos 1 ponto.", linha_numero)
+            if f_inicial <= 0 or f_final < f_inicial: raise NetlistParseError("Faixa de frequência inválida: requer 0 < f_inicial <= f_final.", linha_numero)
+            return 'AC', {"modo": modo, "pontos": pontos, "f_inicial": f_inicial, "f_final": f_final}
+        if nome == '.MC':
+            if not 2 <= len(tokens) <= 4: raise NetlistParseError("Diretiva .MC requer: .MC amostras [UNIFORME|NORMAL] [semente].", linha_numero)
+            amostras = int(tokens[1])
+            distribuicao = tokens[2].upper() if len(tokens) > 2 else 'UNIFORME'
+            if amostras < 1: raise NetlistParseError("A análise .MC requer ao menos 1 amostra.", linha_numero)
+            if distribuicao not in ['UNIFORME', 'NORMAL']: raise NetlistParseError(f"Distribuição desconhecida: '{tokens[2]}' (use UNIFORME ou NORMAL).", linha_numero)
+            semente = int(tokens[3]) if len(tokens) > 3 else None
+            return 'MC', {"amostras": amostras, "distribuicao": distribuicao, "semente": semente}
+        if nome == '.TRAN':
+            if not 3 <= len(tokens) <= 5: raise NetlistParseError("Diretiva .TRAN requer: .TRAN passo t_final [t_inicio] [BE|TRAP].", linha_numero)
+            metodo = 'TRAP'
+            if tokens[-1].upper() in METODOS_TRAN:
+                metodo = tokens[-1].upper()
+                tokens = tokens[:-1]
+            if len(tokens) > 4: raise NetlistParseError(f"Método de integração desconhecido: '{tokens[-1]}' (use BE ou TRAP).", linha_numero)
+            passo = parse_valor_com_unidade(tokens[1])
+            t_final = parse_valor_com_unidade(tokens[2])
+            t_inicio = parse_valor_com_unidade(tokens[3]) if len(tokens) > 3 else 0.0
+            if passo <= 0 or t_final < passo: raise NetlistParseError("Passo de tempo inválido: requer 0 < passo <= t_final.", linha_numero)
+            if not 0 <= t_inicio < t_final: raise NetlistParseError("Início da gravação inválido: requer 0 <= t_inicio < t_final.", linha_numero)
+            return 'TRAN', {"passo": passo, "t_final": t_final, "t_inicio": t_inicio, "metodo": metodo}
+    except ValueError as e:
+        raise NetlistParseError(f"Erro ao processar valor: {e}", linha_numero)
+    raise NetlistParseError(f"Diretiva desconhecida: '{tokens[0]}'.", linha_numero)
+
+def parse_forma_onda(tokens):
+    """
+    Forma de onda de uma fonte de tensão para a análise .TRAN, a partir dos
+    tokens após os nós: DC v, SIN(vo va freq [td] [theta] [fase]) ou
+    PULSE(v1 v2 [td] [tr] [tf] [pw] [per]). Retorna (tipo, parâmetros) ou None
+    se não houver forma de onda.
+    """
+    if tokens[0].upper() == 'DC':
+        if len(tokens) != 2: raise ValueError("Fonte DC requer um único valor (DC v).")
+        return 'DC', (parse_valor_com_unidade(tokens[1]),)
+    match = _RE_FORMA_ONDA.match(" ".join(tokens))
+    if not match:
+        return None
+    tipo = match.group(1).upper()
+    parametros = tuple(parse_valor_com_unidade(p) for p in re.split(r"[\s,]+", match.group(2).strip()) if p)
+    minimo, maximo = _PARAMETROS_FORMA[tipo]
+    if not minimo <= len(parametros) <= maximo:
+        raise ValueError(f"Fonte {tipo} requer de {minimo} a {maximo} parâmetros.")
+    return tipo, parametros
+
+def parse_harmonica(texto):
+    """
+    Uma harmônica 'ordem:amplitude[@fase]' do espectro de uma fonte AC, com a
+    amplitude relativa à fundamental (em % ou fração) e a fase em graus
+    (ausente: a da fundamental). Retorna (ordem, fracao, fase ou None).
+    """
+    ordem, separador, resto = texto.partition(':')
+    if not separador: raise ValueError(f"Harmônica inválida: '{texto}' (use ordem:amplitude[@fase], ex.: 3:10%).")
+    amplitude, _, fase = resto.partition('@')
+    ordem = parse_valor_com_unidade(ordem)
+    fracao = parse_valor_com_unidade(amplitude[:-1]) / 100 if amplitude.endswith('%') else parse_valor_com_unidade(amplitude)
+    if ordem <= 0 or fracao < 0: raise ValueError(f"Harmônica inválida: '{texto}' (ordem > 0 e amplitude >= 0).")
+    return ordem, fracao, parse_valor_com_unidade(fase) if fase else None
+
+def parse_espectro(tokens):
+    """
+    Opções de uma fonte AC após 'AC valor [fase]': FREQ f (frequência própria
+    da fonte; padrão: a de análise) e HARM h:amp[@fase],... (harmônicas; ver
+    parse_harmonica). Retorna ('AC', (frequencia ou None, harmonicas)) ou None
+    sem opções.
+    """
+    frequencia, harmonicas = None, ()
+    i = 0
+    while i < len(tokens):
+        opcao = tokens[i].upper()
+        if opcao not in _OPCOES_ESPECTRO or i + 1 == len(tokens):
+            raise ValueError(f"Opção inválida na fonte AC: '{tokens[i]}' (use FREQ f e/ou HARM h:amp,...).")
+        if opcao == 'FREQ':
+            frequencia = parse_valor_com_unidade(tokens[i + 1])
+            if frequencia <= 0: raise ValueError("A frequência da fonte deve ser positiva.")
+            i += 2
+            continue
+        # As harmônicas vão até a próxima opção, separadas por vírgulas e/ou espaços
+        fim = i + 1
+        while fim < len(tokens) and tokens[fim].upper() not in _OPCOES_ESPECTRO:
+            fim += 1
+        harmonicas = tuple(parse_harmonica(item) for item in re.split(r"[\s,]+", " ".join(tokens[i + 1:fim])) if item)
+        i = fim
+    if frequencia is None and not harmonicas:
+        return None
+    return 'AC', (frequencia, harmonicas)
+
+def _parse_registro(tokens, linha_numero, com_parametros=True):
+    # Registro compacto na ordem de tabela.CAMPOS; campos ausentes ficam como None
+    tolerancia = None
+    if com_parametros and any(t[:4].lower() == "tol=" for t in tokens):
+        try:
+            tolerancia = parse_tolerancia([t for t in tokens if t[:4].lower() == "tol="][-1][4:])
+        except ValueError as e:
+            raise NetlistParseError(f"Tolerância inválida: {e}", linha_numero)
+        tokens = [t for t in tokens if t[:4].lower() != "tol="]
+
+    if len(tokens) < 4:
+        raise NetlistParseError("Linha incompleta.", linha_numero)
+
+    nome_comp = tokens[0]
+    tipo_comp = nome_comp[0].upper()
+    if tipo_comp not in _TIPOS_CONHECIDOS:
+        raise NetlistParseError(f"Tipo de componente desconhecido: '{nome_comp[0]}'.", linha_numero)
+    
+    try:
+        forma = parse_forma_onda(tokens[3:]) if tipo_comp == "V" else None
+        if tipo_comp in _FONTES_CONTROLADAS_TENSAO: # Fontes controladas por TENSÃO
+            if len(tokens) != 6: raise NetlistParseError(f"Fonte {tipo_comp} requer 6 tokens (nome n+ n- nc+ nc- ganho).", linha_numero)
+            ganho = parse_valor_com_unidade(tokens[5])
+            return (tipo_comp, nome_comp, tokens[1], tokens[2], tokens[3], tokens[4], None, ganho, None, tolerancia, None)
+
+        elif tipo_comp in _FONTES_CONTROLADAS_CORRENTE: # Fontes controladas por CORRENTE
+            if len(tokens) != 5: raise NetlistParseError(f"Fonte {tipo_comp} requer 5 tokens (nome n+ n- V_controle ganho).", linha_numero)
+            comp_controle = tokens[3] # Nome da fonte de tensão (V) de controle
+            ganho = parse_valor_com_unidade(tokens[4])
+            return (tipo_comp, nome_comp, tokens[1], tokens[2], None, None, comp_controle, ganho, None, tolerancia, None)
+
+        elif tokens[3].upper() == "AC":
+            if len(tokens) < 5: raise NetlistParseError("Fonte AC requer um valor de magnitude.", linha_numero)
+            valor = parse_valor_com_unidade(tokens[4])
+            opcoes = tokens[5:]
+            fase = 0.0
+            if opcoes and opcoes[0].upper() not in _OPCOES_ESPECTRO:
+                fase = parse_valor_com_unidade(opcoes[0])
+                opcoes = opcoes[1:]
+            return ("V", nome_comp, tokens[1], tokens[2], None, None, None, valor, fase, tolerancia, parse_espectro(opcoes))
+
+        elif forma is not None:
+            # Na análise fasorial: DC vale v; SIN, a senoide VA∠(fase − 90°); PULSE, zero
+            tipo_forma, p = forma
+            if tipo_forma == 'DC':
+                valor, fase = p[0], None
+            elif tipo_forma == 'SIN':
+                valor, fase = p[1], (p[5] if len(p) > 5 else 0.0) - 90.0
+            else:
+                valor, fase = 0.0, None
+            return ("V", nome_comp, tokens[1], tokens[2], None, None, None, valor, fase, tolerancia, forma)
+
+        else: # Componentes passivos
+            if len(tokens) > 4:
+                real_part = parse_valor_com_unidade(tokens[3])
+                imag_part = parse_valor_com_unidade(tokens[4])
+                valor = complex(real_part, imag_part)
+            else:
+                valor = parse_valor_com_unidade(tokens[3])
+            return (tipo_comp, nome_comp, tokens[1], tokens[2], None, None, None, valor, None, tolerancia, None)
+    except (ValueError, IndexError) as e:
+        raise NetlistParseError(f"Erro ao processar valor: {e}", linha_numero)
+
+def _extrair_parametro(tokens, chave, linha_numero):
+    # Último "chave=valor" da linha (ou None) e os tokens sem ele
+    prefixo = chave + "="
+    encontrados = [t[len(prefixo):] for t in tokens if t[:len(prefixo)].lower() == prefixo]
+    if encontrados and not encontrados[-1]:
+        raise NetlistParseError(f"Parâmetro '{chave}=' sem valor.", linha_numero)
+    return (encontrados[-1] if encontrados else None), [t for t in tokens if t[:len(prefixo)].lower() != prefixo]
+
+def _parse_trifasico(tokens, linha_numero, com_parametros=True):
+    """
+    Elemento trifásico, expandido em três registros monofásicos:
+        T<nome> V|R|L|C|Z|M <barra> Y|D valores... [neutro=no] [tol=x]  (em derivação)
+        T<nome> R|L|C|Z <barra1> <barra2> valores... [tol=x]           (em série)
+    Cada barra vira os nós <barra>_A, <barra>_B e <barra>_C e o componente vira
+    <nome>_A, _B e _C (na ligação D, entre fases: _AB, _BC e _CA). Valores: V
+    tensão de fase [fase] (sequência positiva); R, L, C valor; Z real [imag];
+    M potência ativa total, fp [tensão de fase] (calcular_impedancia_motor).
+    A fonte em D tem tensão de linha e vira a fonte em Y equivalente.
+    """
+    tolerancia, neutro = None, None
+    if com_parametros:
+        tol, tokens = _extrair_parametro(tokens, "tol", linha_numero)
+        neutro, tokens = _extrair_parametro(tokens, "neutro", linha_numero)
+        try:
+            tolerancia = parse_tolerancia(tol) if tol is not None else None
+        except ValueError as e:
+            raise NetlistParseError(f"Tolerância inválida: {e}", linha_numero)
+    if len(tokens) < 5:
+        raise NetlistParseError("Elemento trifásico requer: T<nome> tipo barra Y|D valores... ou T<nome> tipo barra1 barra2 valores...", linha_numero)
+    nome, tipo, barra = tokens[0][1:], tokens[1].upper(), tokens[2]
+    if not nome or tipo not in _TIPOS_TRIFASICOS:
+        raise NetlistParseError(f"Elemento trifásico inválido: '{tokens[0]} {tokens[1]}' (tipos V, R, L, C, Z ou M).", linha_numero)
+    ligacao = _LIGACOES.get(tokens[3].upper())
+    if ligacao is None and (tipo in 'VM' or neutro is not None):
+        raise NetlistParseError(f"Ligação desconhecida: '{tokens[3]}' (use Y ou D).", linha_numero)
+    valores = tokens[4:]
+    quantidade = {'V': (1, 2), 'M': (2, 3), 'Z': (1, 2)}.get(tipo, (1, 1))
+    if not quantidade[0] <= len(valores) <= quantidade[1]:
+        raise NetlistParseError(f"Elemento trifásico {tipo} requer de {quantidade[0]} a {quantidade[1]} valores.", linha_numero)
+    try:
+        numeros = [parse_valor_com_unidade(v) for v in valores]
+        fase = None
+        if tipo == 'V':
+            valor, fase = numeros[0], (numeros[1] if len(numeros) > 1 else 0.0)
+        elif tipo == 'M':
+            if not 0 < numeros[1] <= 1: raise ValueError("O fator de potência do motor deve estar em (0, 1].")
+            valor = calcular_impedancia_motor(*numeros[:2], ligacao, *numeros[2:])
+            tipo = 'Z'
+        elif tipo == 'Z' and len(numeros) > 1:
+            valor = complex(numeros[0], numeros[1])
+        else:
+            valor = numeros[0]
+    except ValueError as e:
+        raise NetlistParseError(f"Erro ao processar valor: {e}", linha_numero)
+
+    nos = [f"{barra}_{f}" for f in FASES]
+    if ligacao is None:
+        # Em série: o quarto token é a outra barra
+        pares = zip(FASES, nos, [f"{tokens[3]}_{f}" for f in FASES])
+    elif ligacao == 'Y' or tipo == 'V':
+        pares = zip(FASES, nos, [neutro or '0'] * 3)
+    else:
+        pares = zip(["AB", "BC", "CA"], nos, nos[1:] + nos[:1])
+    if tipo == 'V':
+        # Fase A na fase dada, B atrasada e C adiantada 120°; D: V_fase = V_linha/√3 atrasada 30°
+        if ligacao == 'D':
+            valor, fase = valor / math.sqrt(3), fase - 30.0
+        return [("V", f"{nome}_{sufixo}", n1, n2, None, None, None, valor, fase + (0.0, -120.0, 120.0)[k], tolerancia, None)
+                for k, (sufixo, n1, n2) in enumerate(pares)]
+    return [(tipo, f"{nome}_{sufixo}", n1, n2, None, None, None, valor, None, tolerancia, None) for sufixo, n1, n2 in pares]
+
+def _parse_registros(tokens, linha_numero, com_parametros=True):
+    # Registros de uma linha: um por componente, três para os elementos trifásicos
+    if tokens[0][0] in 'Tt':
+        return _parse_trifasico(tokens, linha_numero, com_parametros)
+    return [_parse_registro(tokens, linha_numero, com_parametros)]
+
+def _parse_instancia(tokens, linha_numero, subcircuitos):
+    # X<nome> nós... subcircuito: os nós ligados às portas, na ordem da definição
+    if len(tokens) < 3:
+        raise NetlistParseError("Instância requer: X<nome> nós... subcircuito.", linha_numero)
+    subcircuito = subcircuitos.get(tokens[-1])
+    if subcircuito is None:
+        raise NetlistParseError(f"Subcircuito '{tokens[-1]}' não definido (a definição .SUBCKT deve vir antes das instâncias).", linha_numero)
+    portas = tuple(tokens[1:-1])
+    if len(portas) != len(subcircuito.portas):
+        raise NetlistParseError(f"Subcircuito '{subcircuito.nome}' tem {len(subcircuito.portas)} portas; a instância liga {len(portas)} nós.", linha_numero)
+    return ('X', tokens[0], None, None, None, None, None, None, None, None, (portas, subcircuito))
+
+class _DefinicaoAberta:
+    # Definição .SUBCKT em leitura: registros e linhas normalizadas até o .ENDS
+    def __init__(self, nome, portas, linha_numero):
+        self.nome, self.portas, self.linha_numero = nome, portas, linha_numero
+        self.registros, self.linhas = [], []
+
+def _definir_subcircuito(tokens, linha_numero, aberta, subcircuitos):
+    """
+    Trata as linhas '.SUBCKT nome portas...' e '.ENDS [nome]'. Retorna a
+    definição aberta (ou None após o .ENDS, com o Subcircuito registrado).
+    """
+    if tokens[0].upper() == '.SUBCKT':
+        if aberta is not None:
+            raise NetlistParseError(f"Definição .SUBCKT dentro de '{aberta.nome}' (feche-a com .ENDS antes).", linha_numero)
+        if len(tokens) < 3:
+            raise NetlistParseError("Diretiva .SUBCKT requer: .SUBCKT nome porta1 [porta2 ...].", linha_numero)
+        nome, portas = tokens[1], tokens[2:]
+        if nome in subcircuitos:
+            raise NetlistParseError(f"Subcircuito '{nome}' já definido.", linha_numero)
+        if '0' in portas or len(set(portas)) != len(portas):
+            raise NetlistParseError("As portas do subcircuito devem ser distintas e diferentes do nó '0' (que é global).", linha_numero)
+        return _DefinicaoAberta(nome, portas, linha_numero)
+    if aberta is None:
+        raise NetlistParseError(".ENDS sem .SUBCKT correspondente.", linha_numero)
+    if len(tokens) > 1 and tokens[1] != aberta.nome:
+        raise NetlistParseError(f".ENDS {tokens[1]} fecha a definição de '{aberta.nome}'.", linha_numero)
+    subcircuitos[aberta.nome] = Subcircuito(aberta.nome, aberta.portas, TabelaComponentes(aberta.registros), aberta.linhas)
+    return None
+
+def _iterar_registros(fonte, diretivas=None):
+    if isinstance(fonte, (str, os.PathLike)):
+        with open(fonte, 'r', encoding='utf-8') as arquivo:
+            yield from _iterar_registros(arquivo, diretivas)
+        return
+
+    subcircuitos = {}  # Definições .SUBCKT já lidas
+    aberta = None  # Definição .SUBCKT em leitura: as linhas vão para ela, não para a netlist
+    for linha_numero, linha in enumerate(fonte, start=1):
         linha_limpa = linha.strip()
-        if not linha_limpa or linha_limpa.startswith("*"): continue
+        if not linha_limpa or linha_limpa[0] == "*": continue
 
         tokens = linha_limpa.split()
-        if len(tokens) < 4:
-            raise NetlistParseError("Linha incompleta.", linha_numero)
+        if linha_limpa[0] == ".":
+            if tokens[0].upper() in ('.SUBCKT', '.ENDS'):
+                aberta = _definir_subcircuito(tokens, linha_numero, aberta, subcircuitos)
+                continue
+            if aberta is not None:
+                raise NetlistParseError(f"Diretiva {tokens[0]} dentro da definição do subcircuito '{aberta.nome}'.", linha_numero)
+            chave, valor = parse_diretiva(tokens, linha_numero)
+            if diretivas is not None:
+                diretivas[chave] = valor
+            continue
 
-        nome_comp = tokens[0]
-        tipo_comp = nome_comp[0].upper()
-        
-        try:
-            if tipo_comp in ['E', 'G']: # Fontes controladas por TENSÃO
-                if len(tokens) != 6: raise NetlistParseError(f"Fonte {tipo_comp} requer 6 tokens (nome n+ n- nc+ nc- ganho).", linha_numero)
-                n_pos, n_neg = tokens[1], tokens[2]
-                nc_pos, nc_neg = tokens[3], tokens[4]
-                ganho = parse_valor_com_unidade(tokens[5])
-                componentes.append({
-                    "tipo": tipo_comp, "nome": nome_comp, "n1": n_pos, "n2": n_neg,
-                    "nc1": nc_pos, "nc2": nc_neg, "valor": ganho
-                })
-
-            elif tipo_comp in ['F', 'H']: # Fontes controladas por CORRENTE
-                if len(tokens) != 5: raise NetlistParseError(f"Fonte {tipo_comp} requer 5 tokens (nome n+ n- V_controle ganho).", linha_numero)
-                n_pos, n_neg = tokens[1], tokens[2]
-                comp_controle = tokens[3] # Nome da fonte de tensão (V) de controle
-                ganho = parse_valor_com_unidade(tokens[4])
-                componentes.append({
-                    "tipo": tipo_comp, "nome": nome_comp, "n1": n_pos, "n2": n_neg,
-                    "controle": comp_controle, "valor": ganho
-                })
-
-            elif len(tokens) > 3 and tokens[3].upper() == "AC":
-                if len(tokens) < 5: raise NetlistParseError("Fonte AC requer um valor de magnitude.", linha_numero)
-                n1, n2 = tokens[1], tokens[2]
-                valor = parse_valor_com_unidade(tokens[4])
-                fase = parse_valor_com_unidade(tokens[5]) if len(tokens) > 5 else 0.0
-                componentes.append({
-                    "tipo": "V", "nome": nome_comp, "n1": n1, "n2": n2, "valor": valor, "fase": fase
-                })
-            else: # Componentes passivos
-                n1, n2 = tokens[1], tokens[2]
-                if len(tokens) > 4:
-                    real_part = parse_valor_com_unidade(tokens[3])
-                    imag_part = parse_valor_com_unidade(tokens[4])
-                    valor = complex(real_part, imag_part)
-                else:
-                    valor = parse_valor_com_unidade(tokens[3])
-                
-                componentes.append({
-                    "tipo": tipo_comp, "nome": nome_comp, "n1": n1, "n2": n2, "valor": valor
-                })
-        except (ValueError, IndexError) as e:
-            raise NetlistParseError(f"Erro ao processar valor: {e}", linha_numero)
-
-    return componentes
+        # Parâmetros "chave=valor" (tol=) são raros: só varre os tokens se houver '='
+        if linha_limpa[0] in 'Tt':
+            registros = _parse_trifasico(tokens, linha_numero, "=" in linha_limpa)
+        elif linha_limpa[0] in 'Xx':
+            registros = (_parse_instancia(tokens, linha_numero, subcircuitos),)
+        elif aberta is None:
+            yield _parse_registro(tokens, linha_numero, "=" in linha_limpa)
+            continue
+        else:
+            registros = (_parse_registro(tokens, linha_numero, "=" in linha_limpa),)
+        if aberta is None:
+            yield from registros
+        else:
+            aberta.registros.extend(registros)
+            aberta.linhas.append(" ".join(tokens))
+    if aberta is not None:
+        raise NetlistParseError(f"Definição do subcircuito '{aberta.nome}' sem .ENDS.", aberta.linha_numero)
+
+def iterar_netlist(fonte, diretivas=None):
+    """
+    Lê a netlist de forma preguiçosa e gera um componente (dict) por vez, sem
+    manter as linhas em memória. Os números de linha de NetlistParseError são preservados.
+    Instâncias de subcircuitos viram {'tipo': 'X', 'nome', 'portas', 'subcircuito'}.
+    fonte = caminho do arquivo ou qualquer iterável de linhas (lista, arquivo aberto, gerador)
+    """
+    for registro in _iterar_registros(fonte, diretivas):
+        if registro[0] == 'X':
+            yield {'tipo': 'X', 'nome': registro[1], 'portas': registro[10][0], 'subcircuito': registro[10][1]}
+            continue
+        yield {campo: v for campo, v in zip(CAMPOS, registro) if v is not None}
+
+def parse_netlist_linhas(linhas, diretivas=None):
+    """
+    Netlist completa como TabelaComponentes, montada diretamente a partir dos
+    registros do parser, sem dicts intermediários.
+    """
+    # A montagem cria milhões de objetos de vida longa e nenhum ciclo:
+    # o coletor cíclico só percorreria o heap repetidas vezes
+    coletor_ativo = gc.isenabled()
+    gc.disable()
+    try:
+        return TabelaComponentes(_iterar_registros(linhas, diretivas))
+    finally:
+        if coletor_ativo:
+            gc.enable()
+
+def diferenca_de_valores(linhas_antigas, linhas_novas):
+    """
+    Compara duas versões da netlist linha a linha. Se apenas valores, fases ou
+    tolerâncias de componentes existentes mudaram, retorna {nome: (valor, fase, tol)}
+    com os componentes das linhas alteradas (fase/tol None quando ausentes).
+    Qualquer mudança estrutural (componente novo ou removido, nome, tipo, nós,
+    controle ou diretivas) retorna None, assim como mudanças em instâncias e
+    dentro de definições de subcircuitos. Linhas novas inválidas levantam NetlistParseError.
+    """
+    if len(linhas_antigas) != len(linhas_novas):
+        return None
+    mudancas = {}
+    dentro_subcircuito = False
+    for linha_numero, (antiga, nova) in enumerate(zip(linhas_antigas, linhas_novas), start=1):
+        if nova.lstrip()[:1] == ".":
+            diretiva = nova.split()[0].upper()
+            dentro_subcircuito = diretiva == '.SUBCKT' or (dentro_subcircuito and diretiva != '.ENDS')
+        if antiga == nova:
+            continue
+        tokens_antigos, tokens_novos = antiga.split(), nova.split()
+        if tokens_antigos == tokens_novos:
+            continue
+        vazia_antiga = not tokens_antigos or tokens_antigos[0][0] == "*"
+        vazia_nova = not tokens_novos or tokens_novos[0][0] == "*"
+        if vazia_antiga and vazia_nova:
+            continue
+        if vazia_antiga or vazia_nova or tokens_antigos[0][0] == "." or tokens_novos[0][0] == ".":
+            return None
+        # A redução às portas do subcircuito depende de todo o seu conteúdo
+        if dentro_subcircuito or tokens_antigos[0][0] in 'Xx' or tokens_novos[0][0] in 'Xx':
+            return None
+        registros_antigos = _parse_registros(tokens_antigos, linha_numero, "=" in antiga)
+        registros_novos = _parse_registros(tokens_novos, linha_numero, "=" in nova)
+        if len(registros_antigos) != len(registros_novos):
+            return None
+        for registro_antigo, registro_novo in zip(registros_antigos, registros_novos):
+            # tipo, nome, n1, n2, nc1, nc2, controle e forma de onda precisam ser os mesmos
+            if registro_antigo[:7] != registro_novo[:7] or registro_antigo[10:] != registro_novo[10:]:
+                return None
+            mudancas[registro_novo[1]] = registro_novo[7:10]
+    return mudancas
 
 def calcular_impedancia_motor(potencia_total_ativa, fp, ligacao='Y', tensao_fase=220):
+    """
+    Impedância por ramo de um motor trifásico equilibrado a partir da potência
+    ativa total e do fator de potência (indutivo). Na ligação D cada ramo fica
+    sob a tensão de linha: a impedância é 3 vezes a da ligação Y.
+    """
     p_fase = potencia_total_ativa / 3
     s_fase = p_fase / fp
     if s_fase == 0: return complex(1e12, 0) # Evita divisão por zero
     theta = math.acos(fp)
     z_mod = (tensao_fase**2) / s_fase
+    if ligacao == 'D': z_mod *= 3
     return z_mod * complex(math.cos(theta), math.sin(theta))
\ No newline at end of file
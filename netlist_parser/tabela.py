@@ -0,0 +1,194 @@
+# netlist_parser/tabela.py
+
+import copy
+from collections import namedtuple
+from collections.abc import Mapping, Sequence
+from itertools import chain, islice
+
+import numpy as np
+
+TIPOS = ['R', 'L', 'C', 'Z', 'V', 'E', 'F', 'G', 'H']
+CODIGO_TIPO = {tipo: codigo for codigo, tipo in enumerate(TIPOS)}
+
+# Campos de cada registro produzido pelo parser, na ordem da tupla
+CAMPOS = ('tipo', 'nome', 'n1', 'n2', 'nc1', 'nc2', 'controle', 'valor', 'fase', 'tol', 'forma')
+
+# Instância X de um subcircuito: ids dos nós ligados às portas (na ordem da definição)
+InstanciaSubcircuito = namedtuple('InstanciaSubcircuito', 'nome portas subcircuito')
+
+class Subcircuito:
+    """
+    Definição .SUBCKT: nome, portas (nós externos, na ordem da definição) e a
+    TabelaComponentes interna. chave identifica o conteúdo (portas, linhas e
+    subcircuitos usados), para reaproveitar a redução entre análises.
+    """
+    __slots__ = ('nome', 'portas', 'componentes', 'chave')
+
+    def __init__(self, nome, portas, componentes, linhas):
+        self.nome = nome
+        self.portas = tuple(portas)
+        self.componentes = componentes
+        self.chave = (self.portas, tuple(linhas), tuple(i.subcircuito.chave for i in componentes.instancias))
+
+    def __repr__(self):
+        return f"Subcircuito({self.nome!r}, portas={self.portas}, componentes={len(self.componentes)})"
+
+class Componente(Mapping):
+    """
+    Visão somente leitura de uma linha da tabela com a interface do antigo
+    dict de componente ('tipo', 'nome', 'n1', 'n2', 'valor', ...). Chaves
+    opcionais (nc1/nc2, controle, fase, tol, forma) só existem quando definidas.
+    """
+    __slots__ = ('_tabela', '_linha')
+
+    def __init__(self, tabela, linha):
+        self._tabela = tabela
+        self._linha = linha
+
+    def __getitem__(self, chave):
+        t, k = self._tabela, self._linha
+        if chave == 'tipo': return TIPOS[t.tipos[k]]
+        if chave == 'nome': return t.nomes[k]
+        if chave == 'n1': return t.nos[t.n1[k]]
+        if chave == 'n2': return t.nos[t.n2[k]]
+        if chave in ('nc1', 'nc2') and t.nc1[k] >= 0:
+            return t.nos[(t.nc1 if chave == 'nc1' else t.nc2)[k]]
+        if chave == 'controle' and k in t.controles: return t.controles[k]
+        if chave == 'valor':
+            valor = t.valores[k]
+            return complex(valor) if valor.imag else float(valor.real)
+        if chave == 'fase' and not np.isnan(t.fases[k]): return float(t.fases[k])
+        if chave == 'tol' and not np.isnan(t.tolerancias[k]): return float(t.tolerancias[k])
+        if chave == 'forma' and k in t.formas: return t.formas[k]
+        raise KeyError(chave)
+
+    def __iter__(self):
+        return (chave for chave in CAMPOS if chave in self)
+
+    def __contains__(self, chave):
+        try:
+            self[chave]
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+class TabelaComponentes(Sequence):
+    """
+    Componentes da netlist em colunas compactas: nós internados como ids
+    inteiros (o id 0 é sempre o nó '0'), códigos de tipo, valores complexos,
+    fases e tolerâncias em arrays NumPy, mais o índice nome -> linha.
+    Ausências são codificadas como -1 (nc1/nc2) e NaN (fase, tol).
+    Indexar a tabela devolve uma visão Componente, compatível com os dicts antigos.
+    Instâncias de subcircuitos (registros 'X') ficam à parte, em instancias.
+    """
+    def __init__(self, registros=(), tamanho_bloco=65536):
+        self.nos = ['0']
+        self.nomes = []
+        self.controles = {}  # linha -> nome da fonte de controle (F/H)
+        self.formas = {}  # linha -> (tipo, parâmetros) da forma de onda da fonte na análise .TRAN
+        self.instancias = []  # InstanciaSubcircuito, na ordem da netlist
+        id_no = {'0': 0, None: -1}  # Só necessário durante a montagem
+        colunas = {'tipos': [], 'n1': [], 'n2': [], 'nc1': [], 'nc2': [], 'valores': [], 'fases': [], 'tol': []}
+
+        # Registros consumidos em blocos: cada bloco é transposto em colunas e
+        # convertido de uma vez, sem laço Python por componente
+        registros = iter(registros)
+        while True:
+            bloco = list(islice(registros, tamanho_bloco))
+            if not bloco:
+                break
+            tipos, nomes, n1, n2, nc1, nc2, controles, valores, fases, tol, formas = zip(*bloco)
+            if 'X' in tipos:
+                # Instâncias: (portas, subcircuito) vêm no campo da forma de onda
+                for registro in bloco:
+                    if registro[0] == 'X':
+                        portas, subcircuito = registro[10]
+                        novos = [no for no in dict.fromkeys(portas) if no not in id_no]
+                        id_no.update(zip(novos, range(len(self.nos), len(self.nos) + len(novos))))
+                        self.nos.extend(novos)
+                        portas = np.fromiter(map(id_no.__getitem__, portas), np.int32, len(portas))
+                        self.instancias.append(InstanciaSubcircuito(registro[1], portas, subcircuito))
+                bloco = [registro for registro in bloco if registro[0] != 'X']
+                if not bloco:
+                    continue
+                tipos, nomes, n1, n2, nc1, nc2, controles, valores, fases, tol, formas = zip(*bloco)
+            novos = [no for no in dict.fromkeys(chain(n1, n2, nc1, nc2)) if no not in id_no]
+            id_no.update(zip(novos, range(len(self.nos), len(self.nos) + len(novos))))
+            self.nos.extend(novos)
+            inicio = len(self.nomes)
+            self.controles.update((inicio + k, c) for k, c in enumerate(controles) if c is not None)
+            self.formas.update((inicio + k, f) for k, f in enumerate(formas) if f is not None)
+            self.nomes.extend(nomes)
+            colunas['tipos'].append(np.fromiter(map(CODIGO_TIPO.__getitem__, tipos), np.int8, len(bloco)))
+            for chave, nos in (('n1', n1), ('n2', n2), ('nc1', nc1), ('nc2', nc2)):
+                colunas[chave].append(np.fromiter(map(id_no.__getitem__, nos), np.int32, len(bloco)))
+            colunas['valores'].append(np.array(valores, dtype=complex))
+            # None vira NaN na conversão para float
+            colunas['fases'].append(np.array(fases, dtype=float))
+            colunas['tol'].append(np.array(tol, dtype=float))
+
+        self.indice = dict(zip(self.nomes, range(len(self.nomes))))
+        vazio = {'tipos': np.int8, 'valores': complex, 'fases': float, 'tol': float}
+        def coluna(chave):
+            partes = colunas[chave]
+            dados = np.concatenate(partes) if partes else np.empty(0, vazio.get(chave, np.int32))
+            dados.flags.writeable = False
+            return dados
+        self.tipos = coluna('tipos')
+        self.n1, self.n2, self.nc1, self.nc2 = coluna('n1'), coluna('n2'), coluna('nc1'), coluna('nc2')
+        self.valores = coluna('valores')
+        self.fases = coluna('fases')
+        self.tolerancias = coluna('tol')
+
+    @classmethod
+    def de_componentes(cls, componentes):
+        """
+        Converte uma lista de dicts no formato antigo.
+        """
+        if isinstance(componentes, cls):
+            return componentes
+        def registro(c):
+            if c['tipo'].upper() == 'X':
+                return ('X', c['nome'], None, None, None, None, None, None, None, None, (c['portas'], c['subcircuito']))
+            return (c['tipo'].upper(), c['nome'], c['n1'], c['n2'], c.get('nc1'), c.get('nc2'),
+                    c.get('controle'), c['valor'], c.get('fase'), c.get('tol'), c.get('forma'))
+        return cls(map(registro, componentes))
+
+    def __len__(self):
+        return len(self.nomes)
+
+    def __getitem__(self, linha):
+        if isinstance(linha, slice):
+            return [Componente(self, k) for k in range(*linha.indices(len(self)))]
+        if linha < 0:
+            linha += len(self)
+        if not 0 <= linha < len(self):
+            raise IndexError(linha)
+        return Componente(self, linha)
+
+    def __iter__(self):
+        return (Componente(self, k) for k in range(len(self)))
+
+    def com_valores(self, linhas, valores, fases=None, tolerancias=None):
+        """
+        Nova tabela com os valores (e opcionalmente fases/tolerâncias) das linhas
+        dadas trocados. Nomes, nós e tipos são compartilhados com esta tabela.
+        """
+        nova = copy.copy(self)
+        for atributo, novos in (('valores', valores), ('fases', fases), ('tolerancias', tolerancias)):
+            if novos is None:
+                continue
+            dados = getattr(self, atributo).copy()
+            dados[linhas] = novos
+            dados.flags.writeable = False
+            setattr(nova, atributo, dados)
+        return nova
+
+    def componente(self, nome):
+        return Componente(self, self.indice[nome])
@@ -1,14 +1,13 @@
 # schematic/capacitor_item.py
 
-from PySide6.QtWidgets import QGraphicsPathItem
 from PySide6.QtGui import QPen, QColor, QPainterPath
 from PySide6.QtCore import QPointF
 
-class CapacitorItem(QGraphicsPathItem):
+from schematic.symbol_item import SymbolItem
+
+class CapacitorItem(SymbolItem):
     def __init__(self, name, value_str):
-        super().__init__()
-        self.name = name
-        self.value_str = value_str
+        super().__init__(name, value_str)
         
         path = QPainterPath()
         path.moveTo(-30, 0); path.lineTo(-5, 0)
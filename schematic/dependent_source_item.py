@@ -1,14 +1,13 @@
 # schematic/dependent_source_item.py
 
-from PySide6.QtWidgets import QGraphicsPathItem
 from PySide6.QtGui import QPen, QColor, QPainterPath
 from PySide6.QtCore import QPointF
 
-class DependentSourceItem(QGraphicsPathItem):
+from schematic.symbol_item import SymbolItem
+
+class DependentSourceItem(SymbolItem):
     def __init__(self, name, value_str, source_type='V'):
-        super().__init__()
-        self.name = name
-        self.value_str = value_str
+        super().__init__(name, value_str)
 
         # Desenha o losango (diamante)
         path = QPainterPath()
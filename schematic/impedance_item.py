@@ -1,13 +1,13 @@
 # schematic/impedance_item.py
 
-from PySide6.QtWidgets import QGraphicsPathItem
 from PySide6.QtGui import QPen, QColor, QPainterPath
+from PySide6.QtCore import QPointF
 
-class ImpedanceItem(QGraphicsPathItem):
+from schematic.symbol_item import SymbolItem
+
+class ImpedanceItem(SymbolItem):
     def __init__(self, name, value_str):
-        super().__init__()
-        self.name = name
-        self.value_str = value_str
+        super().__init__(name, value_str)
         
         path = QPainterPath()
         path.moveTo(-30, 0)
@@ -22,5 +22,5 @@ class ImpedanceItem(QGraphicsPathItem):
         self.setPen(pen)
 
     def get_terminals(self):
-        return QPainterPath(self.path().elementAt(0)).pointAtPercent(0), \
-               QPainterPath(self.path().elementAt(2)).pointAtPercent(1)
\ No newline at end of file
+        # Pontos de conexão exatos nas extremidades
+        return QPointF(-30, 0), QPointF(30, 0)
\ No newline at end of file
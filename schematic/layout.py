@@ -0,0 +1,218 @@
+# schematic/layout.py
+
+"""
+Layout em camadas do esquemático (no estilo de Sugiyama). Só usa NumPy, para
+poder rodar fora da thread da interface.
+
+    1. camadas: busca em largura no grafo dos nós sem o terra, começando pelos
+       nós das fontes; cada parte conexa ocupa a sua própria faixa
+    2. ordem dentro das camadas: heurística do baricentro em varreduras
+       alternadas, ficando com a ordem de menos cruzamentos
+    3. coordenadas: cada nó o mais perto possível do baricentro dos vizinhos da
+       camada anterior, respeitando o espaçamento mínimo
+
+O terra não recebe posição: cada ligação ao terra desce QUEDA_TERRA abaixo do
+outro nó e termina num símbolo de terra, em vez de fios cruzando o desenho.
+"""
+
+import numpy as np
+
+PASSO_CAMADA = 250          # Distância horizontal entre camadas
+PASSO_NO = 200              # Distância vertical mínima entre nós da mesma camada
+QUEDA_TERRA = 120
+AFASTAMENTO_PARALELO = 40   # Entre componentes ligados ao mesmo par de nós
+VARREDURAS = 8
+
+class LayoutEsquematico:
+    def __init__(self, posicoes_nos, centros, angulos, pontas, terra, cruzamentos):
+        self.posicoes_nos = posicoes_nos  # (N, 2); a linha 0 (terra) não é desenhada
+        self.centros = centros            # (K, 2) posição de cada componente
+        self.angulos = angulos            # (K,) rotação em graus
+        self.pontas = pontas              # (K, 2, 2) extremidades dos fios nas coordenadas do componente
+        self.terra = terra                # (K, 2) extremidades ligadas ao terra
+        self.cruzamentos = cruzamentos
+
+    def limites(self, margem=PASSO_NO):
+        """
+        Retângulo (x, y, largura, altura) que contém o desenho, ou None se vazio.
+        """
+        pontos = np.concatenate([self.posicoes_nos[1:], self.centros])
+        if not len(pontos):
+            return None
+        (x0, y0), (x1, y1) = pontos.min(axis=0) - margem, pontos.max(axis=0) + margem
+        return float(x0), float(y0), float(x1 - x0), float(y1 - y0)
+
+def _adjacencia(n_nos, n1, n2):
+    vizinhos = [[] for _ in range(n_nos)]
+    for a, b in zip(n1.tolist(), n2.tolist()):
+        if a and b and a != b:
+            vizinhos[a].append(b)
+            vizinhos[b].append(a)
+    return vizinhos
+
+def _partes_em_camadas(n_nos, vizinhos, raizes):
+    """
+    Lista de partes conexas (sem o terra), cada uma como lista de camadas, e a
+    camada de cada nó.
+    """
+    camada = [-1] * n_nos
+    partes = []
+    for inicio in list(raizes) + list(range(1, n_nos)):
+        if inicio == 0 or camada[inicio] >= 0:
+            continue
+        camada[inicio] = 0
+        camadas = [[inicio]]
+        fila, i = [inicio], 0
+        while i < len(fila):
+            no = fila[i]; i += 1
+            for vizinho in vizinhos[no]:
+                if camada[vizinho] < 0:
+                    camada[vizinho] = camada[no] + 1
+                    if camada[vizinho] == len(camadas):
+                        camadas.append([])
+                    camadas[camada[vizinho]].append(vizinho)
+                    fila.append(vizinho)
+        partes.append(camadas)
+    return partes, camada
+
+def _cruzamentos(camadas, seguintes, posicao):
+    """
+    Cruzamentos entre camadas vizinhas: inversões na ordem das arestas, contadas
+    com uma árvore de Fenwick.
+    """
+    total = 0
+    for l in range(len(camadas) - 1):
+        arestas = sorted((posicao[u], posicao[v]) for u in camadas[l] for v in seguintes[u])
+        arvore = [0] * (len(camadas[l + 1]) + 1)
+        for vistas, (_, p) in enumerate(arestas):
+            # Arestas já vistas que chegam à direita de p
+            k, ate_p = p + 1, 0
+            while k > 0:
+                ate_p += arvore[k]; k -= k & -k
+            total += vistas - ate_p
+            k = p + 1
+            while k < len(arvore):
+                arvore[k] += 1; k += k & -k
+    return total
+
+def _ordenar_camadas(camadas, anteriores, seguintes, posicao):
+    """
+    Varreduras do baricentro, alternando para baixo e para cima; as camadas
+    ficam na melhor ordem encontrada. Retorna o número de cruzamentos.
+    """
+    melhor = _cruzamentos(camadas, seguintes, posicao)
+    melhor_ordem = [list(c) for c in camadas]
+    for varredura in range(VARREDURAS):
+        if melhor == 0:
+            break
+        descendo = varredura % 2 == 0
+        indices = range(1, len(camadas)) if descendo else range(len(camadas) - 2, -1, -1)
+        referencia = anteriores if descendo else seguintes
+        for l in indices:
+            baricentros = {}
+            for no in camadas[l]:
+                ligados = referencia[no]
+                baricentros[no] = sum(posicao[v] for v in ligados) / len(ligados) if ligados else posicao[no]
+            camadas[l].sort(key=lambda no: (baricentros[no], posicao[no]))
+            for i, no in enumerate(camadas[l]):
+                posicao[no] = i
+        atual = _cruzamentos(camadas, seguintes, posicao)
+        if atual < melhor:
+            melhor, melhor_ordem = atual, [list(c) for c in camadas]
+    camadas[:] = melhor_ordem
+    for camada in camadas:
+        for i, no in enumerate(camada):
+            posicao[no] = i
+    return melhor
+
+def _coordenadas_parte(camadas, anteriores, y_inicial, posicoes):
+    """
+    Coordenadas dos nós de uma parte conexa; retorna a altura ocupada.
+    """
+    y = {}
+    for camada in camadas:
+        y_anterior = None
+        for no in camada:
+            ligados = anteriores[no]
+            desejado = sum(y[v] for v in ligados) / len(ligados) if ligados else None
+            if y_anterior is None:
+                atual = desejado if desejado is not None else 0.0
+            else:
+                atual = max(desejado if desejado is not None else -np.inf, y_anterior + PASSO_NO)
+            y[no] = y_anterior = atual
+    topo = min(y.values())
+    for l, camada in enumerate(camadas):
+        for no in camada:
+            posicoes[no] = (l * PASSO_CAMADA, y_inicial + y[no] - topo)
+    return max(y.values()) - topo
+
+def _geometria_componentes(posicoes, n1, n2):
+    """
+    Extremidades, centro e rotação de cada componente; componentes em paralelo
+    são afastados perpendicularmente à ligação entre os nós.
+    """
+    K = len(n1)
+    terra = np.stack([n1 == 0, n2 == 0], axis=1)
+    queda = np.array([0.0, QUEDA_TERRA])
+    p1, p2 = posicoes[n1], posicoes[n2]
+    p1 = np.where(terra[:, :1], posicoes[n2] + queda, p1)
+    p2 = np.where(terra[:, 1:], posicoes[n1] + queda, p2)
+    # Curto no mesmo nó (ou terra-terra): o componente fica pendurado abaixo do nó
+    degenerado = np.all(p1 == p2, axis=1)
+    p2[degenerado] += queda
+
+    direcao = p2 - p1
+    comprimento = np.hypot(direcao[:, 0], direcao[:, 1])
+    # A normal segue o sentido do menor para o maior índice de nó, igual para todo o grupo
+    sentido = np.where(n1 <= n2, 1.0, -1.0)
+    normal = np.stack([-direcao[:, 1], direcao[:, 0]], axis=1) * (sentido / comprimento)[:, None]
+
+    n_nos = len(posicoes)
+    chave = np.minimum(n1, n2).astype(np.int64) * n_nos + np.maximum(n1, n2)
+    ordem = np.argsort(chave, kind='stable')
+    inicio_grupo = np.r_[True, chave[ordem][1:] != chave[ordem][:-1]]
+    grupo = np.cumsum(inicio_grupo) - 1
+    primeiros = np.flatnonzero(inicio_grupo)
+    tamanhos = np.diff(np.r_[primeiros, K])
+    deslocamento = np.empty(K)
+    deslocamento[ordem] = (np.arange(K) - primeiros[grupo] - (tamanhos[grupo] - 1) / 2) * AFASTAMENTO_PARALELO
+
+    centros = (p1 + p2) / 2 + normal * deslocamento[:, None]
+    angulos = np.arctan2(direcao[:, 1], direcao[:, 0])
+    cos, sen = np.cos(angulos), np.sin(angulos)
+    # Extremidades giradas de -ângulo em torno do centro: coordenadas locais do item
+    pontas = np.empty((K, 2, 2))
+    for j, p in enumerate((p1, p2)):
+        d = p - centros
+        pontas[:, j, 0] = cos * d[:, 0] + sen * d[:, 1]
+        pontas[:, j, 1] = -sen * d[:, 0] + cos * d[:, 1]
+    return centros, np.degrees(angulos), pontas, terra
+
+def calcular_layout(n_nos, n1, n2, raizes=()):
+    """
+    Layout de um circuito com n_nos nós (o 0 é o terra) e componentes ligando
+    n1[k] a n2[k]. raizes são os nós por onde começar as camadas (ex.: os das
+    fontes).
+    """
+    n1 = np.asarray(n1, dtype=np.intp)
+    n2 = np.asarray(n2, dtype=np.intp)
+    vizinhos = _adjacencia(n_nos, n1, n2)
+    partes, camada = _partes_em_camadas(n_nos, vizinhos, raizes)
+    anteriores = [[v for v in vizinhos[no] if camada[v] == camada[no] - 1] for no in range(n_nos)]
+    seguintes = [[v for v in vizinhos[no] if camada[v] == camada[no] + 1] for no in range(n_nos)]
+
+    posicao = [0] * n_nos
+    for camadas in partes:
+        for c in camadas:
+            for i, no in enumerate(c):
+                posicao[no] = i
+
+    posicoes = np.zeros((n_nos, 2))
+    posicoes[0] = (-PASSO_CAMADA, 0.0)
+    cruzamentos, y = 0, 0.0
+    for camadas in partes:
+        cruzamentos += _ordenar_camadas(camadas, anteriores, seguintes, posicao)
+        y += _coordenadas_parte(camadas, anteriores, y, posicoes) + PASSO_NO
+
+    centros, angulos, pontas, terra = _geometria_componentes(posicoes, n1, n2)
+    return LayoutEsquematico(posicoes, centros, angulos, pontas, terra, cruzamentos)
@@ -1,24 +1,36 @@
 # schematic/node_item.py
 
-from PySide6.QtWidgets import QGraphicsEllipseItem, QGraphicsTextItem
+from PySide6.QtWidgets import QGraphicsEllipseItem, QGraphicsItem, QStyleOptionGraphicsItem
 from PySide6.QtGui import QPen, QBrush, QColor
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QRectF
+
+from schematic.symbol_item import LOD_ROTULO, fonte_rotulo, metricas_rotulo
 
 class NodeItem(QGraphicsEllipseItem):
     def __init__(self, name, x, y, radius=10):
         # O retângulo que define a elipse
         super().__init__(-radius, -radius, 2 * radius, 2 * radius)
+        self.name = name
         self.setPos(x, y) # Define a posição do item na cena
 
         # Propriedades visuais do círculo
         self.setBrush(QBrush(QColor("red")))
         self.setPen(QPen(Qt.PenStyle.NoPen))
         self.setZValue(1) # Garante que o nó fique na frente dos fios
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+
+        # Texto com o nome do nó, centralizado no círculo (desenhado em paint)
+        metricas = metricas_rotulo()
+        largura, altura = metricas.horizontalAdvance(name) + 2, metricas.height()
+        self.label_rect = QRectF(-largura / 2, -altura / 2, largura, altura)
+
+    def boundingRect(self):
+        return super().boundingRect().united(self.label_rect)
 
-        # Texto com o nome do nó
-        self.label = QGraphicsTextItem(name, self)
-        self.label.setDefaultTextColor(QColor("white"))
-        
-        # Centraliza o texto
-        label_rect = self.label.boundingRect()
-        self.label.setPos(-label_rect.width() / 2, -label_rect.height() / 2)
\ No newline at end of file
+    def paint(self, painter, option, widget=None):
+        super().paint(painter, option, widget)
+        # Com o zoom afastado o nome fica ilegível: só o círculo é desenhado
+        if QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform()) >= LOD_ROTULO:
+            painter.setPen(QColor("white"))
+            painter.setFont(fonte_rotulo())
+            painter.drawText(self.label_rect, Qt.AlignmentFlag.AlignCenter, self.name)
@@ -1,14 +1,13 @@
 # schematic/resistor_item.py
 
-from PySide6.QtWidgets import QGraphicsPathItem
 from PySide6.QtGui import QPen, QColor, QPainterPath
 from PySide6.QtCore import QPointF
 
-class ResistorItem(QGraphicsPathItem):
+from schematic.symbol_item import SymbolItem
+
+class ResistorItem(SymbolItem):
     def __init__(self, name, value_str):
-        super().__init__()
-        self.name = name
-        self.value_str = value_str
+        super().__init__(name, value_str)
         
         path = QPainterPath()
         path.moveTo(-30, 0); path.lineTo(-25, 0); path.lineTo(-20, 10); path.lineTo(-10, -10)
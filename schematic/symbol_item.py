@@ -0,0 +1,141 @@
+# schematic/symbol_item.py
+
+import math
+
+from PySide6.QtWidgets import QGraphicsPathItem, QGraphicsItem, QStyleOptionGraphicsItem
+from PySide6.QtGui import QPen, QColor, QPainterPath, QFont, QFontMetricsF, QTransform
+from PySide6.QtCore import Qt, QLineF, QRectF
+
+# Nível de detalhe (pixels de tela por unidade da cena): abaixo de LOD_SIMBOLO o
+# símbolo vira uma linha entre os terminais; abaixo de LOD_ROTULO os rótulos somem
+LOD_SIMBOLO = 0.25
+LOD_ROTULO = 0.6
+
+CANETA_FIO = QPen(QColor(160, 160, 160), 1)
+COR_ROTULO = QColor(220, 220, 220)
+
+_fonte_rotulo = None
+_metricas_rotulo = None
+
+def fonte_rotulo():
+    # Criada sob demanda: QFont exige a QApplication já construída
+    global _fonte_rotulo, _metricas_rotulo
+    if _fonte_rotulo is None:
+        _fonte_rotulo = QFont()
+        _fonte_rotulo.setPointSizeF(8)
+        _metricas_rotulo = QFontMetricsF(_fonte_rotulo)
+    return _fonte_rotulo
+
+def metricas_rotulo():
+    fonte_rotulo()
+    return _metricas_rotulo
+
+def _simbolo_terra():
+    caminho = QPainterPath()
+    caminho.moveTo(-12, 0); caminho.lineTo(12, 0)
+    caminho.moveTo(-8, 5); caminho.lineTo(8, 5)
+    caminho.moveTo(-4, 10); caminho.lineTo(4, 10)
+    return caminho
+
+SIMBOLO_TERRA = _simbolo_terra()
+
+class SymbolItem(QGraphicsPathItem):
+    """
+    Base dos símbolos de componentes. Além do símbolo, o próprio item desenha os
+    fios até os nós, os símbolos de terra e o rótulo (nome e valor), o que evita
+    um item por fio. O item fica em cache na resolução da tela e, com o zoom
+    afastado, desenha só uma linha entre os terminais e omite o rótulo.
+    """
+    def __init__(self, name, value_str):
+        super().__init__()
+        self.name = name
+        self.value_str = value_str
+        self.tipo = None
+        self._fios = []
+        self._terra = QPainterPath()
+        self._tamanho_rotulo = None
+        self._rotulo = QRectF()  # No referencial sem rotação, centrado no item
+        self._limites = None  # Recalculado sob demanda em boundingRect
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+
+    def get_terminals(self):
+        raise NotImplementedError
+
+    def setPath(self, path):
+        super().setPath(path)
+        self._invalidar_limites()
+
+    def definir_ligacoes(self, ponta1, ponta2, terra1=False, terra2=False):
+        """
+        Fios dos terminais até as extremidades (coordenadas do item, já com a
+        rotação definida); extremidades no terra recebem o símbolo de terra.
+        """
+        terminal1, terminal2 = self.get_terminals()
+        self._fios = [QLineF(terminal1, ponta1), QLineF(terminal2, ponta2)]
+        self._terra = QPainterPath()
+        rotacao = QTransform().rotate(-self.rotation())
+        for ponta, eh_terra in ((ponta1, terra1), (ponta2, terra2)):
+            if eh_terra:
+                self._terra.addPath(rotacao.map(SIMBOLO_TERRA).translated(ponta))
+        self._atualizar_rotulo()
+        self._invalidar_limites()
+        self.update()
+
+    def definir_valor(self, value_str):
+        self.value_str = value_str
+        self.setToolTip(f"{self.name}: {value_str}")
+        metricas = metricas_rotulo()
+        self._tamanho_rotulo = (max(metricas.horizontalAdvance(self.name), metricas.horizontalAdvance(value_str)) + 2,
+                                2 * metricas.lineSpacing())
+        self._atualizar_rotulo()
+        self.update()
+
+    def _atualizar_rotulo(self):
+        # O rótulo fica fora do símbolo, do lado do -y local, mas sempre na horizontal
+        if self._tamanho_rotulo is None:
+            return
+        largura, altura = self._tamanho_rotulo
+        angulo = math.radians(self.rotation())
+        ux, uy = math.sin(angulo), -math.cos(angulo)
+        distancia = -self.path().boundingRect().top() + 4
+        cx, cy = ux * (distancia + largura / 2), uy * (distancia + altura / 2)
+        self._rotulo = QRectF(cx - largura / 2, cy - altura / 2, largura, altura)
+        self._invalidar_limites()
+
+    def _texto_rotulo(self):
+        return f"{self.name}\n{self.value_str}"
+
+    def _invalidar_limites(self):
+        self.prepareGeometryChange()
+        self._limites = None
+
+    def boundingRect(self):
+        if self._limites is None:
+            self._limites = self._calcular_limites()
+        return self._limites
+
+    def _calcular_limites(self):
+        limites = self.path().boundingRect().adjusted(-2, -2, 2, 2)  # Metade da caneta e folga
+        for fio in self._fios:
+            limites = limites.united(QRectF(fio.p1(), fio.p2()).normalized().adjusted(-1, -1, 1, 1))
+        limites = limites.united(self._terra.boundingRect().adjusted(-1, -1, 1, 1))
+        if not self._rotulo.isEmpty():
+            limites = limites.united(QTransform().rotate(-self.rotation()).mapRect(self._rotulo))
+        return limites
+
+    def paint(self, painter, option, widget=None):
+        detalhe = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        painter.setPen(CANETA_FIO)
+        painter.drawLines(self._fios)
+        if not self._terra.isEmpty():
+            painter.drawPath(self._terra)
+        painter.setPen(self.pen())
+        if detalhe < LOD_SIMBOLO:
+            painter.drawLine(*self.get_terminals())
+            return
+        painter.drawPath(self.path())
+        if detalhe >= LOD_ROTULO and not self._rotulo.isEmpty():
+            painter.setPen(COR_ROTULO)
+            painter.setFont(fonte_rotulo())
+            painter.rotate(-self.rotation())
+            painter.drawText(self._rotulo, Qt.AlignmentFlag.AlignCenter, self._texto_rotulo())
@@ -0,0 +1,44 @@
+# tests/test_benchmarks.py
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.comparar import comparar
+from benchmarks.geradores import GERADORES
+from core.circuito import CompiledCircuit
+from netlist_parser.parser import parse_netlist_linhas
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.mark.parametrize("gerador", list(GERADORES))
+def test_geradores_deterministicos_e_no_tamanho(gerador):
+    linhas = GERADORES[gerador](2000)
+    assert linhas == GERADORES[gerador](2000)
+    tabela = parse_netlist_linhas(linhas)
+    assert 1000 <= len(tabela) <= 3000
+    CompiledCircuit(tabela).resolver(60)
+
+def execucao(tempo, memoria):
+    etapas = {"solucao": {"tempo": tempo, "memoria_pico": memoria}}
+    return {"casos": [{"gerador": "escada_rc", "tamanho": 1000, "etapas": etapas}]}
+
+def test_comparacao_respeita_limites_e_minimos():
+    base = execucao(0.100, 10 << 20)
+    regressoes = lambda atual: {c["grandeza"] for c in comparar(base, atual) if c["regressao"]}
+    assert regressoes(execucao(0.120, 10 << 20)) == set()
+    assert regressoes(execucao(0.200, 12 << 20)) == {"tempo", "memoria_pico"}
+    # Razão alta, mas diferença absoluta abaixo do mínimo: ruído
+    assert not comparar(execucao(0.001, 1000), execucao(0.004, 5000))[0]["regressao"]
+
+def test_janela_abre_sem_carregar_modulos_pesados():
+    pytest.importorskip("PySide6")
+    codigo = ("import sys\nfrom PySide6.QtWidgets import QApplication\napp = QApplication([])\n"
+              "import main\nmain.MainWindow()\n"
+              "print(','.join(m for m in ('scipy', 'matplotlib', 'core.analise') if m in sys.modules))")
+    saida = subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, capture_output=True, text=True, timeout=120,
+                           env={**os.environ, "QT_QPA_PLATFORM": "offscreen"})
+    assert saida.returncode == 0, saida.stderr
+    assert saida.stdout.strip() == ""
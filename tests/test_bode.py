@@ -0,0 +1,28 @@
+# tests/test_bode.py
+
+import warnings
+
+import numpy as np
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from matplotlib.figure import Figure
+
+from graphics.bode import plotar_bode
+
+def dados(frequencias):
+    return [{"nome": "V(s)", "valor": 1 / (1 + 1j * frequencias / 100)}]
+
+def test_troca_de_escala_sem_limites_nao_positivos():
+    # Eixos compartilhados como no MplCanvas da aba Bode
+    ax_mag, ax_fase = Figure().subplots(2, 1, sharex=True)
+    varreduras = [(np.linspace(0, 1000, 11), False), (np.logspace(0, 4, 20), True),
+                  (np.array([100.0]), True), (np.linspace(0, 1000, 11), True)]
+    with warnings.catch_warnings():
+        warnings.filterwarnings("error", message="Attempt to set non-positive")
+        for frequencias, escala_log in varreduras:
+            plotar_bode(ax_mag, ax_fase, frequencias, dados(frequencias), escala_log=escala_log)
+            ax_mag.figure.canvas.draw()
+            if escala_log:
+                assert ax_fase.get_xscale() == 'log' and ax_mag.get_xlim()[0] > 0
@@ -0,0 +1,40 @@
+# tests/test_cache.py
+
+import os
+
+import pytest
+
+from core import cache
+from core.cache import AvisoCacheDisco, CacheResultados
+
+def test_falha_de_gravacao_vira_aviso_sem_saida(tmp_path, monkeypatch, capsys):
+    resultados = CacheResultados(diretorio=str(tmp_path))
+    def disco_cheio(valor, arquivo, protocol=None):
+        arquivo.write(b"parcial")
+        raise OSError(28, "No space left on device")
+    monkeypatch.setattr(cache.pickle, "dump", disco_cheio)
+
+    with pytest.warns(AvisoCacheDisco, match="Erro ao gravar cache em disco"):
+        resultados.guardar("chave", {"valor": 1})
+
+    assert capsys.readouterr().out == ""
+    assert resultados.estatisticas()["erros_disco"] == 1
+    assert os.listdir(tmp_path) == []
+    # O resultado continua disponível pelo cache em memória
+    assert resultados.obter("chave") == {"valor": 1}
+
+def test_gravacao_e_leitura_do_disco(tmp_path):
+    CacheResultados(diretorio=str(tmp_path)).guardar("chave", [1, 2, 3])
+    novo = CacheResultados(diretorio=str(tmp_path))
+    assert novo.obter("chave") == [1, 2, 3]
+    assert novo.estatisticas()["acertos_disco"] == 1
+    assert novo.estatisticas()["erros_disco"] == 0
+
+def test_ordenacao_faz_parte_da_chave():
+    from core.analise import analisar_netlist
+    cache = CacheResultados()
+    texto = "V1 a 0 AC 1 0\nR1 a b 1k\nC1 b 0 1u\n"
+    amd = analisar_netlist(texto, 60, 'esparso', cache=cache, ordenacao='amd')
+    rcm = analisar_netlist(texto, 60, 'esparso', cache=cache, ordenacao='rcm')
+    assert amd["circuito"].ordenacao == 'amd' and rcm["circuito"].ordenacao == 'rcm'
+    assert analisar_netlist(texto, 60, 'esparso', cache=cache, ordenacao='amd') is amd
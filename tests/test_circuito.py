@@ -0,0 +1,94 @@
+# tests/test_circuito.py
+
+import numpy as np
+import pytest
+
+from benchmarks.geradores import grade_resistiva, malha_aleatoria
+from core.analise import montar_matriz_anm
+from core.circuito import CompiledCircuit
+from core.ordenacao import ESTRATEGIAS
+from netlist_parser.parser import iterar_netlist, parse_netlist_linhas
+
+def anm_original(componentes, frequencia):
+    """
+    montar_matriz_anm da versão original (ANM densa montada componente a
+    componente), como referência: tensões nodais e correntes dos componentes.
+    """
+    w = 2 * np.pi * frequencia
+    fontes = [c for c in componentes if c['tipo'] in ('V', 'E', 'H')]
+    nos = sorted({c[k] for c in componentes for k in ('n1', 'n2', 'nc1', 'nc2') if k in c} - {'0'})
+    mapa = {no: i for i, no in enumerate(nos)}
+    N = len(nos)
+    ramo = {f['nome']: N + k for k, f in enumerate(fontes)}
+    A = np.zeros((N + len(fontes), N + len(fontes)), dtype=complex)
+    z = np.zeros(N + len(fontes), dtype=complex)
+
+    def somar(linha, coluna, valor):
+        if linha is not None and coluna is not None:
+            A[linha, coluna] += valor
+
+    for c in componentes:
+        tipo, i1, i2 = c['tipo'], mapa.get(c['n1']), mapa.get(c['n2'])
+        if tipo in ('R', 'L', 'C', 'Z'):
+            y = {'R': 1 / c['valor'], 'Z': 1 / c['valor'], 'L': 1 / (1j * w * c['valor']), 'C': 1j * w * c['valor']}[tipo]
+            somar(i1, i1, y); somar(i2, i2, y); somar(i1, i2, -y); somar(i2, i1, -y)
+        elif tipo == 'G':
+            c1, c2 = mapa.get(c['nc1']), mapa.get(c['nc2'])
+            somar(i1, c1, -c['valor']); somar(i1, c2, c['valor']); somar(i2, c1, c['valor']); somar(i2, c2, -c['valor'])
+        elif tipo == 'F':
+            somar(i1, ramo[c['controle']], c['valor']); somar(i2, ramo[c['controle']], -c['valor'])
+        else:
+            k = ramo[c['nome']]
+            somar(i1, k, 1); somar(k, i1, 1); somar(i2, k, -1); somar(k, i2, -1)
+            if tipo == 'V':
+                z[k] = c['valor'] * np.exp(1j * np.deg2rad(c.get('fase', 0.0)))
+            elif tipo == 'E':
+                somar(k, mapa.get(c['nc1']), -c['valor']); somar(k, mapa.get(c['nc2']), c['valor'])
+            else:
+                somar(k, ramo[c['controle']], -c['valor'])
+    x = np.linalg.solve(A, z)
+
+    tensao = lambda no: x[mapa[no]] if no in mapa else 0
+    correntes = {}
+    for c in componentes:
+        tipo, v = c['tipo'], tensao(c['n1']) - tensao(c['n2'])
+        if tipo in ('V', 'E', 'H'):
+            correntes[c['nome']] = -x[ramo[c['nome']]]
+        elif tipo == 'G':
+            correntes[c['nome']] = c['valor'] * (tensao(c['nc1']) - tensao(c['nc2']))
+        elif tipo == 'F':
+            correntes[c['nome']] = c['valor'] * -x[ramo[c['controle']]]
+        else:
+            correntes[c['nome']] = v / {'R': c['valor'], 'Z': c['valor'], 'L': 1j * w * c['valor'],
+                                        'C': 1 / (1j * w * c['valor'])}[tipo]
+    return {no: x[i] for no, i in mapa.items()}, correntes
+
+# R, L e C com fontes E, G, F e H
+MALHA = malha_aleatoria(300)
+
+@pytest.mark.parametrize("metodo", ["denso", "esparso"])
+def test_compilado_igual_a_anm_original(metodo):
+    dicts = list(iterar_netlist(MALHA))
+    tensoes_ref, correntes_ref = anm_original(dicts, 60)
+    # A tabela do parser e a lista de dicts do formato antigo dão o mesmo resultado
+    for componentes in (parse_netlist_linhas(MALHA), dicts):
+        tensoes, correntes, *_ = montar_matriz_anm(componentes, 60, metodo)
+        for no, valor in tensoes_ref.items():
+            assert tensoes[no] == pytest.approx(valor, rel=1e-9, abs=1e-12)
+        for nome, valor in correntes_ref.items():
+            assert correntes[nome] == pytest.approx(valor, rel=1e-9, abs=1e-12)
+
+def test_esparso_igual_ao_denso():
+    tabela = parse_netlist_linhas(MALHA)
+    denso = CompiledCircuit(tabela, 'denso').resolver(1e3)
+    esparso = CompiledCircuit(tabela, 'esparso').resolver(1e3)
+    np.testing.assert_allclose(esparso.solucao, denso.solucao, rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(esparso.potencias, denso.potencias, rtol=1e-9, atol=1e-12)
+
+@pytest.mark.parametrize("linhas", [MALHA, grade_resistiva(2000)], ids=["malha", "grade"])
+def test_ordenacoes_iguais_a_natural(linhas):
+    tabela = parse_netlist_linhas(linhas)
+    natural = CompiledCircuit(tabela, 'esparso', ordenacao='natural').resolver(60).solucao
+    for estrategia in ESTRATEGIAS:
+        solucao = CompiledCircuit(tabela, 'esparso', ordenacao=estrategia).resolver(60).solucao
+        np.testing.assert_allclose(solucao, natural, rtol=1e-8, atol=1e-12, err_msg=estrategia)
@@ -0,0 +1,45 @@
+# tests/test_contingencia.py
+
+import numpy as np
+import pytest
+
+from benchmarks.geradores import malha_aleatoria
+from core.circuito import CompiledCircuit
+from core.contingencia import AnaliseIncremental, analisar_contingencias
+from netlist_parser.parser import parse_netlist_linhas
+
+MALHA = malha_aleatoria(300)
+
+def sem(linhas, nome):
+    return [linha for linha in linhas if linha.split()[0] != nome]
+
+@pytest.fixture(scope="module")
+def base():
+    return AnaliseIncremental(CompiledCircuit(parse_netlist_linhas(MALHA)), 60)
+
+def test_valores_alterados_iguais_a_nova_solucao(base):
+    c = base.circuito
+    alterados = {nome: c.valores[c.indice_componente[nome]] * fator
+                 for nome, fator in (("R5", 3.0), ("RX7", 0.5), ("V1", 2.0))
+                 if nome in c.indice_componente}
+    linhas = [c.indice_componente[nome] for nome in alterados]
+    completo = c.com_valores(linhas, list(alterados.values())).resolver(60)
+    np.testing.assert_allclose(base.resolver(valores=alterados).solucao, completo.solucao, rtol=1e-8, atol=1e-12)
+
+def test_remover_e_adicionar_iguais_a_netlist_editada(base):
+    nome = next(linha.split()[0] for linha in MALHA if linha.startswith("RX"))
+    editada = sem(MALHA, nome) + ["RN m3 m7 47"]
+    completo = CompiledCircuit(parse_netlist_linhas(editada)).resolver(60)
+    incremental = base.resolver(remover=[nome], adicionar=[{"tipo": "R", "nome": "RN", "n1": "m3", "n2": "m7", "valor": 47}])
+    for no in completo.nos:
+        assert incremental.tensoes_nos[incremental.nos.index(no)] == pytest.approx(
+            completo.tensoes_nos[completo.nos.index(no)], rel=1e-8, abs=1e-12)
+
+def test_n_menos_1_igual_a_resolver_cada_contingencia(base):
+    elementos = [linha.split()[0] for linha in MALHA if linha[:2] in ("RX", "RC")][:15]
+    resultado = analisar_contingencias(base, 60, elementos=elementos, tamanho_bloco=4)
+    for k, nome in enumerate(elementos):
+        completo = CompiledCircuit(parse_netlist_linhas(sem(MALHA, nome))).resolver(60)
+        esperadas = np.array([completo.tensoes_nos[completo.nos.index(s[2:-1])] for s in resultado.sinais])
+        np.testing.assert_allclose(resultado.base + resultado.variacoes[k], esperadas, rtol=1e-7, atol=1e-10)
+    assert not resultado.singular.any()
@@ -0,0 +1,101 @@
+# tests/test_exportacao.py
+
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from core.circuito import CompiledCircuit
+from core.exportacao import colunas_resultado, exportar_resultado, exportar_transiente, exportar_varredura
+from core.transiente import analisar_transiente
+from core.varredura import analisar_varredura_ac
+from netlist_parser.parser import parse_netlist_linhas
+
+LINHAS = ["V1 a 0 AC 10 30", "R1 a b 1k", "C1 b 0 1u", "L1 b c 10m", "R2 c 0 50"]
+FORMATOS = ["csv", "jsonl", "npz"]
+
+@pytest.fixture(scope="module")
+def circuito():
+    return CompiledCircuit(parse_netlist_linhas(LINHAS))
+
+def ler_csv(caminho):
+    with open(caminho, newline='', encoding='utf-8') as arquivo:
+        return list(csv.DictReader(arquivo))
+
+def ler_jsonl(caminho):
+    with open(caminho, encoding='utf-8') as arquivo:
+        return [json.loads(linha) for linha in arquivo]
+
+@pytest.mark.parametrize("formato", FORMATOS)
+def test_resultado_ida_e_volta(circuito, tmp_path, formato):
+    resultado = circuito.resolver(60)
+    elementos, nomes, grandezas, valores = colunas_resultado(resultado)
+    caminho = tmp_path / f"resultado.{formato}"
+    exportar_resultado(resultado, caminho)
+    if formato == "csv":
+        linhas = ler_csv(caminho)
+        lidos = np.array([complex(float(l["real"]), float(l["imag"])) for l in linhas])
+        chaves = [(l["elemento"], l["nome"], l["grandeza"]) for l in linhas]
+    elif formato == "jsonl":
+        linhas = ler_jsonl(caminho)
+        lidos = np.array([complex(l["real"], l["imag"]) for l in linhas])
+        chaves = [(l["elemento"], l["nome"], l["grandeza"]) for l in linhas]
+        assert all(l["frequencia_hz"] == 60 for l in linhas)
+    else:
+        with np.load(caminho) as npz:
+            lidos = npz["valor"]
+            chaves = list(zip(npz["elemento"].tolist(), npz["nome"].tolist(), npz["grandeza"].tolist()))
+    assert chaves == list(zip(elementos, nomes, grandezas))
+    # Precisão total: os valores voltam exatamente
+    np.testing.assert_array_equal(lidos, valores)
+
+@pytest.mark.parametrize("formato", FORMATOS)
+@pytest.mark.parametrize("do_circuito", [False, True])
+def test_varredura_ida_e_volta(circuito, tmp_path, formato, do_circuito):
+    frequencias = np.logspace(1, 4, 37)
+    varredura = analisar_varredura_ac(circuito, frequencias)
+    sinais = varredura.sinais()
+    caminho = tmp_path / f"varredura.{formato}"
+    if do_circuito:
+        # Resolvida e gravada em blocos, sem a varredura inteira na memória
+        exportar_varredura(circuito, caminho, frequencias=frequencias, tamanho_bloco=8)
+    else:
+        exportar_varredura(varredura, caminho)
+    if formato == "csv":
+        lidos = {}
+        for l in ler_csv(caminho):
+            lidos.setdefault(l["sinal"], []).append(complex(float(l["real"]), float(l["imag"])))
+    elif formato == "jsonl":
+        linhas = ler_jsonl(caminho)
+        assert [l["frequencia_hz"] for l in linhas] == frequencias.tolist()
+        lidos = {s: [complex(*l["sinais"][s]) for l in linhas] for s in linhas[0]["sinais"]}
+    else:
+        with np.load(caminho) as npz:
+            np.testing.assert_array_equal(npz["frequencia_hz"], frequencias)
+            lidos = dict(zip(npz["sinal"].tolist(), npz["valores"].T))
+    assert set(lidos) == set(sinais)
+    for nome, valores in sinais.items():
+        np.testing.assert_allclose(lidos[nome], valores, rtol=1e-12, atol=1e-15)
+
+@pytest.mark.parametrize("formato", FORMATOS)
+def test_transiente_ida_e_volta(circuito, tmp_path, formato):
+    resultado = analisar_transiente(circuito, 1e-5, 2e-3, 'TRAP')
+    sinais = resultado.sinais()
+    caminho = tmp_path / f"transiente.{formato}"
+    exportar_transiente(circuito, caminho, passo=1e-5, t_final=2e-3, metodo='TRAP')
+    if formato == "csv":
+        lidos = {}
+        for l in ler_csv(caminho):
+            lidos.setdefault(l["sinal"], []).append(float(l["valor"]))
+    elif formato == "jsonl":
+        linhas = ler_jsonl(caminho)
+        np.testing.assert_allclose([l["tempo_s"] for l in linhas], resultado.tempos)
+        lidos = {s: [l["sinais"][s] for l in linhas] for s in linhas[0]["sinais"]}
+    else:
+        with np.load(caminho) as npz:
+            np.testing.assert_allclose(npz["tempo_s"], resultado.tempos)
+            lidos = dict(zip(npz["sinal"].tolist(), npz["valores"].T))
+    assert set(lidos) == set(sinais)
+    for nome, valores in sinais.items():
+        np.testing.assert_allclose(lidos[nome], valores, rtol=1e-12, atol=1e-15)
@@ -0,0 +1,23 @@
+# tests/test_harmonicos.py
+
+import numpy as np
+import pytest
+
+from core.analise import analisar_netlist
+
+def corrente(analise, nome):
+    resultado = analise["resultado"]
+    return resultado.correntes[resultado.componentes.index(nome)]
+
+def test_fonte_em_outra_frequencia_resolvida_na_propria():
+    analise = analisar_netlist("V1 a 0 AC 10 0 FREQ 50\nR1 a b 10\nL1 b 0 10m\n", 60)
+    assert analise["resultado"].frequencia == 50
+    assert corrente(analise, "R1") == pytest.approx(10 / (10 + 2j * np.pi * 50 * 10e-3))
+
+def test_tabela_so_com_as_fontes_da_fundamental():
+    # V2 (50 Hz) não entra na solução de 60 Hz, só no espectro
+    analise = analisar_netlist("V1 a 0 AC 10 0\nR1 a b 10\nV2 b 0 AC 5 0 FREQ 50\n", 60)
+    assert analise["resultado"].frequencia == 60
+    assert corrente(analise, "R1") == pytest.approx(1.0)
+    espectro = analise["harmonicos"].sinais()["I(R1)"]
+    np.testing.assert_allclose(espectro, [-0.5, 1.0])
@@ -0,0 +1,20 @@
+# tests/test_modelo_resultados.py
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from core.circuito import CompiledCircuit
+from interface.modelo_resultados import ModeloResultados
+from netlist_parser.parser import parse_netlist_linhas
+
+def test_linhas_separadoras_seguem_filtro_e_ordenacao():
+    circuito = CompiledCircuit(parse_netlist_linhas(["V1 a 0 AC 1 0", "R1 a b 1k", "C1 b 0 1u", "R2 b 0 2k"]))
+    modelo = ModeloResultados()
+    modelo.definir_resultado(circuito.resolver(60))
+    for filtro in ("", "r2"):
+        modelo.definir_filtro(filtro)
+        esperadas = [linha for linha in range(modelo.rowCount()) if modelo.eh_separador(linha)]
+        assert modelo.linhas_separadoras().tolist() == esperadas and esperadas
+    modelo.sort(2)
+    assert modelo.linhas_separadoras().tolist() == [l for l in range(modelo.rowCount()) if modelo.eh_separador(l)]
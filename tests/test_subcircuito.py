@@ -0,0 +1,66 @@
+# tests/test_subcircuito.py
+
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from core import subcircuito
+from core.circuito import CompiledCircuit
+from netlist_parser.parser import parse_netlist_linhas
+
+NETLIST = [
+    ".SUBCKT filtro e s",
+    "R1 e m 10",
+    "L1 m s 5m",
+    "C1 s 0 10u",
+    "R2 m 0 1k",
+    ".ENDS",
+    "V1 a 0 AC 10 0",
+    "X1 a b filtro",
+    "X2 b c filtro",
+    "RL c 0 50",
+]
+
+def compilado():
+    circuito = CompiledCircuit(parse_netlist_linhas(NETLIST))
+    return circuito, circuito.subcircuitos[0][0]
+
+def test_admitancias_concorrentes_iguais_as_seriais():
+    frequencias = np.linspace(10, 5000, 400)
+    subcircuito._compilados.clear()
+    _, definicao = compilado()
+    seriais = np.array([definicao.admitancia(f) for f in frequencias])
+
+    subcircuito._compilados.clear()
+    circuitos = [compilado()[1] for _ in range(8)]
+    assert all(c is circuitos[0] for c in circuitos)
+    with ThreadPoolExecutor(8) as pool:
+        # Cada thread percorre as frequências numa ordem diferente, sem cache prévio
+        ordens = [np.random.default_rng(k).permutation(frequencias.size) for k in range(8)]
+        resultados = list(pool.map(lambda ordem: {int(j): circuitos[0].admitancia(frequencias[j]) for j in ordem},
+                                   ordens))
+    for resultado in resultados:
+        np.testing.assert_allclose(np.array([resultado[j] for j in range(frequencias.size)]), seriais, rtol=1e-12)
+
+def test_circuito_com_subcircuito_serializavel():
+    circuito, definicao = compilado()
+    esperado = circuito.resolver(60).solucao
+    copia = pickle.loads(pickle.dumps(circuito))
+    np.testing.assert_allclose(copia.resolver(60).solucao, esperado)
+    assert copia.subcircuitos[0][0].admitancia(60) is not None
+
+def test_tran_com_subcircuitos_vira_aviso():
+    from core.analise import AVISO_TRAN_SUBCIRCUITOS, analisar_netlist
+    analise = analisar_netlist("\n".join(NETLIST + [".TRAN 10u 1m"]), 60)
+    assert analise["transiente"] is None
+    assert analise["avisos"] == [AVISO_TRAN_SUBCIRCUITOS]
+    assert analise["resultado"] is not None
+
+def test_cli_grava_o_resto_da_netlist_com_subcircuitos_e_tran(tmp_path):
+    from core.cli import analisar_arquivo
+    caminho = tmp_path / "filtro.net"
+    caminho.write_text("\n".join(NETLIST + [".TRAN 10u 1m"]), encoding="utf-8")
+    saida = analisar_arquivo(str(caminho), 60, diretorio_transiente=str(tmp_path))
+    assert saida["status"] == "ok" and saida["linhas"]
+    assert saida["transiente"] is None and len(saida["avisos"]) == 1
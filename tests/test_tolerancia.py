@@ -0,0 +1,48 @@
+# tests/test_tolerancia.py
+
+import itertools
+
+import numpy as np
+import pytest
+
+from core.circuito import CompiledCircuit
+from core.tolerancia import amostrar_valores, analisar_cantos, analisar_monte_carlo
+from netlist_parser.parser import parse_netlist_linhas
+
+FILTRO = ["V1 a 0 AC 10 0", "R1 a b 1k tol=5%", "C1 b 0 1u tol=10%", "R2 b c 2k tol=1%", "L1 c 0 100m tol=20%"]
+SINAIS = ["V(b)", "I(R1)", "P(R2)"]
+
+def um_a_um(circuito, valores, sinal):
+    # Referência: cada amostra resolvida sozinha, com as grandezas do ResultadoAnalise
+    grandeza, alvo = sinal[0], sinal[2:-1]
+    saida = []
+    for linha in valores:
+        r = circuito.resolver(60, linha)
+        if alvo in r.nos:
+            saida.append(abs(r.tensoes_nos[r.nos.index(alvo)]))
+        else:
+            k = r.componentes.index(alvo)
+            saida.append(r.potencias[k].real if grandeza == 'P' else abs(r.correntes[k]))
+    return np.array(saida)
+
+@pytest.mark.parametrize("metodo", ["denso", "esparso"])
+def test_monte_carlo_em_lote_igual_a_amostras_isoladas(metodo):
+    circuito = CompiledCircuit(parse_netlist_linhas(FILTRO), metodo)
+    resultado = analisar_monte_carlo(circuito, 60, 200, SINAIS, semente=3, tamanho_bloco=64)
+    valores = amostrar_valores(circuito, 200, semente=3)
+    for sinal in SINAIS:
+        np.testing.assert_allclose(resultado.amostras[sinal], um_a_um(circuito, valores, sinal), rtol=1e-10)
+        assert resultado.nominal[sinal] == pytest.approx(um_a_um(circuito, circuito.valores[None], sinal)[0])
+
+@pytest.mark.parametrize("max_enumeracao", [10, 0])
+def test_cantos_iguais_a_enumeracao_completa(max_enumeracao):
+    circuito = CompiledCircuit(parse_netlist_linhas(FILTRO))
+    cantos = analisar_cantos(circuito, 60, SINAIS, max_enumeracao=max_enumeracao)
+    direcoes = np.array(list(itertools.product([-1.0, 1.0], repeat=4)))
+    valores = np.tile(circuito.valores, (len(direcoes), 1))
+    valores[:, 1:] *= 1 + circuito.tolerancias[1:] * direcoes
+    for sinal in SINAIS:
+        todos = um_a_um(circuito, valores, sinal)
+        # Por sensibilidade (max_enumeracao=0) o pior caso vale para este circuito monotônico
+        assert cantos[sinal]["minimo"] == pytest.approx(todos.min(), rel=1e-9)
+        assert cantos[sinal]["maximo"] == pytest.approx(todos.max(), rel=1e-9)
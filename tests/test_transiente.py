@@ -0,0 +1,103 @@
+# tests/test_transiente.py
+
+import numpy as np
+import pytest
+
+from core.circuito import CompiledCircuit
+from core.transiente import SimulacaoTransiente, analisar_transiente
+from netlist_parser.parser import parse_netlist_linhas
+
+RC = ["V1 a 0 DC 1", "R1 a b 1k", "C1 b 0 1u"]  # tau = 1 ms
+RL = ["V1 a 0 DC 1", "R1 a b 100", "L1 b 0 10m"]  # tau = 0.1 ms
+
+def simular(linhas, passo, t_final, metodo, por_passo=False):
+    simulacao = SimulacaoTransiente(CompiledCircuit(parse_netlist_linhas(linhas)))
+    if por_passo:
+        # Força a substituição com a LU a cada passo, sem a forma reduzida
+        simulacao.resposta_reativa = lambda metodo, passo: None
+    return analisar_transiente(simulacao, passo, t_final, metodo)
+
+def erro_rc(resultado):
+    v = resultado.tensoes_nos[:, resultado.nos.index('b')]
+    return np.abs(v - (1 - np.exp(-resultado.tempos / 1e-3))).max()
+
+def erro_rl(resultado):
+    i = resultado.correntes[:, resultado.componentes.index('L1')]
+    return np.abs(i - (1 - np.exp(-resultado.tempos / 1e-4)) / 100).max()
+
+@pytest.mark.parametrize("metodo", ["BE", "TRAP"])
+@pytest.mark.parametrize("por_passo", [False, True])
+def test_instante_zero_em_repouso(metodo, por_passo):
+    rc = simular(RC, 1e-5, 1e-3, metodo, por_passo)
+    assert rc.tempos[0] == 0.0 and rc.tempos[1] == pytest.approx(1e-5)
+    assert rc.tensoes_nos[0, rc.nos.index('a')] == pytest.approx(1.0)
+    assert rc.tensoes_nos[0, rc.nos.index('b')] == 0.0
+    assert rc.correntes[0, rc.componentes.index('C1')] == pytest.approx(1e-3)
+
+    rl = simular(RL, 1e-6, 1e-4, metodo, por_passo)
+    assert rl.correntes[0, rl.componentes.index('L1')] == 0.0
+    assert rl.tensoes_nos[0, rl.nos.index('b')] == pytest.approx(1.0)
+
+@pytest.mark.parametrize("por_passo", [False, True])
+def test_trapezio_converge_com_segunda_ordem(por_passo):
+    for linhas, erro, t_final in ((RC, erro_rc, 5e-3), (RL, erro_rl, 5e-4)):
+        grosso = erro(simular(linhas, t_final / 500, t_final, 'TRAP', por_passo))
+        fino = erro(simular(linhas, t_final / 5000, t_final, 'TRAP', por_passo))
+        assert grosso / fino == pytest.approx(100, rel=0.05)
+
+def test_euler_implicito_converge_com_primeira_ordem():
+    grosso = erro_rc(simular(RC, 1e-5, 5e-3, 'BE'))
+    fino = erro_rc(simular(RC, 1e-6, 5e-3, 'BE'))
+    assert grosso / fino == pytest.approx(10, rel=0.05)
+
+# Circuitos com o t = 0 em repouso singular
+SERIE_L = ["V1 a 0 DC 1", "R1 a b 100", "L1 b c 4m", "L2 c 0 6m"]  # L = 10 mH, tau = 0.1 ms
+PARALELO_C = ["V1 a 0 SIN(0 1 1k)", "C1 a 0 1u", "R1 a 0 1k"]  # I(C1) = C·dV/dt
+
+@pytest.mark.parametrize("por_passo", [False, True])
+def test_indutores_em_serie_partem_do_repouso(por_passo):
+    erros = []
+    for passo in (1e-6, 1e-7):
+        resultado = simular(SERIE_L, passo, 5e-4, 'TRAP', por_passo)
+        i = resultado.correntes[:, resultado.componentes.index('L1')]
+        assert i[0] == pytest.approx(0.0, abs=1e-9)
+        # A tensão se divide na proporção das indutâncias
+        assert resultado.tensoes_nos[0, resultado.nos.index('c')] == pytest.approx(0.6)
+        erros.append(np.abs(i - (1 - np.exp(-resultado.tempos / 1e-4)) / 100).max())
+    assert erros[0] / erros[1] == pytest.approx(100, rel=0.05)
+
+@pytest.mark.parametrize("por_passo", [False, True])
+def test_capacitor_em_paralelo_com_fonte(por_passo):
+    amplitude = 1e-6 * 2 * np.pi * 1e3
+    erros = []
+    for passo in (1e-5, 1e-6):
+        resultado = simular(PARALELO_C, passo, 2e-3, 'TRAP', por_passo)
+        i = resultado.correntes[:, resultado.componentes.index('C1')]
+        assert i[0] == pytest.approx(amplitude, rel=1e-4)
+        erros.append(np.abs(i - amplitude * np.cos(2 * np.pi * 1e3 * resultado.tempos)).max())
+    assert erros[0] < 2e-3 * amplitude
+    assert erros[0] / erros[1] > 90
+
+def test_t_inicio_descarta_instantes_anteriores():
+    completo = simular(RC, 1e-5, 2e-3, 'TRAP')
+    parcial = analisar_transiente(parse_netlist_linhas(RC), 1e-5, 2e-3, 'TRAP', t_inicio=1e-3)
+    assert parcial.tempos[0] == pytest.approx(1e-3)
+    np.testing.assert_allclose(parcial.tensoes_nos, completo.tensoes_nos[100:])
+
+SENOIDE = ["V1 in 0 SIN(0 1 1k)", "R1 in out 1k", "C1 out 0 1u"]
+
+def test_decimacao_preserva_envoltoria():
+    tabela = parse_netlist_linhas(SENOIDE)
+    completo = analisar_transiente(tabela, 1e-6, 20e-3, 'TRAP')
+    decimado = analisar_transiente(tabela, 1e-6, 20e-3, 'TRAP', pontos_maximos=1000)
+    assert decimado.decimado and len(decimado.tempos) <= 1000
+    assert decimado.tempos[0] == 0.0 and decimado.tempos[-1] == pytest.approx(20e-3)
+    np.testing.assert_allclose(decimado.tensoes_nos.max(axis=0), completo.tensoes_nos.max(axis=0))
+    np.testing.assert_allclose(decimado.tensoes_nos.min(axis=0), completo.tensoes_nos.min(axis=0))
+
+def test_tran_longo_na_analise_da_netlist():
+    from core.analise import PONTOS_TRANSIENTE, analisar_netlist
+    analise = analisar_netlist("\n".join(SENOIDE + [".TRAN 1u 20m"]), 60)
+    resultado = analise["transiente"]
+    assert resultado.decimado and len(resultado.tempos) <= PONTOS_TRANSIENTE
+    assert resultado.tempos[-1] == pytest.approx(20e-3)
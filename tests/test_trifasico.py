@@ -0,0 +1,26 @@
+# tests/test_trifasico.py
+
+import numpy as np
+import pytest
+
+from benchmarks.geradores import alimentadores
+from core.circuito import CompiledCircuit
+from core.trifasico import resolver_trifasico
+from netlist_parser.parser import parse_netlist_linhas
+
+@pytest.fixture(scope="module")
+def circuito():
+    return CompiledCircuit(parse_netlist_linhas(alimentadores(200, secoes=4)))
+
+@pytest.mark.parametrize("alteracao, modo", [
+    ({}, 'por fase'),
+    ({"S_B": 100}, 'sequencias'),  # Fonte desequilibrada, componentes iguais nas fases
+    ({"C0_0_A": 20}, 'completo'),  # Carga desequilibrada: sem simetria
+])
+def test_simetria_igual_a_anm_completa(circuito, alteracao, modo):
+    alterado = circuito.com_valores([circuito.indice_componente[nome] for nome in alteracao], list(alteracao.values()))
+    resultado, obtido = resolver_trifasico(alterado, 60)
+    assert obtido == modo
+    completo = alterado.resolver(60)
+    np.testing.assert_allclose(resultado.solucao, completo.solucao, rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(resultado.potencias, completo.potencias, rtol=1e-9, atol=1e-6)